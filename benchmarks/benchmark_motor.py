@@ -0,0 +1,281 @@
+"""
+Benchmark al motorului de calcul pe proiecte sintetice de mărimi crescătoare
+
+    python benchmarks/benchmark_motor.py
+    python benchmarks/benchmark_motor.py -n 10 100 1000 -o rezultate.json
+    python benchmarks/benchmark_motor.py --compara benchmarks/rezultate/precedent.json
+
+Pentru fiecare mărime se generează un proiect în formatul tronsoane_arm, cu
+un amestec aleator de consumatori din CONSUMATORI; destinația și materialul
+se rotesc după ordinul de mărime (10, 100, 1000, ...), iar etapa "calcul_tronsoane_variante" parcurge toate
+materialele și destinațiile. Se cronometrează:
+
+    dimensioneaza_tronson        apelul scalar, pe fiecare tronson
+    factor_frecare_colebrook     apelul scalar, pe fiecare tronson
+    calcul_tronsoane             tabelul cumulat (ca în main()), de la zero
+    calcul_tronsoane_variante    același tabel, pentru material x destinație
+    adauga_tronson               adăugarea unui tronson la un tabel existent
+    raport_pdf                   create_pdf_report cu tabelul complet
+    export_excel                 export_excel cu tabelul complet
+
+O etapă al cărei timp, extrapolat liniar de la mărimea precedentă, depășește
+bugetul nu se mai rulează (apare ca "omis", cu estimarea), deci rezultatul
+arată și unde motorul nu mai scalează. Rezultatele se scriu în JSON; cu --compara, etapele mai
+lente decât în fișierul de referință peste prag se raportează ca regresii.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+
+import sanitare  # noqa: E402
+from sanitare import (  # noqa: E402
+    CONSUMATORI,
+    DESTINATII_CLADIRE,
+    MATERIALE_CONDUCTE,
+    CalculIncrementalTronsoane,
+    calcul_debit_cu_destinatie,
+    dimensioneaza_tronson,
+    factor_frecare_colebrook,
+    reynolds,
+)
+
+MARIMI_IMPLICITE = (10, 100, 1_000, 10_000, 100_000)
+BUGET_IMPLICIT_S = 60.0
+TIMP_MINIM_MASURARE_S = 0.2
+REPETARI_MAXIME = 5
+PRAG_REGRESIE = 1.25
+IESIRE_IMPLICITA = Path(__file__).resolve().parent / "rezultate" / "benchmark.json"
+
+# ======================== PROIECTE SINTETICE ========================
+
+def genereaza_tronsoane(numar: int, seed: int = 0) -> list:
+    """Tronsoane în formatul tronsoane_arm, cu 1-3 tipuri de consumatori pe tronson"""
+    rng = random.Random(seed)
+    tipuri = list(CONSUMATORI)
+    tronsoane = []
+    for nr in range(1, numar + 1):
+        consumatori = {tip: rng.randint(1, 4) for tip in rng.sample(tipuri, rng.randint(1, 3))}
+        tronsoane.append({
+            "nr": nr,
+            "consumatori": consumatori,
+            "lungime": round(rng.uniform(1.0, 15.0), 2),
+            "diferenta_nivel": rng.choice((0.0, 0.0, 3.0)),
+            "suma_zeta": round(rng.uniform(1.0, 8.0), 1),
+        })
+    return tronsoane
+
+# ======================== MĂSURARE ========================
+
+def masoara(functie, timp_minim: float = TIMP_MINIM_MASURARE_S, repetari: int = REPETARI_MAXIME) -> dict:
+    """Rulează functie() de cel puțin o dată, până la timp_minim sau repetari; timpii în secunde"""
+    timpi = []
+    while len(timpi) < repetari and (not timpi or sum(timpi) < timp_minim):
+        start = time.perf_counter()
+        functie()
+        timpi.append(time.perf_counter() - start)
+    return {"secunde": statistics.median(timpi), "minim_s": min(timpi), "repetari": len(timpi)}
+
+def etape(tronsoane: list, destinatie: str, material: str, temperatura: float = 10.0) -> dict:
+    """Funcțiile cronometrate pentru un proiect, după numele etapei"""
+    info_material = MATERIALE_CONDUCTE[material]
+    temperatura = float(temperatura)
+
+    # Debitele de calcul ale tabelului cumulat, pentru apelurile scalare
+    suma_vs = np.cumsum([sum(CONSUMATORI[c]["debit"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    suma_E = np.cumsum([sum(CONSUMATORI[c]["unitate"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    debite = [calcul_debit_cu_destinatie(vs, E, destinatie) for vs, E in zip(suma_vs, suma_E)]
+    numere_re = [reynolds(1.5, 0.02 + 0.0001 * (i % 500), temperatura) for i in range(len(tronsoane))]
+
+    def dimensionare_scalara():
+        for t, q in zip(tronsoane, debite):
+            dimensioneaza_tronson(q, t["lungime"], material, temperatura, t["suma_zeta"], info_material)
+
+    def colebrook_scalar():
+        for re in numere_re:
+            factor_frecare_colebrook(re, 0.007, 0.02)
+
+    def tabel(material_tabel=material, destinatie_tabel=destinatie):
+        calcul = CalculIncrementalTronsoane(destinatie_tabel, material_tabel, temperatura)
+        calcul.sincronizeaza(tronsoane)
+        return calcul
+
+    def tabel_variante():
+        for m in MATERIALE_CONDUCTE:
+            for d in DESTINATII_CLADIRE:
+                tabel(m, d).coloane()
+
+    calcul_existent = tabel()
+    tronson_nou = dict(tronsoane[-1], nr=len(tronsoane) + 1)
+
+    def adaugare():
+        calcul_existent.adauga(tronson_nou)
+        calcul_existent.sterge(len(calcul_existent.tronsoane) - 1)
+
+    def raport_pdf():
+        import pandas as pd
+        from sanitare.raport import create_pdf_report
+        create_pdf_report({
+            "rezultate_arm": pd.DataFrame(calcul_existent.coloane()),
+            "debit_total": float(debite[-1]),
+            "presiune_totala": float(calcul_existent.coloane()["h_tot"][-1]),
+            "material": material,
+            "destinatie": destinatie,
+            "temperatura": temperatura,
+        })
+
+    def excel():
+        from sanitare.export import export_excel
+        export_excel(calcul_existent.coloane(), foaie="ARM")
+
+    return {
+        "dimensioneaza_tronson": dimensionare_scalara,
+        "factor_frecare_colebrook": colebrook_scalar,
+        "calcul_tronsoane": lambda: tabel().coloane(),
+        "calcul_tronsoane_variante": tabel_variante,
+        "adauga_tronson": adaugare,
+        "raport_pdf": raport_pdf,
+        "export_excel": excel,
+    }
+
+def ruleaza_benchmark(marimi=MARIMI_IMPLICITE, buget_s: float = BUGET_IMPLICIT_S,
+                      selectie=None, seed: int = 0, afisare=print) -> dict:
+    """
+    Rulează toate etapele pentru fiecare mărime de proiect
+
+    Returns:
+        Dicționar cu mediul de rulare și câte un rând pe (mărime, etapă)
+    """
+    destinatii = list(DESTINATII_CLADIRE)
+    materiale = list(MATERIALE_CONDUCTE)
+    ultimul_timp = {}  # etapa -> (tronsoane, secunde) la mărimea precedentă
+    rezultate = []
+    # Încălzire: importuri, fonturi PDF, cache-ul cataloagelor nu intră în măsurători
+    for functie in etape(genereaza_tronsoane(2, seed), destinatii[0], materiale[0]).values():
+        try:
+            functie()
+        except ImportError:
+            pass
+
+    for numar in sorted(marimi):
+        # Proiectul depinde doar de mărime (nu de poziția ei în listă), ca rulările
+        # cu liste -n diferite să măsoare același proiect la aceeași mărime
+        ordin = int(math.log10(max(numar, 1)))
+        destinatie = destinatii[ordin % len(destinatii)]
+        material = materiale[ordin % len(materiale)]
+        tronsoane = genereaza_tronsoane(numar, seed + numar)
+        for nume, functie in etape(tronsoane, destinatie, material).items():
+            if selectie and nume not in selectie:
+                continue
+            rand = {"etapa": nume, "tronsoane": numar, "destinatie": destinatie, "material": material}
+            # Extrapolare liniară de la mărimea precedentă: peste buget nu se mai rulează
+            precedent = ultimul_timp.get(nume)
+            estimat = precedent[1] * numar / precedent[0] if precedent else 0.0
+            if precedent is None and nume in ultimul_timp:
+                rand["omis"] = "omisă la o mărime mai mică"
+            elif estimat > buget_s:
+                rand["omis"] = f"estimat {estimat:.0f} s, peste bugetul de {buget_s:.0f} s"
+            else:
+                try:
+                    rand.update(masoara(functie))
+                except ImportError as exc:
+                    rand["omis"] = f"dependență lipsă: {exc.name}"
+                else:
+                    rand["us_pe_tronson"] = rand["secunde"] / numar * 1e6
+            ultimul_timp[nume] = (numar, rand["secunde"]) if "secunde" in rand else None
+            rezultate.append(rand)
+            if "omis" in rand:
+                afisare(f"{numar:>8} {nume:<28} omis ({rand['omis']})")
+            else:
+                afisare(f"{numar:>8} {nume:<28} {rand['secunde'] * 1000:>11.2f} ms "
+                        f"{rand['us_pe_tronson']:>10.2f} µs/tronson")
+
+    return {
+        "versiune": sanitare.__version__,
+        "commit": _commit_git(),
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platforma": platform.platform(),
+        "procesor": platform.processor() or platform.machine(),
+        "buget_s": buget_s,
+        "rezultate": rezultate,
+    }
+
+def _commit_git():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parents[1],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+# ======================== COMPARARE ========================
+
+def compara(curent: dict, referinta: dict, prag: float = PRAG_REGRESIE) -> list:
+    """
+    Etapele măsurate în ambele rulări care au devenit mai lente de prag ori
+
+    Se compară doar rândurile cu aceeași etapă, mărime, destinație și material.
+    """
+    def cheie(rand):
+        return rand["etapa"], rand["tronsoane"], rand.get("destinatie"), rand.get("material")
+
+    timpi_referinta = {cheie(r): r["secunde"] for r in referinta["rezultate"] if "secunde" in r}
+    regresii = []
+    for rand in curent["rezultate"]:
+        vechi = timpi_referinta.get(cheie(rand))
+        if vechi and "secunde" in rand and rand["secunde"] > prag * vechi:
+            regresii.append({"etapa": rand["etapa"], "tronsoane": rand["tronsoane"],
+                             "referinta_s": vechi, "curent_s": rand["secunde"],
+                             "raport": rand["secunde"] / vechi})
+    return regresii
+
+# ======================== LINIE DE COMANDĂ ========================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark motor de calcul instalații sanitare")
+    parser.add_argument("-n", "--marimi", type=int, nargs="+", default=list(MARIMI_IMPLICITE),
+                        help="numărul de tronsoane al proiectelor sintetice")
+    parser.add_argument("-e", "--etape", nargs="+", default=None, help="doar etapele date")
+    parser.add_argument("-b", "--buget", type=float, default=BUGET_IMPLICIT_S,
+                        help="secunde (estimate) peste care o etapă nu se mai rulează")
+    parser.add_argument("-o", "--iesire", default=str(IESIRE_IMPLICITA), help="fișierul JSON de rezultate")
+    parser.add_argument("--compara", help="fișier JSON de referință (o rulare anterioară)")
+    parser.add_argument("--prag", type=float, default=PRAG_REGRESIE,
+                        help="raportul curent/referință peste care se raportează regresie")
+    parser.add_argument("--seed", type=int, default=0)
+    argumente = parser.parse_args(argv)
+
+    rezultat = ruleaza_benchmark(argumente.marimi, argumente.buget, argumente.etape, argumente.seed)
+    iesire = Path(argumente.iesire)
+    iesire.parent.mkdir(parents=True, exist_ok=True)
+    iesire.write_text(json.dumps(rezultat, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Rezultate scrise în {iesire}")
+
+    if argumente.compara:
+        referinta = json.loads(Path(argumente.compara).read_text(encoding="utf-8"))
+        regresii = compara(rezultat, referinta, argumente.prag)
+        for r in regresii:
+            print(f"REGRESIE {r['etapa']} ({r['tronsoane']} tronsoane): "
+                  f"{r['referinta_s'] * 1000:.2f} ms -> {r['curent_s'] * 1000:.2f} ms ({r['raport']:.2f}x)")
+        if regresii:
+            return 1
+        print(f"Fără regresii față de {argumente.compara} (prag {argumente.prag:.2f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,46 @@
+import os
+import uuid
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-import numpy as np
-import math
-from typing import List, Dict, Tuple
 import plotly.graph_objects as go
-import plotly.express as px
-import io
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import datetime
+
+from sanitare import (
+    DESTINATII_CLADIRE,
+    TEMPERATURA_ACM_IMPLICITA,
+    CONSUMATORI,
+    MODELE_FRECARE,
+    CalculIncrementalTronsoane,
+    calcul_bransament,
+    calcul_vas_tampon,
+    calcul_hidrofor,
+    catalog,
+    citeste_catalog_furnizor,
+    inregistreaza_catalog_furnizor,
+    invalideaza_catalog,
+    statistici_cache,
+)
+from sanitare.esantionare import PRAG_WEBGL, PUNCTE_GRAFIC, esantioneaza
+from sanitare.export import export_excel
+from sanitare.hidrofor import PORNIRI_ORA_ADMISE, matrice_hidrofor
+from sanitare.parametric import COLOANE_VARIANTE, studiu_parametric
+from sanitare.pompe import (
+    COLOANE_SELECTIE_POMPE,
+    catalog_pompe,
+    citeste_catalog_pompe,
+    curba_retea,
+    inregistreaza_catalog_pompe,
+    selecteaza_pompe,
+)
+from sanitare.profilare import COLOANE_PROFIL, ProfilRerun, etapa, marcaj, profil_curent
+from sanitare.raport import cheie_raport, raport_pdf_async
+from sanitare.recirculare import BuclaRecirculare, TEMPERATURA_MINIMA_RETUR, TEMPERATURA_PLECARE
+from sanitare.retea import Retea
+from sanitare.simultaneitate import COLOANE_SIMULARE, simuleaza_simultaneitate
+from sanitare.stocare import CALE_IMPLICITA, DepozitProiecte
+from sanitare.tronsoane import COLOANE_REZULTATE
+from sanitare.vas_tampon import nivel_vas_tampon, profil_consum, simuleaza_vas_tampon
 
 # ======================== CONFIGURARE PAGINĂ ========================
 st.set_page_config(
@@ -23,903 +50,313 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ======================== CONSTANTE ========================
-G = 9.81  # gravitație m/s²
-
-# ======================== DESTINAȚII CLĂDIRI ========================
-DESTINATII_CLADIRE = {
-    "Clădiri de locuit": {
-        "k_canalizare": 0.5,
-        "coef_a_arm": 0.45,
-        "coef_b_acm": 0.45,
-        "metoda": "B",
-        "v_min": 0.20,
-    },
-    "Clădiri administrative/birouri": {
-        "k_canalizare": 0.5,
-        "coef_a_arm": 0.55,
-        "coef_b_acm": 0.25,
-        "metoda": "C",
-        "E_min": 1.5,
-    },
-    "Instituții învățământ/școli": {
-        "k_canalizare": 0.7,
-        "coef_a_arm": 0.60,
-        "coef_b_acm": 0.27,
-        "metoda": "C",
-        "E_min": 1.8,
-    },
-    "Spitale/sanatorii": {
-        "k_canalizare": 0.7,
-        "coef_a_arm": 0.67,
-        "coef_b_acm": 0.30,
-        "metoda": "C",
-        "E_min": 2.2,
-    },
-    "Hoteluri cu grup sanitar în cameră": {
-        "k_canalizare": 0.7,
-        "coef_a_arm": 0.60,
-        "coef_b_acm": 0.27,
-        "metoda": "C",
-        "E_min": 1.8,
-    },
-    "Hoteluri cu grup sanitar comun": {
-        "k_canalizare": 1.0,
-        "coef_a_arm": 0.85,
-        "coef_b_acm": 0.38,
-        "metoda": "C",
-        "E_min": 3.6,
-    },
-}
+# ======================== DEPOZIT PROIECTE ========================
+@st.cache_resource
+def depozit_proiecte():
+    """Baza de proiecte, comună tuturor sesiunilor serverului; reîncarcă și cataloagele de furnizor"""
+    depozit = DepozitProiecte(os.environ.get("SANITARE_DB", CALE_IMPLICITA))
+    for catalog_salvat in depozit.cataloage_furnizor():
+        inregistreaza_catalog_furnizor(catalog_salvat["produse"], catalog_salvat["info"])
+    return depozit
 
-# ======================== COEFICIENȚI PIERDERI LOCALE ========================
-COEFICIENTI_PIERDERI_LOCALE = {
-    # Armături
-    "Robinet cu sertar DN15-50": 0.5,
-    "Robinet cu sertar DN65-100": 0.3,
-    "Robinet cu sferă (bilă) - deschis total": 0.1,
-    "Robinet colțar": 8.0,
-    "Clapetă de sens": 2.5,
-    "Clapetă de sens cu arc": 3.0,
-    "Filtru Y": 2.0,
-    "Contor apă DN15-20": 10.0,
-    "Contor apă DN25-40": 7.0,
-    "Contor apă DN50-100": 5.0,
-    
-    # Fitinguri - Coturi
-    "Cot 90° cu rază mică (r/d=1)": 1.5,
-    "Cot 90° cu rază normală (r/d=1.5)": 0.9,
-    "Cot 90° cu rază mare (r/d=2)": 0.7,
-    "Cot 45°": 0.4,
-    "Cot 30°": 0.25,
-    
-    # Fitinguri - Tee-uri
-    "Tee - trecere directă": 0.3,
-    "Tee - derivație 90° (ramificație)": 1.8,
-    "Tee - confluență": 1.5,
-    
-    # Reducții
-    "Reducție graduală (unghi < 20°)": 0.15,
-    "Reducție bruscă 2:1": 0.5,
-    "Reducție bruscă 3:2": 0.3,
-    "Lărgire graduală": 0.3,
-    "Lărgire bruscă 1:2": 1.0,
-    
-    # Intrări/Ieșiri
-    "Intrare în conductă (muchie ascuțită)": 0.5,
-    "Intrare în conductă (racordată)": 0.25,
-    "Ieșire din conductă": 1.0,
-    "Ieșire în rezervor": 1.0,
-}
-
-# ======================== CORELAȚIE DN - DIAMETRE SPECIFICE ========================
-CORELARE_DN_DIAMETRE = {
-    "Oțel": {
-        15: "1/2\"",
-        20: "3/4\"", 
-        25: "1\"",
-        32: "1 1/4\"",
-        40: "1 1/2\"",
-        50: "2\"",
-        65: "2 1/2\"",
-        80: "3\"",
-        100: "4\"",
-        125: "5\"",
-        150: "6\""
-    },
-    "PPR": {
-        10: "d16",
-        15: "d20",
-        20: "d25",
-        25: "d32",
-        32: "d40",
-        40: "d50",
-        50: "d63",
-        65: "d75",
-        80: "d90",
-        100: "d110",
-        125: "d125",
-        150: "d160"
-    },
-    "PEX/Multistrat": {
-        10: "16x2",
-        12: "16x2",
-        15: "20x2",
-        20: "25x2.5",
-        25: "32x3",
-        32: "40x3.5",
-        40: "50x4",
-        50: "63x4.5"
-    },
-    "Cupru": {
-        10: "12x1",
-        12: "15x1",
-        15: "18x1",
-        20: "22x1",
-        25: "28x1.5",
-        32: "35x1.5",
-        40: "42x1.5",
-        50: "54x2",
-        65: "76x2",
-        80: "88.9x2",
-        100: "108x2.5"
-    },
-    "PE-HD": {
-        15: "d20",
-        20: "d25",
-        25: "d32",
-        32: "d40",
-        40: "d50",
-        50: "d63",
-        65: "d75",
-        80: "d90",
-        100: "d110",
-        125: "d125",
-        150: "d160",
-        200: "d200"
-    }
-}
-
-# ======================== BAZE DE DATE MATERIALE ========================
-MATERIALE_CONDUCTE = {
-    "PPR (Polipropilenă) PN20": {
-        "rugozitate_mm": 0.007,
-        "diametre_mm": {20: 13.2, 25: 16.6, 32: 21.2, 40: 26.6, 50: 33.2, 63: 42.0, 75: 50.0, 90: 60.0, 110: 73.2},
-        "v_max": 2.0,
-        "info": "SDR 6, Seria 2.5, pentru apă rece/caldă presiune ridicată"
-    },
-    "PPR (Polipropilenă) PN16": {
-        "rugozitate_mm": 0.007,
-        "diametre_mm": {20: 14.4, 25: 18.0, 32: 23.2, 40: 29.0, 50: 36.2, 63: 45.8, 75: 54.4, 90: 65.4, 110: 79.8},
-        "v_max": 2.0,
-        "info": "SDR 7.4, Seria 3.2, uzual pentru apă rece"
-    },
-    "PE-HD (Polietilenă) PE100 PN16": {
-        "rugozitate_mm": 0.007,
-        "diametre_mm": {20: 16.0, 25: 20.4, 32: 26.0, 40: 32.6, 50: 40.8, 63: 51.4, 75: 61.4, 90: 73.6, 110: 90.0},
-        "v_max": 2.0,
-        "info": "Branșamente și rețele exterioare, SDR 11"
-    },
-    "PEX (Polietilenă reticulată)": {
-        "rugozitate_mm": 0.007,
-        "diametre_mm": {16: 12.0, 20: 16.0, 25: 20.0, 32: 26.0, 40: 32.6, 50: 40.8, 63: 51.4},
-        "v_max": 2.0,
-        "info": "Încălzire și sanitare, flexibil"
-    },
-    "Cupru (Teavă trasă)": {
-        "rugozitate_mm": 0.0015,
-        "diametre_mm": {15: 13.0, 18: 16.0, 22: 20.0, 28: 26.0, 35: 33.0, 42: 40.0, 54: 52.0},
-        "v_max": 1.5,
-        "info": "Instalații aparente, calitate superioară"
-    },
-    "Oțel Zincat": {
-        "rugozitate_mm": 0.15,
-        "diametre_mm": {15: 16.0, 20: 21.6, 25: 27.2, 32: 35.9, 40: 41.8, 50: 53.0, 65: 68.8, 80: 80.8, 100: 105.3},
-        "v_max": 2.0,
-        "info": "Instalații industriale, PSI"
-    }
-}
-
-# ======================== CONSUMATORI ========================
-CONSUMATORI = {
-    "WC cu rezervor": {
-        "debit": 0.10, "unitate": 1.0, "presiune_min": 8.0, "diametru_min": 10,
-        "categorie": "Baie"
-    },
-    "WC cu robinet flotor": {
-        "debit": 1.50, "unitate": 5.0, "presiune_min": 50.0, "diametru_min": 20,
-        "categorie": "Baie"
-    },
-    "Pisoar cu robinet": {
-        "debit": 0.30, "unitate": 2.0, "presiune_min": 15.0, "diametru_min": 12,
-        "categorie": "Baie"
-    },
-    "Lavoar": {
-        "debit": 0.10, "unitate": 1.0, "presiune_min": 10.0, "diametru_min": 10,
-        "categorie": "Baie"
-    },
-    "Duș": {
-        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
-        "categorie": "Baie"
-    },
-    "Cadă < 150L": {
-        "debit": 0.25, "unitate": 3.0, "presiune_min": 13.0, "diametru_min": 13,
-        "categorie": "Baie"
-    },
-    "Cadă > 150L": {
-        "debit": 0.33, "unitate": 4.0, "presiune_min": 13.0, "diametru_min": 13,
-        "categorie": "Baie"
-    },
-    "Spălător vase": {
-        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
-        "categorie": "Bucătărie"
-    },
-    "Mașină spălat vase": {
-        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
-        "categorie": "Bucătărie"
-    },
-    "Mașină spălat rufe": {
-        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
-        "categorie": "Utilitate"
-    },
-    "Robinet serviciu 1/2\"": {
-        "debit": 0.20, "unitate": 1.5, "presiune_min": 10.0, "diametru_min": 13,
-        "categorie": "Utilitate"
-    },
-    "Robinet serviciu 3/4\"": {
-        "debit": 0.40, "unitate": 2.5, "presiune_min": 10.0, "diametru_min": 19,
-        "categorie": "Utilitate"
-    },
-    "Robinet grădină": {
-        "debit": 0.70, "unitate": 3.5, "presiune_min": 15.0, "diametru_min": 19,
-        "categorie": "Exterior"
-    }
-}
-
-# ======================== FUNCȚII DE CALCUL ========================
-
-def calcul_debit_cu_destinatie(suma_vs: float, suma_E: float, destinatie: str, tip_apa: str = "ARM"):
-    """Calculează debitul conform destinației"""
-    config = DESTINATII_CLADIRE[destinatie]
-    
-    if config["metoda"] == "B":
-        if suma_vs >= config["v_min"]:
-            debit = config["coef_a_arm"] * math.sqrt(suma_vs)
-        else:
-            debit = suma_vs
-    else:  # Metoda C
-        coef = config["coef_b_acm"] if tip_apa == "ACM" else config["coef_a_arm"]
-        if suma_E >= config["E_min"]:
-            debit = coef * math.sqrt(suma_E)
-        else:
-            debit = 0.2 * suma_E
-    
-    return debit
-
-def calcul_factor_f(N: int, destinatie: str):
-    """Calculează factorul de simultaneitate f"""
-    # Formula din normativ pentru clădiri de locuit
-    if N <= 0:
-        return 0
-    elif N == 1:
-        return 1.0
-    else:
-        return 1.0 / math.sqrt(N)
-
-def viscozitate_cinematica(temperatura: float) -> float:
-    """Viscozitate cinematică"""
-    if temperatura <= 10:
-        return 1.307e-6
-    elif temperatura <= 20:
-        return 1.004e-6
-    elif temperatura <= 30:
-        return 0.801e-6
-    elif temperatura <= 40:
-        return 0.658e-6
-    elif temperatura <= 50:
-        return 0.553e-6
-    elif temperatura <= 60:
-        return 0.475e-6
-    else:
-        return 0.413e-6
-
-def calculeaza_reynolds(viteza: float, diametru_m: float, viscozitate: float) -> float:
-    if viscozitate == 0:
-        return 0
-    return (viteza * diametru_m) / viscozitate
-
-def calculeaza_lambda_haaland(reynolds: float, rugozitate_rel: float) -> float:
-    if reynolds < 2300:
-        return 64 / reynolds if reynolds > 0 else 0.02
-    else:
-        try:
-            term1 = (rugozitate_rel / 3.71) ** 1.11
-            term2 = 6.9 / reynolds
-            lambda_val = (-1.8 * math.log10(term1 + term2)) ** (-2)
-            return max(0.008, min(0.1, lambda_val))
-        except:
-            return 0.02
-
-def dimensioneaza_tronson(debit_ls: float, lungime_m: float, material: str, 
-                         temperatura: float, suma_zeta: float, info_material: dict):
-    """Dimensionează un tronson"""
-    if debit_ls <= 0:
-        return None
-    
-    rugozitate_mm = info_material["rugozitate_mm"]
-    v_max_admis = info_material["v_max"]
-    diametre = info_material["diametre_mm"]
-    
-    # Diametru minim teoretic
-    d_min = math.sqrt((4 * debit_ls / 1000) / (math.pi * v_max_admis)) * 1000
-    
-    # Selectez DN comercial
-    dn_ales = None
-    d_int_mm = None
-    for dn, d_int in sorted(diametre.items()):
-        if d_int >= d_min:
-            dn_ales = dn
-            d_int_mm = d_int
-            break
-    
-    if dn_ales is None:
-        dn_ales = max(diametre.keys())
-        d_int_mm = diametre[dn_ales]
-    
-    # Calcule hidraulice
-    sectiune = math.pi * (d_int_mm/1000)**2 / 4
-    viteza = (debit_ls / 1000) / sectiune if sectiune > 0 else 0
-    
-    viscozitate = viscozitate_cinematica(temperatura)
-    reynolds = calculeaza_reynolds(viteza, d_int_mm/1000, viscozitate)
-    rugozitate_rel = rugozitate_mm / d_int_mm
-    lambda_coef = calculeaza_lambda_haaland(reynolds, rugozitate_rel)
-    
-    # Pierderi
-    h_lin_m = lambda_coef * (lungime_m / (d_int_mm/1000)) * (viteza**2 / (2 * G))
-    h_loc_m = suma_zeta * (viteza**2 / (2 * G))
-    i_specific = (h_lin_m / lungime_m) * 1000 * G if lungime_m > 0 else 0
-    
-    return {
-        "dn": dn_ales,
-        "d_int_mm": d_int_mm,
-        "viteza_ms": viteza,
-        "reynolds": reynolds,
-        "lambda": lambda_coef,
-        "h_lin_m": h_lin_m,
-        "h_loc_m": h_loc_m,
-        "i_specific_pa_m": i_specific,
-        "i_L": h_lin_m * 1000,  # în mmCA
-        "h_loc_mmca": h_loc_m * 1000
-    }
-
-def calcul_debit_probabilistic(consumatori_selectati: List[Dict]) -> float:
-    """Calculează debitul probabilistic conform SR 1343-1:2006"""
-    suma_debit_unitate = sum(c["debit"] * c["unitate"] * c["cantitate"] 
-                              for c in consumatori_selectati)
-    
-    if suma_debit_unitate <= 0:
-        return 0.0
-    elif suma_debit_unitate <= 0.2:
-        return suma_debit_unitate
-    elif suma_debit_unitate <= 1.6:
-        return 0.2 + 0.25 * (suma_debit_unitate - 0.2)**0.5
-    else:
-        return 0.466 * suma_debit_unitate**0.5
-
-def calcul_diametru_minim(debit: float, viteza_max: float) -> float:
-    """Calculează diametrul minim necesar în mm"""
-    if debit <= 0 or viteza_max <= 0:
-        return 0.0
-    return 1000 * math.sqrt(4 * debit / (math.pi * viteza_max))
-
-def reynolds(viteza: float, diametru: float, temperatura: float = 10.0) -> float:
-    """Calculează numărul Reynolds"""
-    vascozitate = 1.3e-6 if temperatura <= 10 else 1.0e-6
-    return viteza * diametru / vascozitate
+def deschide_proiect(proiect_id: int):
+    """Încarcă în sesiune doar tronsoanele ARM ale proiectului activ"""
+    st.session_state.proiect_id = proiect_id
+    st.session_state.tronsoane_arm = depozit_proiecte().incarca_tronsoane(proiect_id, "ARM")
+    st.session_state.rezultate_calcul = {}
 
-def factor_frecare_colebrook(re: float, rugozitate: float, diametru: float, 
-                            epsilon: float = 1e-6) -> float:
-    """Calculează factorul de frecare prin formula Colebrook-White"""
-    if re < 2300:
-        return 64 / re
-    
-    rugozitate_relativa = rugozitate / diametru
-    f_vechi = 0.02
-    
-    for _ in range(100):
-        if f_vechi <= 0:
-            f_vechi = 0.02
-        
-        partea_dreapta = -2 * math.log10(
-            rugozitate_relativa / 3.7 + 2.51 / (re * math.sqrt(f_vechi))
+# ======================== RAPORT PDF ========================
+def afiseaza_raport_pdf(viitor):
+    """Butonul de descărcare când raportul e gata; până atunci doar fragmentul se reîmprospătează"""
+    @st.fragment(run_every=None if viitor.done() else 0.5)
+    def stare_raport():
+        if not viitor.done():
+            st.info("⏳ Raportul se generează...")
+            return
+        if viitor.exception() is not None:
+            st.error(f"❌ Eroare la generarea raportului: {viitor.exception()}")
+            return
+        if profil_curent() is not None and getattr(viitor, "durata_s", None) is not None:
+            profil_curent().inregistreaza("Raport PDF (generat în fundal)", viitor.durata_s)
+        if st.session_state.get('raport_pdf_asteptat'):
+            # Reîncărcare completă, ca fragmentul să nu mai ruleze periodic
+            st.session_state.raport_pdf_asteptat = False
+            st.rerun(scope="app")
+        st.success("✅ Raport generat cu succes!")
+        st.download_button(
+            label="⬇️ Descarcă Raport PDF",
+            data=viitor.result(),
+            file_name="Memoriu_Tehnic_Sanitare.pdf",
+            mime="application/pdf"
         )
-        
-        if partea_dreapta <= 0:
-            return 0.02
-            
-        f_nou = (1 / partea_dreapta) ** 2
-        
-        if abs(f_nou - f_vechi) < epsilon:
-            return f_nou
-        
-        f_vechi = f_nou
-    
-    return f_vechi
-
-def pierdere_presiune_distribuita(debit: float, lungime: float, 
-                                 diametru: float, rugozitate: float,
-                                 temperatura: float = 10.0) -> float:
-    """Calculează pierderea de presiune distribuită în mCA"""
-    if diametru <= 0 or debit <= 0:
-        return 0.0
     
-    viteza = 4 * debit / (math.pi * (diametru/1000)**2)
-    re = reynolds(viteza, diametru/1000, temperatura)
-    f = factor_frecare_colebrook(re, rugozitate/1000, diametru/1000)
-    
-    return f * lungime * viteza**2 / (2 * G * diametru/1000)
+    st.session_state.raport_pdf_asteptat = not viitor.done()
+    stare_raport()
 
-def pierdere_presiune_locala(viteza: float, coeficient: float) -> float:
-    """Calculează pierderea de presiune locală în mCA"""
-    return coeficient * viteza**2 / (2 * G)
+# ======================== GRAFICE ========================
+def urma_grafic(x, y, **kwargs):
+    """go.Scatter pentru serii scurte; peste PRAG_WEBGL puncte, Scattergl cu seria eșantionată"""
+    if len(x) <= PRAG_WEBGL:
+        return go.Scatter(x=x, y=y, **kwargs)
+    x, y = esantioneaza(np.asarray(x), np.asarray(y), PUNCTE_GRAFIC)
+    kwargs["mode"] = kwargs.get("mode", "lines").replace("+markers", "")
+    return go.Scattergl(x=x, y=y, **kwargs)
 
-def calcul_pierderi_locale_tronson(viteza: float, elemente_locale: Dict[str, int], 
-                                   este_ultimul_etaj: bool = False) -> float:
-    """
-    Calculează pierderile locale pentru un tronson
-    
-    Args:
-        viteza: viteza fluidului în m/s
-        elemente_locale: dicționar cu elementele și cantitățile lor
-        este_ultimul_etaj: True pentru ultimul etaj (cel mai defavorabil)
-    
-    Returns:
-        Pierderea locală totală în mCA
+@st.cache_resource(max_entries=8, show_spinner=False)
+def figura_pierderi(tronson, suma_i_L, suma_h_loc):
     """
-    pierdere_totala = 0.0
-    
-    for element, cantitate in elemente_locale.items():
-        if element in COEFICIENTI_PIERDERI_LOCALE:
-            # Pentru etajele inferioare, luăm în calcul doar tee-urile
-            if not este_ultimul_etaj and "Tee" not in element:
-                continue
-            
-            coef = COEFICIENTI_PIERDERI_LOCALE[element]
-            pierdere_totala += cantitate * pierdere_presiune_locala(viteza, coef)
-    
-    return pierdere_totala
-
-def selectare_diametru_material(material: str, diametru_minim: float) -> Tuple[float, float]:
-    """Selectează diametrul comercial disponibil și returnează DN"""
-    if material not in MATERIALE_CONDUCTE:
-        return 0, 0
-    
-    diametre_disponibile = MATERIALE_CONDUCTE[material]["diametre_mm"]
-    
-    for dn_comercial, di_real in sorted(diametre_disponibile.items()):
-        if di_real >= diametru_minim:
-            return dn_comercial, di_real
-    
-    return max(diametre_disponibile.keys()), diametre_disponibile[max(diametre_disponibile.keys())]
-
-def get_diametru_specific(material: str, dn: float) -> str:
-    """Obține diametrul specific pentru un material și DN dat"""
-    # Determinăm tipul de material pentru corelație
-    tip_material = None
-    
-    if "PPR" in material:
-        tip_material = "PPR"
-    elif "PEX" in material or "Multistrat" in material:
-        tip_material = "PEX/Multistrat"
-    elif "Cupru" in material:
-        tip_material = "Cupru"
-    elif "PE-HD" in material:
-        tip_material = "PE-HD"
-    elif "Oțel" in material:
-        tip_material = "Oțel"
-    elif "PVC" in material:
-        tip_material = "PPR"  # Folosim notația similară PPR
-    
-    if tip_material and tip_material in CORELARE_DN_DIAMETRE:
-        if dn in CORELARE_DN_DIAMETRE[tip_material]:
-            return CORELARE_DN_DIAMETRE[tip_material][dn]
-    
-    return f"DN{int(dn)}"
+    Evoluția pierderilor cumulate, în cache după conținutul coloanelor
 
-# ======================== FUNCȚII ECHIPAMENTE NOI ========================
-
-def calcul_bransament(debit_total: float, lungime: float = 50, 
-                     diferenta_cota: float = 2.0) -> Dict:
-    """Dimensionează conducta de branșament"""
-    # Folosim PE-HD pentru branșament
-    material = "PE-HD (Polietilenă) PE100 PN16"
-    v_max = 2.5  # m/s pentru branșament
-    
-    # Diametru minim necesar
-    d_min = calcul_diametru_minim(debit_total, v_max)
-    dn, di = selectare_diametru_material(material, d_min)
-    
-    # Calcul pierderi
-    rugozitate = MATERIALE_CONDUCTE[material]["rugozitate_mm"]
-    pierdere_dist = pierdere_presiune_distribuita(debit_total, lungime, di, rugozitate)
-    pierdere_locala = diferenta_cota  # Pierdere geometrică
-    
-    return {
-        "material": material,
-        "dn": dn,
-        "diametru_interior": di,
-        "diametru_specific": get_diametru_specific(material, dn),
-        "lungime": lungime,
-        "debit": debit_total,
-        "viteza": 4 * debit_total / (math.pi * (di/1000)**2),
-        "pierdere_totala": pierdere_dist + pierdere_locala,
-        "presiune_necesara_bransament": max(20.0, pierdere_dist + pierdere_locala + 5.0)
-    }
-
-def calcul_vas_tampon(debit_orar_maxim: float, timp_rezerva_min: float = 30) -> Dict:
-    """Calculează volumul vasului tampon (rezervor de rupere)"""
-    # Volum necesar = debit orar maxim * timp rezervă
-    volum_necesar = debit_orar_maxim * 3600 * (timp_rezerva_min / 60)  # litri
-    
-    # Rotunjim la valori standard
-    volume_standard = [500, 1000, 2000, 3000, 5000, 10000]
-    volum_ales = next((v for v in volume_standard if v >= volum_necesar), volume_standard[-1])
-    
-    return {
-        "volum_necesar": volum_necesar,
-        "volum_ales": volum_ales,
-        "timp_rezerva": timp_rezerva_min,
-        "debit_alimentare": debit_orar_maxim * 1.2,  # 20% marjă de siguranță
-        "diametru_alimentare": int(calcul_diametru_minim(debit_orar_maxim * 1.2 / 3600, 1.5)),
-        "diametru_plecare": int(calcul_diametru_minim(debit_orar_maxim / 3600, 2.0)),
-        "diametru_golire": max(50, int(volum_ales / 100))  # DN minim 50mm
-    }
-
-def calcul_hidrofor(debit: float, presiune_necesara: float, 
-                   numar_pompe: int = 2) -> Dict:
-    """Dimensionează stația de hidrofor"""
-    # Presiuni de lucru
-    presiune_pornire = presiune_necesara
-    presiune_oprire = presiune_pornire + 20  # +2 bar
-    presiune_medie = (presiune_pornire + presiune_oprire) / 2
-    
-    # Volum rezervor hidrofor (formula Aquamax)
-    porniri_pe_ora = 15  # maxim recomandat
-    volum_rezervor_m3 = (debit * 3600 * 0.25) / porniri_pe_ora
-    volum_rezervor_litri = volum_rezervor_m3 * 1000  # Conversie în litri
-    
-    # Rotunjire la valori standard
-    volume_standard = [24, 50, 80, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000]
-    volum_ales = next((v for v in volume_standard if v >= volum_rezervor_litri), volume_standard[-1])
-    
-    # Caracteristici pompă
-    debit_pompa = debit / numar_pompe if numar_pompe > 1 else debit * 1.1
-    inaltime_pompare = presiune_oprire
-    
-    # Putere hidraulică (kW) = (Q * H * rho * g) / (eta * 1000)
-    # rho = 1000 kg/m3, g = 9.81
-    # eta (randament) estimat la 0.65
-    putere_hidraulica = (debit_pompa * inaltime_pompare * 9.81) / (0.65 * 1000)
-    putere_motor_estimata = putere_hidraulica * 1.2  # +20% rezervă
-    
-    return {
-        "numar_pompe": numar_pompe,
-        "debit_pompa": debit_pompa * 3600,  # m³/h
-        "inaltime_pompare": inaltime_pompare,
-        "presiune_pornire": presiune_pornire,
-        "presiune_oprire": presiune_oprire,
-        "volum_rezervor": volum_ales,
-        "porniri_ora_max": porniri_pe_ora,
-        "putere_estimata": putere_motor_estimata,
-        "configuratie": f"{numar_pompe}x pompe active" if numar_pompe > 1 else "1 pompă activă"
-    }
+    cache_resource întoarce aceeași figură (fără copiere); figura nu se
+    modifică după construire.
+    """
+    fig = go.Figure()
+    fig.add_trace(urma_grafic(
+        tronson, suma_i_L,
+        name='Σ i*L (mmCA)',
+        mode='lines+markers',
+        line=dict(color='#2196f3', width=3)
+    ))
+    fig.add_trace(urma_grafic(
+        tronson, suma_h_loc,
+        name='Σ h_loc (mmCA)',
+        mode='lines+markers',
+        line=dict(color='#ff9800', width=3)
+    ))
+    titlu = "Evoluția pierderilor cumulate"
+    if len(tronson) > PRAG_WEBGL:
+        titlu += f" (eșantionat: {len(fig.data[0].x)} din {len(tronson)} tronsoane)"
+    fig.update_layout(
+        title=titlu,
+        xaxis_title="Tronson",
+        yaxis_title="Pierderi (mmCA)",
+        height=400
+    )
+    return fig
 
-def calcul_reducator_presiune(presiune_intrare: float, presiune_iesire: float,
-                             debit: float) -> Dict:
-    """Selectează reducător de presiune"""
-    # Calculăm DN bazat pe debit
-    viteza_recomandata = 2.0  # m/s prin reducător
-    dn_necesar = calcul_diametru_minim(debit, viteza_recomandata)
-    
-    # Selectăm DN standard
-    dn_standard = [15, 20, 25, 32, 40, 50, 65, 80, 100]
-    dn_ales = next((d for d in dn_standard if d >= dn_necesar), dn_standard[-1])
-    
-    return {
-        "dn": dn_ales,
-        "presiune_intrare_max": presiune_intrare,
-        "presiune_reglata": presiune_iesire,
-        "debit_nominal": debit * 3600,  # m³/h
-        "raport_reducere": presiune_intrare / presiune_iesire,
-        "tip_recomandat": "Cu pistoane" if dn_ales <= 50 else "Cu membrană",
-        "manometru_intrare": "0-10 bar" if presiune_intrare <= 60 else "0-16 bar",
-        "manometru_iesire": "0-6 bar"
-    }
+# ======================== TABEL REZULTATE ========================
+# Zecimalele afișate; formatarea se face în browser (column_config), nu celulă cu celulă pe server
+ZECIMALE_REZULTATE = {
+    "Utot": 1, "f": 3, "Vs": 3, "Vc": 3, "d_int": 1, "v": 2, "i": 0, "L": 1, "i*L": 1,
+    "Σ i*L": 1, "Σ ζ": 1, "h_loc": 1, "Σ h_loc": 1, "h_geom": 2, "Σ h_geom": 2, "h_tot": 3,
+}
+FORMAT_REZULTATE = {
+    nume: st.column_config.NumberColumn(nume, format=f"%.{zecimale}f")
+    for nume, zecimale in ZECIMALE_REZULTATE.items()
+}
+RANDURI_PAGINA = (50, 100, 500, 1000)
 
-# ======================== FUNCȚII RAPOARTE ========================
-def create_pdf_report(data: dict):
-    """Generează raportul PDF detaliat - Memoriu Tehnic Extins"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                          rightMargin=2*cm, leftMargin=2.5*cm, 
-                          topMargin=2*cm, bottomMargin=2*cm)
-    
-    # Înregistrare font pentru diacritice
-    try:
-        pdfmetrics.registerFont(TTFont('Arial', '/System/Library/Fonts/Supplemental/Arial.ttf'))
-        font_name = 'Arial'
-    except:
-        font_name = 'Helvetica'  # Fallback
-    
-    styles = getSampleStyleSheet()
-    
-    # Stiluri personalizate
-    style_title = ParagraphStyle(
-        'CustomTitle', 
-        parent=styles['Heading1'], 
-        fontName=font_name,
-        alignment=1, 
-        spaceAfter=30,
-        fontSize=18,
-        textColor=colors.black
-    )
-    
-    style_heading1 = ParagraphStyle(
-        'CustomHeading1', 
-        parent=styles['Heading1'],
-        fontName=font_name,
-        spaceBefore=20, 
-        spaceAfter=15,
-        fontSize=14,
-        textColor=colors.black,
-        keepWithNext=True
-    )
-    
-    style_heading2 = ParagraphStyle(
-        'CustomHeading2', 
-        parent=styles['Heading2'],
-        fontName=font_name,
-        spaceBefore=15, 
-        spaceAfter=10,
-        fontSize=12,
-        textColor=colors.black,
-        keepWithNext=True
-    )
-    
-    style_normal = ParagraphStyle(
-        'CustomNormal', 
-        parent=styles['Normal'],
-        fontName=font_name,
-        spaceAfter=10,
-        leading=14,
-        alignment=4,  # Justify
-        fontSize=10
-    )
-    
-    style_list = ParagraphStyle(
-        'CustomList',
-        parent=style_normal,
-        leftIndent=20,
-        bulletIndent=10
-    )
-    
-    story = []
-    
-    # --- PAGINA DE TITLU ---
-    story.append(Spacer(1, 5*cm))
-    story.append(Paragraph("MEMORIU TEHNIC", style_title))
-    story.append(Paragraph("INSTALAȚII SANITARE INTERIOARE", style_title))
-    story.append(Paragraph("ALIMENTARE CU APĂ", style_title))
-    story.append(Spacer(1, 8*cm))
-    story.append(Paragraph(f"Data elaborării: {datetime.datetime.now().strftime('%d.%m.%Y')}", style_normal))
-    story.append(PageBreak())
-    
-    # --- CAPITOLUL 1: DATE GENERALE ---
-    story.append(Paragraph("1. DATE GENERALE", style_heading1))
-    
-    story.append(Paragraph("1.1. Obiectul proiectului", style_heading2))
-    text_obiect = """Prezenta documentație tratează proiectarea instalațiilor sanitare interioare de alimentare cu apă rece și apă caldă de consum pentru obiectivul analizat. Soluțiile tehnice adoptate au ca scop asigurarea confortului utilizatorilor, siguranța în exploatare și optimizarea consumurilor energetice."""
-    story.append(Paragraph(text_obiect, style_normal))
-    
-    story.append(Paragraph("1.2. Baze de proiectare", style_heading2))
-    story.append(Paragraph("La baza elaborării prezentului proiect au stat următoarele:", style_normal))
-    normative = [
-        "• Tema de proiectare stabilită de beneficiar;",
-        "• Planurile de arhitectură ale clădirii;",
-        "• Normativ I9-2022 - Normativ pentru proiectarea, executarea și exploatarea instalațiilor sanitare;",
-        "• SR 1343-1:2006 - Alimentări cu apă. Determinarea cantităților de apă potabilă pentru localități urbane și rurale;",
-        "• NP 084-2003 - Normativ privind proiectarea, executarea și exploatarea instalațiilor sanitare aferente clădirilor;",
-        "• Legea 10/1995 privind calitatea în construcții, cu modificările și completările ulterioare;",
-        "• P118-99 - Normativ de siguranță la foc a construcțiilor."
-    ]
-    for n in normative:
-        story.append(Paragraph(n, style_list))
-        
-    story.append(Paragraph("1.3. Caracteristicile amplasamentului", style_heading2))
-    info_gen = f"""
-    Clădirea analizată are funcțiunea de <b>{data.get('destinatie', 'Locuință')}</b>.
-    Sursa de apă: Rețeaua publică de distribuție / Sursă proprie.
-    Regimul de presiune disponibil asigură funcționarea normală a instalației, fiind prevăzută (după caz) o stație de pompare hidropneumatică.
+def afiseaza_tabel_rezultate(calcul: CalculIncrementalTronsoane, dn_disponibile, retea: str = "ARM"):
     """
-    story.append(Paragraph(info_gen, style_normal))
-    
-    # --- CAPITOLUL 2: DESCRIEREA INSTALAȚIILOR ---
-    story.append(Paragraph("2. DESCRIEREA TEHNICĂ A INSTALAȚIILOR", style_heading1))
-    
-    story.append(Paragraph("2.1. Alimentarea cu apă rece", style_heading2))
-    descriere_apa = f"""
-    Instalația de alimentare cu apă rece este realizată în sistem ramificat/inelar, dimensionată pentru a asigura debitele și presiunile necesare la punctele de consum cele mai dezavantajate.
-    Conductele de distribuție sunt realizate din <b>{data.get('material', 'N/A')}</b>, material ales pentru rezistența sa la coroziune, depuneri și presiune.
-    Traseele conductelor sunt pozate mascat (în ghene, șape, pereți falși) sau aparent, conform planurilor de arhitectură.
-    """
-    story.append(Paragraph(descriere_apa, style_normal))
-    
-    story.append(Paragraph("2.2. Izolații termice", style_heading2))
-    text_izolatii = """
-    Conductele de distribuție a apei reci se vor izola termic pentru a preveni formarea condensului și încălzirea apei. Izolația va fi de tip elastomer sau polietilenă expandată, cu grosimea minimă de 9-13 mm, în funcție de diametrul conductei și condițiile de montaj.
+    Tabelul de rezultate pe pagini: filtrarea, sortarea și paginarea se fac în motor,
+    iar în browser ajunge doar pagina curentă
     """
-    story.append(Paragraph(text_izolatii, style_normal))
+    cheie = f"rez_{retea.lower()}"
+    col1, col2, col3, col4, col5 = st.columns([2, 1.2, 1.5, 1, 1])
+    with col1:
+        dn_alese = st.multiselect("Filtru DN", dn_disponibile, key=f"{cheie}_dn", placeholder="Toate DN")
+    with col2:
+        peste_v_max = st.checkbox("Doar v > v_max", key=f"{cheie}_v_max")
+    with col3:
+        sortare = st.selectbox("Sortare după", ["(ordinea tronsoanelor)"] + COLOANE_REZULTATE, key=f"{cheie}_sortare")
+        descrescator = st.checkbox("Descrescător", key=f"{cheie}_descrescator")
+    with col4:
+        pe_pagina = st.selectbox("Rânduri / pagină", RANDURI_PAGINA, index=1, key=f"{cheie}_pe_pagina")
+    
+    pozitii = calcul.selecteaza(
+        dn=dn_alese or None,
+        peste_v_max=peste_v_max,
+        sortare=None if sortare not in COLOANE_REZULTATE else sortare,
+        descrescator=descrescator,
+        retea=retea,
+    )
+    pagini = max(1, -(-len(pozitii) // pe_pagina))
+    # După o filtrare pot rămâne mai puține pagini decât pagina curentă
+    if st.session_state.get(f"{cheie}_pagina", 1) > pagini:
+        st.session_state[f"{cheie}_pagina"] = pagini
+    with col5:
+        pagina = st.number_input("Pagina", 1, pagini, key=f"{cheie}_pagina")
+    
+    inceput = (pagina - 1) * pe_pagina
+    st.dataframe(
+        pd.DataFrame(calcul.pagina(pozitii, inceput, pe_pagina, retea)),
+        column_config=FORMAT_REZULTATE,
+        hide_index=True,
+        use_container_width=True,
+        height=400,
+    )
+    if len(pozitii):
+        st.caption(f"Rândurile {inceput + 1}–{min(inceput + pe_pagina, len(pozitii))} din {len(pozitii)}"
+                   f" (pagina {pagina} din {pagini})")
+    else:
+        st.caption("Niciun tronson nu corespunde filtrelor.")
 
-    # --- CAPITOLUL 3: BREVIAR DE CALCUL ---
-    story.append(Paragraph("3. BREVIAR DE CALCUL HIDRAULIC", style_heading1))
-    
-    story.append(Paragraph("3.1. Metodologia de calcul", style_heading2))
-    metodologie = """
-    Dimensionarea conductelor s-a efectuat conform SR 1343-1:2006. Debitul de calcul (qc) s-a determinat probabilistic în funcție de numărul de unități de consum și tipul clădirii.
-    
-    Relațiile de calcul utilizate:
-    """
-    story.append(Paragraph(metodologie, style_normal))
-    
-    formule = [
-        "• Debitul de calcul: qc = a * sqrt(E) [l/s] sau qc = c * sqrt(E) [l/s]",
-        "• Pierderea de sarcină liniară (Darcy-Weisbach): hd = λ * (L/D) * (v²/2g)",
-        "• Coeficientul de frecare (λ): Formula Colebrook-White",
-        "• Pierderea de sarcină locală: hl = Σζ * (v²/2g)",
-        "• Presiunea necesară la branșament: Hnec = Hg + Σhd + Σhl + Hu"
-    ]
-    for f in formule:
-        story.append(Paragraph(f, style_list))
-        
-    story.append(Paragraph("3.2. Parametri de calcul considerați", style_heading2))
-    params = f"""
-    • Temperatura apei reci: {data.get('temperatura', '10')} °C
-    • Presiunea minimă de utilizare la cel mai dezavantajat consumator: 15 mCA (1.5 bar)
-    • Viteze maxime admise: conform normativului I9-2022 (2.0 - 3.0 m/s în funcție de material și amplasare)
-    """
-    story.append(Paragraph(params, style_normal))
-    
-    # --- CAPITOLUL 4: REZULTATELE DIMENSIONĂRII ---
-    story.append(PageBreak())
-    story.append(Paragraph("4. TABEL CENTRALIZATOR DE DIMENSIONARE", style_heading1))
-    
-    if 'rezultate_arm' in data:
-        df = data['rezultate_arm']
-        
-        # Header tabel
-        table_data = [[
-            'Tronson', 
-            'Debit\n(l/s)', 
-            'DN\n(mm)', 
-            'Viteză\n(m/s)', 
-            'L\n(m)', 
-            'ΔH lin\n(mCA)', 
-            'ΔH loc\n(mCA)', 
-            'ΔH tot\n(mCA)'
-        ]]
-        
-        # Date tabel
-        for _, row in df.iterrows():
-            table_data.append([
-                str(row['Tronson']),
-                f"{row['Vc']:.3f}",
-                str(row['DN']),
-                f"{row['v']:.2f}",
-                f"{row['L']:.1f}",
-                f"{row['Σ i*L']:.2f}",
-                f"{row['Σ h_loc']:.2f}",
-                f"{row['h_tot']:.2f}"
-            ])
-            
-        # Stil tabel
-        t = Table(table_data, colWidths=[1.5*cm, 2*cm, 2*cm, 2*cm, 1.5*cm, 2*cm, 2*cm, 2*cm])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), font_name),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
-        story.append(t)
-        
-        story.append(Spacer(1, 15))
-        
-        # Rezultate finale evidențiate
-        story.append(Paragraph("REZULTATE FINALE ȘI NECESAR DE PRESIUNE", style_heading2))
-        
-        final_stats = [
-            f"Debit total de calcul (Qc): {data.get('debit_total', 0):.3f} l/s",
-            f"Pierdere de sarcină totală pe traseu: {data.get('presiune_totala', 0):.2f} mCA",
-            "Presiune de utilizare necesară: 15.00 mCA",
-            f"Presiune totală necesară la branșament (Hnec): {data.get('presiune_totala', 0) + 15.0:.2f} mCA"
-        ]
-        
-        for stat in final_stats:
-            story.append(Paragraph(f"• <b>{stat}</b>", style_normal))
+# ======================== RECIRCULARE ACM ========================
+IZOLATII_MM = (0, 9, 13, 20, 25, 30, 40, 50)
 
-    # --- CAPITOLUL 5: INSTRUCȚIUNI DE EXECUȚIE ȘI MONTAJ ---
-    story.append(PageBreak())
-    story.append(Paragraph("5. CAIET DE SARCINI - INSTRUCȚIUNI DE EXECUȚIE", style_heading1))
-    
-    instructiuni = [
-        "Execuția instalațiilor se va face numai de către personal calificat și autorizat.",
-        "La montajul conductelor se vor respecta instrucțiunile producătorului privind tăierea, îmbinarea și fixarea acestora.",
-        "Se vor prevedea puncte fixe și puncte de alunecare pentru preluarea dilatărilor termice.",
-        "Trecerea conductelor prin pereți și planșee se va face prin tuburi de protecție.",
-        "Distanța dintre elementele de susținere va respecta normativul I9-2022, în funcție de diametrul și materialul conductei.",
-        "După montaj, instalația se va spăla cu apă potabilă până la limpezire."
-    ]
-    
-    for instr in instructiuni:
-        story.append(Paragraph(f"• {instr}", style_list))
-        
-    story.append(Paragraph("5.1. Proba de presiune", style_heading2))
-    proba = """
-    Instalația se va supune probei de presiune la rece. Presiunea de probă va fi de 1.5 x Presiunea de regim, dar nu mai puțin de 6 bar.
-    Durata probei va fi de minim 2 ore. Pe durata probei nu se admit scurgeri sau deformări ale elementelor instalației.
-    Rezultatele probei se vor consemna într-un Proces Verbal de Probe.
-    """
-    story.append(Paragraph(proba, style_normal))
-    
-    # --- CAPITOLUL 6: EXPLOATARE ȘI ÎNTREȚINERE ---
-    story.append(Paragraph("6. EXPLOATARE ȘI ÎNTREȚINERE", style_heading1))
-    mentenanta = """
-    Beneficiarul are obligația de a asigura verificarea periodică a etanșeității instalației și a bunei funcționări a armăturilor.
-    Se recomandă:
+def dn_dupa_fractie(coloane_acm, fractii) -> np.ndarray:
+    """DN-ul tronsonului ACM care transportă cel puțin fracția dată din Utot"""
+    utot = np.asarray(coloane_acm["Utot"], dtype=float)
+    idx = np.searchsorted(utot, np.asarray(fractii) * utot[-1], side="left")
+    return np.asarray(coloane_acm["DN"])[np.minimum(idx, len(utot) - 1)]
+
+def afiseaza_recirculare(coloane_acm, material: str, model_frecare: str):
     """
-    story.append(Paragraph(mentenanta, style_normal))
-    
-    recomandari = [
-        "Verificarea vizuală lunară a traseelor aparente;",
-        "Manevrarea robineților de închidere cel puțin o dată la 6 luni pentru a preveni blocarea;",
-        "Curățarea filtrelor Y și a aeratoarelor bateriilor trimestrial;",
-        "Verificarea presiunii în vasul de expansiune al hidroforului (dacă există) semestrial."
-    ]
-    for rec in recomandari:
-        story.append(Paragraph(f"- {rec}", style_list))
-        
-    # --- CAPITOLUL 7: MĂSURI DE SSM ȘI PSI ---
-    story.append(Paragraph("7. MĂSURI DE SĂNĂTATE ȘI SECURITATE ÎN MUNCĂ", style_heading1))
-    ssm = """
-    La execuția lucrărilor se vor respecta normele generale de protecție a muncii și normele specifice pentru lucrări de instalații tehnico-sanitare.
-    Personalul va fi dotat cu echipament de protecție adecvat (salopetă, cască, mănuși, încălțăminte de protecție).
-    Se vor respecta normele de prevenire și stingere a incendiilor specifice șantierelor de construcții.
+    Bucla de recirculare peste rețeaua ACM: dimensionarea la cerere, apoi
+    analiza la fiecare rulare pentru setările kv editate (reglaj interactiv)
     """
-    story.append(Paragraph(ssm, style_normal))
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        nr_coloane = st.number_input("Nr. coloane", 1, 200, 6, key="rec_nr_coloane")
+        t_plecare = st.number_input("T plecare preparator (°C)", 50.0, 80.0, TEMPERATURA_PLECARE, key="rec_t_plecare")
+    with col2:
+        lungime_coloana = st.number_input("Lungime coloană (m)", 1.0, 200.0, 15.0, key="rec_l_coloana")
+        t_minima = st.number_input("T minimă în buclă (°C)", 40.0, 70.0, TEMPERATURA_MINIMA_RETUR, key="rec_t_minima")
+    with col3:
+        lungime_distributie = st.number_input("Tronson distribuție (m)", 0.5, 100.0, 6.0, key="rec_l_distributie")
+        t_ghene = st.number_input("T aer ghene (°C)", 0.0, 35.0, 20.0, key="rec_t_ghene")
+    with col4:
+        izolatie_coloane = st.selectbox("Izolație coloane (mm)", IZOLATII_MM, index=3, key="rec_iz_coloane")
+        izolatie_distributie = st.selectbox("Izolație distribuție (mm)", IZOLATII_MM, index=5, key="rec_iz_distributie")
+        t_subsol = st.number_input("T aer distribuție (°C)", 0.0, 35.0, 15.0, key="rec_t_subsol")
+    
+    # DN-urile implicite din dimensionarea ACM: coloana preia 1/n din Utot,
+    # tronsonul de distribuție j alimentează coloanele j..n
+    n = int(nr_coloane)
+    coloane = pd.DataFrame({
+        "Coloana": np.arange(1, n + 1),
+        "L coloană (m)": np.full(n, lungime_coloana),
+        "DN coloană": np.full(n, dn_dupa_fractie(coloane_acm, [1 / n])[0]),
+        "L distribuție (m)": np.full(n, lungime_distributie),
+        "DN distribuție": dn_dupa_fractie(coloane_acm, (n - np.arange(n)) / n),
+    })
+    coloane = st.data_editor(coloane, disabled=["Coloana"], hide_index=True, use_container_width=True,
+                             key=f"rec_coloane_{n}")
     
-    # Final
-    story.append(Spacer(1, 2*cm))
-    story.append(Paragraph("Întocmit,", style_normal))
-    story.append(Paragraph("Inginer Proiectant", style_normal))
+    try:
+        bucla = BuclaRecirculare(
+            material,
+            coloane["L coloană (m)"].to_numpy(), coloane["DN coloană"].to_numpy(),
+            coloane["L distribuție (m)"].to_numpy(), coloane["DN distribuție"].to_numpy(),
+            izolatie_coloane_mm=izolatie_coloane, izolatie_distributie_mm=izolatie_distributie,
+            temperatura_coloane=t_ghene, temperatura_distributie=t_subsol,
+            model_frecare=model_frecare,
+        )
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+    
+    # Dimensionarea rămâne valabilă cât timp bucla și temperaturile nu se schimbă
+    cheie = (material, model_frecare, coloane.to_numpy().tobytes(), izolatie_coloane, izolatie_distributie,
+             t_ghene, t_subsol, t_plecare, t_minima)
+    if st.button("♨️ Dimensionează recircularea", type="primary"):
+        try:
+            st.session_state.recirculare = {"cheie": cheie, "bucla": bucla,
+                                            "dimensionare": bucla.dimensioneaza(t_plecare, t_minima)}
+        except ValueError as e:
+            st.error(f"❌ {e}")
+    recirculare = st.session_state.get("recirculare")
+    if not recirculare or recirculare["cheie"] != cheie:
+        st.info("ℹ️ Apăsați „Dimensionează recircularea” după fiecare modificare a buclei.")
+        return
+    
+    # DN-urile de retur alese la dimensionare se trec analizei
+    bucla, dim = recirculare["bucla"], recirculare["dimensionare"]
+    if not dim["fezabil"]:
+        st.error("❌ Distribuția se răcește sub temperatura minimă înainte de coloane: "
+                 "măriți izolația sau temperatura de plecare.")
+    elif not dim["convergent"]:
+        st.warning(f"⚠️ Dimensionarea nu a convers în {dim['iteratii']} iterații.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🔁 Debit pompă", f"{dim['debit_pompa_m3h']:.3f} m³/h")
+    with col2:
+        st.metric("⬆️ Înălțime pompă", f"{dim['inaltime_pompa_m']:.2f} mCA")
+    with col3:
+        st.metric("🔥 Pierderi căldură", f"{dim['flux_caldura_W']:.0f} W")
+    with col4:
+        st.metric("⚡ Putere pompă (estimată)", f"{dim['putere_estimata_W']:.0f} W")
+    
+    # Reglajul vanelor: analiza se reface la fiecare modificare a tabelului
+    st.markdown("**Reglaj vane de echilibrare**")
+    inaltime_pompa = st.number_input("Înălțime pompă (mCA)", 0.05, 50.0, round(dim["inaltime_pompa_m"], 2),
+                                     key="rec_inaltime_pompa")
+    vane = st.data_editor(pd.DataFrame({
+        "Coloana": coloane["Coloana"],
+        "DN retur": dim["dn_retur_coloane"],
+        "kv (m³/h)": dim["kv_vane"],
+    }), disabled=["Coloana", "DN retur"], hide_index=True, use_container_width=True, key=f"rec_vane_{n}",
+        column_config={"kv (m³/h)": st.column_config.NumberColumn("kv (m³/h)", format="%.3f", min_value=0.001)})
+    try:
+        with etapa("Analiză recirculare"):
+            analiza = bucla.analizeaza(vane["kv (m³/h)"].to_numpy(dtype=float), inaltime_pompa,
+                                       dn_retur_coloane=dim["dn_retur_coloane"],
+                                       dn_retur_distributie=dim["dn_retur_distributie"],
+                                       temperatura_plecare=t_plecare, temperatura_minima=t_minima)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        st.error(f"❌ {e}")
+        return
+    
+    st.dataframe(pd.DataFrame({
+        "Coloana": coloane["Coloana"],
+        "Debit (l/h)": analiza["debit_lh"],
+        "T bază (°C)": analiza["T_baza"],
+        "T vârf (°C)": analiza["T_varf"],
+        "T vană (°C)": analiza["T_iesire"],
+    }).style.format({"Debit (l/h)": "{:.1f}", "T bază (°C)": "{:.2f}", "T vârf (°C)": "{:.2f}",
+                     "T vană (°C)": "{:.2f}"}), hide_index=True, use_container_width=True)
+    if len(analiza["sub_minim"]):
+        st.warning(f"⚠️ Sub {t_minima:.0f} °C la coloanele: {', '.join(map(str, analiza['sub_minim']))}")
+    else:
+        st.success(f"✅ Toată bucla rămâne peste {t_minima:.0f} °C; retur la preparator "
+                   f"{analiza['T_retur_preparator']:.2f} °C, pompa la {analiza['debit_pompa_m3h']:.3f} m³/h")
+    fig_rec = go.Figure(go.Bar(x=coloane["Coloana"], y=analiza["T_iesire"], name="T la vană"))
+    fig_rec.add_hline(y=t_minima, line_dash="dash", line_color="red", annotation_text=f"{t_minima:.0f} °C")
+    fig_rec.update_layout(xaxis_title="Coloana", yaxis_title="Temperatură (°C)", height=350,
+                          yaxis_range=[min(analiza["T_minima"], t_minima) - 2, t_plecare + 1])
+    st.plotly_chart(fig_rec, use_container_width=True)
 
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+# ======================== PROFILARE ========================
+DIRECTOR_PROFILURI = os.environ.get("SANITARE_PROFIL_DIR", "profiluri")
 
-# ======================== INIȚIALIZARE SESSION STATE ========================
-if 'tronsoane_arm' not in st.session_state:
-    st.session_state.tronsoane_arm = []
+def afiseaza_profil(profil: ProfilRerun):
+    """Timpii rulării curente în sidebar; la cerere profilul se salvează pe disc"""
+    cale = None
+    if st.session_state.get('profil_salvare'):
+        if 'sesiune_profil' not in st.session_state:
+            st.session_state.sesiune_profil = uuid.uuid4().hex[:12]
+        cale = profil.salveaza(DIRECTOR_PROFILURI, st.session_state.sesiune_profil)
+    
+    with st.sidebar.expander(f"⏱️ Profilare rulare: {profil.durata * 1000:.0f} ms"):
+        st.dataframe(
+            pd.DataFrame(profil.rezumat(), columns=COLOANE_PROFIL).style.format({"ms": "{:.1f}", "%": "{:.1f}"}),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.checkbox("cProfile la rulările următoare", key="profil_cprofile")
+        st.checkbox(f"Salvează profilurile în {DIRECTOR_PROFILURI}/", key="profil_salvare")
+        if cale:
+            st.caption(f"Ultimul profil: {cale}")
 
-if 'tronsoane_acm' not in st.session_state:
-    st.session_state.tronsoane_acm = []
+# ======================== INIȚIALIZARE SESSION STATE ========================
+def init_session_state():
+    if 'proiect_id' not in st.session_state:
+        depozit = depozit_proiecte()
+        proiecte = depozit.lista_proiecte()
+        if proiecte:
+            proiect_id = proiecte[0]["id"]
+        else:
+            proiect_id = depozit.creeaza_proiect(
+                "Proiect 1", catalog().destinatii[0], catalog().materiale[0]
+            )
+        deschide_proiect(proiect_id)
 
-if 'rezultate_calcul' not in st.session_state:
-    st.session_state.rezultate_calcul = {}
+    if 'calcul_arm' not in st.session_state:
+        # Rețeaua ACM se calculează în aceeași trecere (aceleași trasee, consumatorii cu apă caldă)
+        st.session_state.calcul_arm = CalculIncrementalTronsoane(
+            catalog().destinatii[0], catalog().materiale[0], 10, "ARM",
+            temperatura_acm=TEMPERATURA_ACM_IMPLICITA,
+        )
 
 # ======================== INTERFAȚA STREAMLIT ========================
 
@@ -935,12 +372,44 @@ def main():
     """, unsafe_allow_html=True)
     
     # ======================== SIDEBAR ========================
+    depozit = depozit_proiecte()
+    
     with st.sidebar:
+        st.header("📁 Proiect")
+        
+        proiecte = {p["id"]: p["nume"] for p in depozit.lista_proiecte()}
+        id_proiecte = list(proiecte.keys())
+        proiect_ales = st.selectbox(
+            "Proiect activ",
+            options=id_proiecte,
+            index=id_proiecte.index(st.session_state.proiect_id),
+            format_func=lambda i: proiecte[i],
+        )
+        if proiect_ales != st.session_state.proiect_id:
+            deschide_proiect(proiect_ales)
+            st.rerun()
+        
+        with st.expander("➕ Proiect nou"):
+            nume_proiect_nou = st.text_input("Nume proiect")
+            if st.button("Creează proiect") and nume_proiect_nou:
+                try:
+                    deschide_proiect(depozit.creeaza_proiect(
+                        nume_proiect_nou, catalog().destinatii[0], catalog().materiale[0]
+                    ))
+                    st.rerun()
+                except ValueError as exc:
+                    st.warning(f"⚠️ {exc}")
+        
+        proiect = depozit.incarca_proiect(st.session_state.proiect_id)
+        proiect_id = proiect["id"]
+        
         st.header("⚙️ Configurare Proiect")
         
         destinatie_aleasa = st.selectbox(
             "🏢 Destinația clădirii",
-            options=list(DESTINATII_CLADIRE.keys()),
+            options=catalog().destinatii,
+            index=catalog().index_destinatii[proiect["destinatie"]],
+            key=f"destinatie_{proiect_id}",
         )
         
         config_destinatie = DESTINATII_CLADIRE[destinatie_aleasa]
@@ -955,27 +424,91 @@ def main():
         
         st.markdown("---")
         
+        if proiect["material"] not in catalog().index_materiale:
+            st.warning(f"⚠️ Materialul proiectului ({proiect['material']}) nu mai există în catalog; "
+                       f"se folosește {catalog().materiale[0]}. Reîncărcați catalogul furnizorului "
+                       f"pentru a-l păstra.")
         material_ales = st.selectbox(
             "� Material conductă",
-            options=list(MATERIALE_CONDUCTE.keys())
+            options=catalog().materiale,
+            index=catalog().index_materiale.get(proiect["material"], 0),
+            key=f"material_{proiect_id}",
         )
         
         temperatura = st.slider(
             "🌡️ Temperatură (°C)",
-            min_value=5, max_value=70, value=10
+            min_value=5, max_value=70, value=int(proiect["temperatura"]),
+            key=f"temperatura_{proiect_id}",
+        )
+        
+        temperatura_acm = st.slider(
+            "🔥 Temperatură ACM (°C)",
+            min_value=40, max_value=70, value=int(proiect["temperatura_acm"]),
+            key=f"temperatura_acm_{proiect_id}",
         )
         
+        model_frecare = st.selectbox(
+            "📉 Coeficient de frecare λ",
+            options=MODELE_FRECARE,
+            index=MODELE_FRECARE.index(proiect["model_frecare"]),
+            key=f"model_frecare_{proiect_id}",
+            format_func=lambda m: {
+                "colebrook": "Colebrook-White (exact)",
+                "haaland": "Haaland (±1.5%)",
+                "swamee-jain": "Swamee-Jain (±1%)",
+            }[m],
+        )
+        
+        # Salvare parametri modificați
+        parametri = {
+            "destinatie": destinatie_aleasa,
+            "material": material_ales,
+            "temperatura": temperatura,
+            "model_frecare": model_frecare,
+            "temperatura_acm": temperatura_acm,
+        }
+        modificari = {camp: valoare for camp, valoare in parametri.items() if proiect[camp] != valoare}
+        if modificari:
+            depozit.actualizeaza_proiect(proiect_id, **modificari)
+        
         st.markdown("---")
         
         # Butoane acțiuni
         if st.button("🗑️ Șterge toate tronsoanele ARM", type="secondary"):
+            depozit.sterge_tronsoane(proiect_id, "ARM")
             st.session_state.tronsoane_arm = []
             st.rerun()
         
-        if st.button("🗑️ Șterge toate tronsoanele ACM", type="secondary"):
-            st.session_state.tronsoane_acm = []
-            st.rerun()
+        with st.expander("📦 Catalog furnizor conducte"):
+            st.caption("CSV/JSON cu coloanele: material, dn, d_int_mm, rugozitate_mm, v_max "
+                       "(opțional: notatie, sdr, pret_lei_m)")
+            fisier_catalog = st.file_uploader("Fișier catalog", type=["csv", "json"])
+            if fisier_catalog is not None and st.button("📥 Încarcă catalogul"):
+                try:
+                    produse = citeste_catalog_furnizor(
+                        fisier_catalog.getvalue().decode("utf-8"),
+                        "json" if fisier_catalog.name.lower().endswith(".json") else "csv",
+                    )
+                    info_catalog = f"Catalog furnizor ({fisier_catalog.name})"
+                    materiale_noi = inregistreaza_catalog_furnizor(produse, info_catalog)
+                    depozit.salveaza_catalog_furnizor(produse, info_catalog)
+                    st.success(f"✅ {len(produse)} produse, {len(materiale_noi)} materiale încărcate")
+                except (UnicodeDecodeError, ValueError) as exc:
+                    st.error(f"❌ Catalog invalid: {exc}")
+        
+        with st.expander("🗄️ Cache cataloage"):
+            statistici = statistici_cache()
+            st.caption(
+                f"Accesări: {statistici['accesari']} | Ratări: {statistici['ratari']} | "
+                f"Rată: {statistici['rata_reusita']:.1%}  \n"
+                f"Compilări: {statistici['compilari']} | Invalidări: {statistici['invalidari']}"
+            )
+            if st.button("🔄 Recompilează cataloagele"):
+                invalideaza_catalog()
+                st.rerun()
 
+    marcaj("Antet și sidebar")
+    
     # Tabs principale
     tab_principal = st.tabs([
         "🚿 Alimentare cu Apă",
@@ -994,7 +527,8 @@ def main():
             "Consumatori & Trasee",
             "Branșament",
             "Vas Tampon",
-            "Hidrofor"
+            "Hidrofor",
+            "Comparație variante"
         ])
         
         # --- Sub-tab Consumatori & Trasee ---
@@ -1008,7 +542,8 @@ def main():
                 consumatori_tronson = {}
                 cols = st.columns(3)
                 
-                for idx, (nume, date) in enumerate(CONSUMATORI.items()):
+                for idx, nume in enumerate(catalog().consumatori):
+                    date = CONSUMATORI[nume]
                     with cols[idx % 3]:
                         cant = st.number_input(
                             f"{nume} (Vs={date['debit']}, U={date['unitate']})",
@@ -1053,6 +588,7 @@ def main():
                             "diferenta_nivel": diferenta_nivel,
                             "suma_zeta": suma_zeta
                         }
+                        depozit.salveaza_tronson(proiect_id, tronson, "ARM")
                         st.session_state.tronsoane_arm.append(tronson)
                         st.success(f"✅ Tronson {tronson['nr']} adăugat!")
                         st.rerun()
@@ -1064,92 +600,20 @@ def main():
                 st.markdown("---")
                 st.subheader("📊 Tronsoane Definite")
                 
-                # Calcul cumulat
-                rezultate = []
-                consumatori_cumulate = {}
-                suma_i_L_cumulata = 0
-                suma_h_loc_cumulata = 0
-                suma_h_geom_cumulata = 0
-                
-                for tronson in st.session_state.tronsoane_arm:
-                    # Actualizez consumatorii cumulați
-                    for cons, cant in tronson["consumatori"].items():
-                        consumatori_cumulate[cons] = consumatori_cumulate.get(cons, 0) + cant
-                    
-                    # Calcul Vs și E cumulate
-                    suma_vs = sum(CONSUMATORI[c]["debit"] * q for c, q in consumatori_cumulate.items())
-                    suma_E = sum(CONSUMATORI[c]["unitate"] * q for c, q in consumatori_cumulate.items())
-                    suma_Utot = suma_E  # Utot = E
-                    N = sum(consumatori_cumulate.values())
-                    f = calcul_factor_f(N, destinatie_aleasa)
-                    
-                    # Debit de calcul
-                    Vc = calcul_debit_cu_destinatie(suma_vs, suma_E, destinatie_aleasa, "ARM")
-                    
-                    # Dimensionare
-                    info_material = MATERIALE_CONDUCTE[material_ales]
-                    dim = dimensioneaza_tronson(
-                        Vc, tronson["lungime"], material_ales, 
-                        temperatura, tronson["suma_zeta"], info_material
-                    )
-                    
-                    if dim:
-                        suma_i_L_cumulata += dim["i_L"]
-                        suma_h_loc_cumulata += dim["h_loc_mmca"]
-                        suma_h_geom_cumulata += tronson.get("diferenta_nivel", 0) * 1000 # convertim in mmCA pentru consistenta interna
-                        
-                        # h_tot (mCA) = (Liniare + Locale + Geometrice) / 1000
-                        h_tot = (suma_i_L_cumulata + suma_h_loc_cumulata + suma_h_geom_cumulata) / 1000
-                        
-                        rezultate.append({
-                            "Tronson": tronson["nr"],
-                            "Consumatori": ", ".join([f"{c}:{q}" for c, q in tronson["consumatori"].items()]),
-                            "Utot": suma_Utot,
-                            "N": N,
-                            "f": f,
-                            "Vs": suma_vs,
-                            "Vc": Vc,
-                            "DN": dim["dn"],
-                            "d_int": dim["d_int_mm"],
-                            "v": dim["viteza_ms"],
-                            "i": dim["i_specific_pa_m"],
-                            "L": tronson["lungime"],
-                            "i*L": dim["i_L"],
-                            "Σ i*L": suma_i_L_cumulata,
-                            "Σ ζ": tronson["suma_zeta"],
-                            "h_loc": dim["h_loc_mmca"],
-                            "Σ h_loc": suma_h_loc_cumulata,
-                            "h_geom": tronson.get("diferenta_nivel", 0),
-                            "Σ h_geom": suma_h_geom_cumulata / 1000,
-                            "h_tot": h_tot
-                        })
+                # Calcul cumulat (incremental: doar tronsoanele modificate și cele din aval)
+                calcul_arm = st.session_state.calcul_arm
+                with etapa("Calcul tronsoane"):
+                    calcul_arm.seteaza_parametri(destinatie_aleasa, material_ales, temperatura, model_frecare,
+                                                 temperatura_acm)
+                    calcul_arm.sincronizeaza(st.session_state.tronsoane_arm)
                 
                 # Tabel rezultate
-                df_rezultate = pd.DataFrame(rezultate)
+                with etapa("DataFrame rezultate"):
+                    df_rezultate = pd.DataFrame(calcul_arm.coloane())
                 
-                # Formatare tabel
-                st.dataframe(
-                    df_rezultate.style.format({
-                        "Utot": "{:.1f}",
-                        "f": "{:.3f}",
-                        "Vs": "{:.3f}",
-                        "Vc": "{:.3f}",
-                        "d_int": "{:.1f}",
-                        "v": "{:.2f}",
-                        "i": "{:.0f}",
-                        "L": "{:.1f}",
-                        "i*L": "{:.1f}",
-                        "Σ i*L": "{:.1f}",
-                        "Σ ζ": "{:.1f}",
-                        "h_loc": "{:.1f}",
-                        "Σ h_loc": "{:.1f}",
-                        "h_geom": "{:.2f}",
-                        "Σ h_geom": "{:.2f}",
-                        "h_tot": "{:.3f}"
-                    }),
-                    use_container_width=True,
-                    height=400
-                )
+                # Tabel paginat (filtrare, sortare și paginare în motor)
+                with etapa("Tabel rezultate (pagină)"):
+                    afiseaza_tabel_rezultate(calcul_arm, np.unique(df_rezultate["DN"].to_numpy()).tolist())
                 
                 # Rezultate finale
                 st.markdown("---")
@@ -1174,29 +638,107 @@ def main():
                     st.metric("📊 h_tot", f"{ultima_linie['h_tot']:.3f} mCA")
                     st.metric("🎯 Factor f", f"{ultima_linie['f']:.3f}")
                 
+                # Rețeaua ACM, dimensionată în aceeași trecere cu ARM
+                st.markdown("---")
+                st.subheader(f"🔥 Tronsoane ACM ({temperatura_acm} °C)")
+                st.caption("Aceleași trasee ca ARM, doar consumatorii alimentați cu apă caldă; "
+                           "debitul de calcul folosește coeficientul b (ACM) al destinației.")
+                with etapa("Rezultate ACM"):
+                    coloane_acm = calcul_arm.coloane("ACM")
+                if len(coloane_acm["Tronson"]):
+                    with etapa("Tabel rezultate ACM (pagină)"):
+                        afiseaza_tabel_rezultate(calcul_arm, np.unique(coloane_acm["DN"]).tolist(), "ACM")
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("🔥 Debit calcul ACM", f"{coloane_acm['Vc'][-1]:.3f} l/s")
+                    with col2:
+                        st.metric("📏 Diametru final ACM", f"DN{coloane_acm['DN'][-1]}")
+                    with col3:
+                        st.metric("💨 Viteză finală ACM", f"{coloane_acm['v'][-1]:.2f} m/s")
+                    with col4:
+                        st.metric("📊 h_tot ACM", f"{coloane_acm['h_tot'][-1]:.3f} mCA")
+                    with st.expander("♨️ Recirculare ACM (bucla, vanele de echilibrare, pompa)"):
+                        afiseaza_recirculare(coloane_acm, material_ales, model_frecare)
+                else:
+                    st.info("ℹ️ Niciun tronson nu alimentează consumatori cu apă caldă.")
+                
                 # Grafic evoluție pierderi
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=df_rezultate['Tronson'],
-                    y=df_rezultate['Σ i*L'],
-                    name='Σ i*L (mmCA)',
-                    mode='lines+markers',
-                    line=dict(color='#2196f3', width=3)
-                ))
-                fig.add_trace(go.Scatter(
-                    x=df_rezultate['Tronson'],
-                    y=df_rezultate['Σ h_loc'],
-                    name='Σ h_loc (mmCA)',
-                    mode='lines+markers',
-                    line=dict(color='#ff9800', width=3)
-                ))
-                fig.update_layout(
-                    title="Evoluția pierderilor cumulate",
-                    xaxis_title="Tronson",
-                    yaxis_title="Pierderi (mmCA)",
-                    height=400
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                with etapa("Grafic pierderi (plotly)"):
+                    fig = figura_pierderi(
+                        df_rezultate['Tronson'].to_numpy(),
+                        df_rezultate['Σ i*L'].to_numpy(),
+                        df_rezultate['Σ h_loc'].to_numpy(),
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Optimizare diametre (cost minim la presiunea disponibilă)
+                with st.expander("💰 Optimizare diametre (cost minim)"):
+                    sarcina_disponibila = st.number_input(
+                        "Presiune disponibilă la branșament (mCA)",
+                        min_value=5.0, max_value=150.0, value=30.0,
+                        help="Se alege DN-ul de cost minim care asigură presiune_min la toți consumatorii"
+                    )
+                    if st.button("💰 Optimizează diametrele"):
+                        retea_arm = Retea.din_tronsoane(
+                            st.session_state.tronsoane_arm, material_ales, temperatura,
+                            destinatie_aleasa, sarcina_disponibila, model_frecare
+                        )
+                        optim = retea_arm.optimizeaza_diametre()
+                        dn_optim = dict(zip(optim["conducte"], optim["dn"]))
+                        st.dataframe(pd.DataFrame({
+                            "Tronson": df_rezultate["Tronson"],
+                            "DN (v_max)": df_rezultate["DN"],
+                            "DN optim": [int(dn_optim[f"Tronson {nr}"]) for nr in df_rezultate["Tronson"]],
+                        }), use_container_width=True)
+                        if optim["fezabil"]:
+                            st.success(f"✅ Cost conducte: **{optim['cost_total']:.0f} lei**, "
+                                       f"rezervă minimă de presiune: **{optim['marja_minima_m']:.2f} mCA**")
+                        else:
+                            st.error(f"❌ Presiunea disponibilă nu ajunge nici cu diametrele maxime; "
+                                     f"lipsesc **{-optim['marja_minima_m']:.2f} mCA** (este necesar hidrofor)")
+                        # Verificarea soluției prin rezolvarea Newton a rețelei, cu DN-urile alese
+                        solutie = retea_arm.rezolva(dn_impus=optim["dn"])
+                        if solutie["convergent"]:
+                            st.caption(f"Rezolvarea rețelei cu DN-urile optime a convers în "
+                                       f"{solutie['iteratii']} iterații (reziduu "
+                                       f"{solutie['reziduu_energie_m']:.1e} m).")
+                        else:
+                            st.warning(f"⚠️ Rezolvarea rețelei nu a convers în {solutie['iteratii']} iterații; "
+                                       f"reziduu energie {solutie['reziduu_energie_m']:.2e} m, "
+                                       f"continuitate {solutie['reziduu_continuitate_ls']:.2e} l/s. "
+                                       f"Rezultatele de mai sus sunt orientative.")
+                
+                # Verificarea debitelor normate prin simulare Monte Carlo
+                with st.expander("🎲 Verificare simultaneitate (Monte Carlo)"):
+                    st.caption("Probabilitățile de utilizare sunt orientative (PROBABILITATI_UTILIZARE), "
+                               "ajustate cu factorul destinației.")
+                    pasi_simulare = st.select_slider(
+                        "Pași de timp simulați",
+                        options=[100_000, 1_000_000, 5_000_000],
+                        value=1_000_000,
+                        format_func=lambda n: f"{n:,}".replace(",", "."),
+                    )
+                    if st.button("🎲 Simulează"):
+                        simulare = pd.DataFrame(
+                            simuleaza_simultaneitate(st.session_state.tronsoane_arm, destinatie_aleasa, pasi_simulare),
+                            columns=COLOANE_SIMULARE,
+                        )
+                        st.dataframe(simulare.style.format({
+                            "Vc": "{:.3f}", "P50": "{:.2f}", "P95": "{:.2f}", "P99": "{:.2f}",
+                            "P99.9": "{:.2f}", "Max": "{:.2f}", "Vc/P99": "{:.2f}",
+                        }), use_container_width=True)
+                        subdimensionate = simulare[simulare["Vc/P99"] < 1]
+                        if len(subdimensionate):
+                            st.warning(f"⚠️ Vc normat sub P99 simulat pe tronsoanele: "
+                                       f"{', '.join(map(str, subdimensionate['Tronson']))}")
+                        fig_mc = go.Figure()
+                        fig_mc.add_trace(urma_grafic(simulare["Tronson"], simulare["Vc"],
+                                                     mode="lines+markers", name="Vc normat"))
+                        for coloana in ("P95", "P99", "P99.9"):
+                            fig_mc.add_trace(urma_grafic(simulare["Tronson"], simulare[coloana],
+                                                         mode="lines", name=f"{coloana} simulat"))
+                        fig_mc.update_layout(xaxis_title="Tronson", yaxis_title="Debit (L/s)", height=400)
+                        st.plotly_chart(fig_mc, use_container_width=True)
                 
                 # Salvare rezultate în session state pentru alte tab-uri
                 ultima_linie = df_rezultate.iloc[-1]
@@ -1209,16 +751,28 @@ def main():
                     "temperatura": temperatura
                 }
                 
-                # Buton export Excel
+                # Buton export Excel (fișierul se generează doar la cerere, în memorie)
                 if st.button("📥 Exportă în Excel ARM"):
-                    output_path = "Calcul_ARM_Tronsoane.xlsx"
-                    df_rezultate.to_excel(output_path, index=False, sheet_name="ARM")
-                    st.success(f"✅ Tabelul a fost exportat!")
+                    st.download_button(
+                        label="⬇️ Descarcă Calcul_ARM_Tronsoane.xlsx",
+                        data=export_excel(calcul_arm.coloane(), foaie="ARM"),
+                        file_name="Calcul_ARM_Tronsoane.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    )
+                if len(coloane_acm["Tronson"]) and st.button("📥 Exportă în Excel ACM"):
+                    st.download_button(
+                        label="⬇️ Descarcă Calcul_ACM_Tronsoane.xlsx",
+                        data=export_excel(coloane_acm, foaie="ACM"),
+                        file_name="Calcul_ACM_Tronsoane.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    )
             
             else:
                 st.info("ℹ️ Nu există tronsoane definite. Adaugă primul tronson!")
                 st.session_state.rezultate_calcul = {}
         
+        marcaj("Consumatori & Trasee")
+        
         # --- Sub-tab Branșament ---
         with sub_tabs[1]:
             st.subheader("🔌 Dimensionare Branșament")
@@ -1261,6 +815,8 @@ def main():
                         st.write(f"📉 Pierdere totală: **{rezultat['pierdere_totala']:.2f} mCA**")
                         st.write(f"⚡ Presiune necesară la branșament: **{rezultat['presiune_necesara_bransament']:.1f} mCA**")
         
+        marcaj("Branșament")
+        
         # --- Sub-tab Vas Tampon ---
         with sub_tabs[2]:
             st.subheader("💧 Dimensionare Vas Tampon (Rezervor de Rupere)")
@@ -1296,6 +852,51 @@ def main():
                         st.write(f"⬆️ DN plecare: **DN{rezultat['diametru_plecare']}**")
                         st.write(f"🚪 DN golire: **DN{rezultat['diametru_golire']}**")
                         st.write(f"💧 Debit alimentare: **{rezultat['debit_alimentare']:.2f} m³/h**")
+                
+                # Simulare în timp: profil orar al destinației vs. debitul de alimentare
+                with st.expander("📈 Simulare în timp (profil de consum)"):
+                    st.caption("Profilurile orare (PROFILURI_CONSUM_ORAR) sunt orientative; "
+                               "vasul pornește plin și se umple prin robinet cu flotor.")
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        volum_zilnic = st.number_input("Consum zilnic (m³/zi)", min_value=0.1,
+                                                       max_value=5000.0, value=max(0.1, round(debit_orar * 8, 1)))
+                    with col2:
+                        zile_simulate = st.number_input("Zile simulate", min_value=1, max_value=365, value=7)
+                    with col3:
+                        variatie_consum = st.number_input("Variație în interiorul orei (CV)", min_value=0.0,
+                                                          max_value=2.0, value=0.3, step=0.1)
+                    
+                    if st.button("📈 Simulează vasul tampon"):
+                        cerere = profil_consum(destinatie_aleasa, volum_zilnic, int(zile_simulate),
+                                               variatie=variatie_consum, seed=0)
+                        debit_mediu = volum_zilnic / 24
+                        debite_alimentare = np.linspace(debit_mediu, max(debit_orar * 1.2, 2 * debit_mediu), 8)
+                        simulare_vas = simuleaza_vas_tampon(cerere, debite_alimentare)
+                        st.dataframe(pd.DataFrame({
+                            "Alimentare (m³/h)": simulare_vas["debite_alimentare_m3h"],
+                            "Deficit maxim (L)": simulare_vas["deficit_maxim_l"],
+                            "Volum standard (L)": simulare_vas["volum_ales_l"],
+                            "Oprit de flotor (m³)": simulare_vas["volum_oprit_l"] / 1000,
+                        }).style.format("{:.2f}", na_rep="insuficient"), use_container_width=True)
+                        
+                        fezabile = np.flatnonzero(~np.isnan(simulare_vas["volum_ales_l"]))
+                        if len(fezabile):
+                            k = fezabile[0]
+                            nivel = nivel_vas_tampon(cerere, debite_alimentare[k], simulare_vas["volum_ales_l"][k])
+                            fig_vas = go.Figure(urma_grafic(
+                                np.arange(len(nivel)) / 60, nivel, mode="lines", name="Nivel"
+                            ))
+                            fig_vas.update_layout(
+                                title=f"Nivel în vas: {simulare_vas['volum_ales_l'][k]:.0f} L, "
+                                      f"alimentare {debite_alimentare[k]:.2f} m³/h",
+                                xaxis_title="Timp (h)", yaxis_title="Volum apă (L)", height=400,
+                            )
+                            st.plotly_chart(fig_vas, use_container_width=True)
+                        else:
+                            st.error("❌ Niciun volum standard nu acoperă deficitul; măriți debitul de alimentare.")
+        
+        marcaj("Vas Tampon")
         
         # --- Sub-tab Hidrofor ---
         with sub_tabs[3]:
@@ -1350,6 +951,169 @@ def main():
                         st.write(f"🛢️ Volum rezervor: **{rezultat['volum_rezervor']} L**")
                         st.write(f"⚡ Putere estimată: **{rezultat['putere_estimata']:.2f} kW**")
                         st.write(f"🔄 Porniri/oră max: **{rezultat['porniri_ora_max']}**")
+                
+                # Verificare pe evenimente: toate volumele standard x configurațiile de pompe
+                with st.expander("⏱️ Simulare cicluri hidrofor (porniri reale/oră)"):
+                    st.caption("Cererea urmează profilul orar al destinației, limitată la debitul de calcul; "
+                               "pompele pornesc în cascadă, decalate cu 3 mCA, banda fiecărei pompe este 20 mCA.")
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        consum_zilnic_hidrofor = st.number_input(
+                            "Consum zilnic (m³/zi)", min_value=0.1, max_value=5000.0,
+                            value=max(0.1, round(debit_hidrofor * 3.6 * 8, 1)), key="consum_zilnic_hidrofor"
+                        )
+                    with col2:
+                        variatie_hidrofor = st.number_input(
+                            "Variație în interiorul orei (CV)", min_value=0.0, max_value=2.0,
+                            value=0.5, step=0.1, key="variatie_hidrofor"
+                        )
+                    
+                    if st.button("⏱️ Simulează stația"):
+                        cerere_hidrofor = np.minimum(
+                            profil_consum(destinatie_aleasa, consum_zilnic_hidrofor, 1, pas_min=0.5,
+                                          variatie=variatie_hidrofor, seed=0) / 3.6,
+                            debit_hidrofor,
+                        )
+                        df_matrice = pd.DataFrame(matrice_hidrofor(
+                            cerere_hidrofor, 30.0, debit_hidrofor, presiune_necesara
+                        ))
+                        # Cel mai mic volum admis pentru fiecare configurație de pompe
+                        minime = df_matrice[df_matrice["Admis"]].groupby("Pompe")["Volum (L)"].idxmin()
+                        st.dataframe(
+                            df_matrice.style
+                            .format({"Sub presiune (s)": "{:.0f}", "Presiune min (mCA)": "{:.1f}"})
+                            .apply(lambda rand: ["background-color: #d4edda" if rand.name in minime.values else ""] * len(rand), axis=1),
+                            use_container_width=True,
+                            height=400,
+                        )
+                        if len(minime):
+                            st.success("✅ Volum minim admis: " + ", ".join(
+                                f"{p}x pompe → {df_matrice.loc[i, 'Volum (L)']} L" for p, i in minime.items()
+                            ))
+                        else:
+                            st.error(f"❌ Nicio combinație nu respectă {PORNIRI_ORA_ADMISE} porniri/oră și banda de presiune.")
+                
+                # Punctul de funcționare al fiecărei pompe din catalog pe curba rețelei
+                with st.expander("🔧 Selecție pompă din catalog (curba rețelei)"):
+                    fisier_pompe = st.file_uploader(
+                        "Catalog pompe furnizor (model, q_max_m3h, h0, h1, h2, eta0, eta1, eta2)",
+                        type=["csv", "json"], key="catalog_pompe"
+                    )
+                    if fisier_pompe is not None and st.button("📥 Încarcă pompele"):
+                        try:
+                            modele = inregistreaza_catalog_pompe(citeste_catalog_pompe(
+                                fisier_pompe.getvalue().decode("utf-8"),
+                                "json" if fisier_pompe.name.lower().endswith(".json") else "csv",
+                            ))
+                            st.success(f"✅ {len(modele)} pompe încărcate")
+                        except (UnicodeDecodeError, ValueError) as exc:
+                            st.error(f"❌ Catalog invalid: {exc}")
+                    
+                    ultima = st.session_state.rezultate_calcul["df_arm"].iloc[-1]
+                    pierderi = float(ultima["Σ i*L"] + ultima["Σ h_loc"]) / 1000
+                    h_static = presiune_necesara - pierderi
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        volum_anual = st.number_input(
+                            "Volum pompat anual (m³/an)", min_value=1.0, max_value=1e7,
+                            value=max(1.0, round(debit_hidrofor * 3.6 * 8 * 365, 0)), key="volum_anual_pompe"
+                        )
+                    with col2:
+                        criteriu_pompe = st.radio("Ordonare după", ["energie", "randament"], horizontal=True)
+                    st.caption(f"Rețea: H = {h_static:.2f} + {curba_retea(debit_hidrofor, pierderi, h_static)['k']:.4f}·Q² "
+                               f"(Q în m³/h) | {len(catalog_pompe())} pompe în catalog, {numar_pompe} în paralel")
+                    
+                    selectie = selecteaza_pompe(debit_hidrofor, pierderi, h_static, numar_pompe,
+                                                volum_anual, criteriu=criteriu_pompe)
+                    if selectie:
+                        df_pompe = pd.DataFrame(selectie, columns=COLOANE_SELECTIE_POMPE)
+                        st.dataframe(df_pompe.style.format({
+                            "Q (m³/h)": "{:.2f}", "H (mCA)": "{:.1f}", "η (%)": "{:.1f}",
+                            "P (kW)": "{:.2f}", "Energie (kWh/an)": "{:.0f}", "Q/Qc": "{:.2f}",
+                        }), use_container_width=True)
+                        
+                        pompe = catalog_pompe()
+                        q_grafic = np.linspace(0, max(df_pompe["Q (m³/h)"].max(), debit_hidrofor * 3.6) * 1.3, 100)
+                        fig_pompe = go.Figure(go.Scatter(
+                            x=q_grafic, y=h_static + pierderi * (q_grafic / (debit_hidrofor * 3.6))**2,
+                            mode="lines", name="Rețea", line=dict(color="black", width=3)
+                        ))
+                        for rand in selectie[:5]:
+                            i = pompe.modele.index(rand["Model"])
+                            q_pompa = q_grafic[q_grafic / numar_pompe <= pompe.q_max[i]]
+                            fig_pompe.add_trace(go.Scatter(
+                                x=q_pompa, y=np.polyval(pompe.h[i][::-1], q_pompa / numar_pompe),
+                                mode="lines", name=rand["Model"]
+                            ))
+                        fig_pompe.add_trace(go.Scatter(
+                            x=df_pompe["Q (m³/h)"][:5], y=df_pompe["H (mCA)"][:5], mode="markers",
+                            marker=dict(size=10, symbol="x"), name="Puncte de funcționare"
+                        ))
+                        fig_pompe.update_layout(xaxis_title="Q (m³/h)", yaxis_title="H (mCA)", height=450)
+                        st.plotly_chart(fig_pompe, use_container_width=True)
+                    else:
+                        st.error("❌ Nicio pompă din catalog nu intersectează curba rețelei.")
+    
+        marcaj("Hidrofor")
+        
+        # --- Sub-tab Comparație variante ---
+        with sub_tabs[4]:
+            st.subheader("🔀 Studiu parametric: material × temperatură × destinație")
+            
+            if not st.session_state.tronsoane_arm:
+                st.warning("⚠️ Vă rugăm să definiți întâi tronsoanele în tab-ul 'Consumatori & Trasee'!")
+            else:
+                col1, col2 = st.columns(2)
+                with col1:
+                    materiale_studiu = st.multiselect(
+                        "Materiale", options=catalog().materiale, default=list(catalog().materiale)
+                    )
+                    destinatii_studiu = st.multiselect(
+                        "Destinații", options=catalog().destinatii, default=list(catalog().destinatii)
+                    )
+                with col2:
+                    t_min, t_max = st.slider("Interval temperaturi (°C)", 5, 70, (10, 60))
+                    pas_temperatura = st.number_input("Pas temperatură (°C)", min_value=1, max_value=30, value=10)
+                
+                if st.button("▶️ Rulează studiul"):
+                    st.session_state.studiu_parametric = studiu_parametric(
+                        st.session_state.tronsoane_arm,
+                        materiale=materiale_studiu,
+                        temperaturi=list(range(t_min, t_max + 1, int(pas_temperatura))),
+                        destinatii=destinatii_studiu,
+                        model_frecare=model_frecare,
+                    )
+                
+                variante = st.session_state.get('studiu_parametric')
+                if variante:
+                    df_variante = pd.DataFrame(variante, columns=COLOANE_VARIANTE)
+                    st.write(f"**{len(df_variante)} variante**, dintre care {int(df_variante['Pareto'].sum())} pe frontul Pareto")
+                    st.dataframe(
+                        df_variante.style.format({
+                            "Temperatura": "{:.0f}", "Vc": "{:.3f}", "v": "{:.2f}",
+                            "h_tot": "{:.2f}", "Cost": "{:.0f}",
+                        }),
+                        use_container_width=True,
+                        height=400,
+                    )
+                    
+                    fig_pareto = go.Figure()
+                    for material, grup in df_variante.groupby("Material"):
+                        fig_pareto.add_trace(go.Scatter(
+                            x=grup["Cost"], y=grup["h_tot"], mode="markers", name=material,
+                            marker=dict(symbol=["star" if p else "circle" for p in grup["Pareto"]],
+                                        size=[12 if p else 7 for p in grup["Pareto"]]),
+                            text=grup["Destinație"] + ", " + grup["Temperatura"].map("{:.0f} °C".format),
+                        ))
+                    fig_pareto.update_layout(
+                        title="Sarcină necesară vs. cost conducte (★ = front Pareto)",
+                        xaxis_title="Cost conducte (lei)",
+                        yaxis_title="h_tot (mCA)",
+                        height=500,
+                    )
+                    st.plotly_chart(fig_pareto, use_container_width=True)
+    
+    marcaj("Comparație variante")
     
     # =============== TAB APE PLUVIALE ===============
     with tab_principal[1]:
@@ -1385,6 +1149,8 @@ def main():
             volum_bazin = debit_pluvial * timp_retentie * 60
             st.info(f"🏊 Volum bazin retenție: **{volum_bazin:.0f} L**")
     
+    marcaj("Ape pluviale")
+    
     # =============== TAB CANALIZARE MENAJERĂ ===============
     with tab_principal[2]:
         st.info("🚽 **Calculator pentru canalizare menajeră** (în dezvoltare)")
@@ -1395,6 +1161,8 @@ def main():
         st.write("• Dimensionare colectoare orizontale")
         st.write("• Cămine și separatoare")
     
+    marcaj("Canalizare menajeră")
+    
     # =============== TAB RAPOARTE ===============
     with tab_principal[3]:
         st.info("📊 **Generator de rapoarte tehnice**")
@@ -1410,17 +1178,17 @@ def main():
             }
             
             if st.button("📄 Generează Raport PDF"):
-                pdf_buffer = create_pdf_report(data_raport)
-                st.success("✅ Raport generat cu succes!")
-                st.download_button(
-                    label="⬇️ Descarcă Raport PDF",
-                    data=pdf_buffer,
-                    file_name="Memoriu_Tehnic_Sanitare.pdf",
-                    mime="application/pdf"
-                )
+                st.session_state.raport_pdf = (cheie_raport(data_raport), raport_pdf_async(data_raport))
+            
+            # Raportul cerut pentru datele curente (se ignoră unul mai vechi, pentru alte date)
+            raport = st.session_state.get('raport_pdf')
+            if raport and raport[0] == cheie_raport(data_raport):
+                afiseaza_raport_pdf(raport[1])
         else:
             st.warning("⚠️ Nu există date calculate pentru a genera raportul. Vă rugăm să efectuați calculele în tab-ul 'Consumatori & Trasee'.")
     
+    marcaj("Rapoarte")
+    
     # =============== TAB DOCUMENTAȚIE ===============
     with tab_principal[4]:
         st.info("📚 **Documentație și standarde**")
@@ -1459,6 +1227,7 @@ def main():
         - Pierdere distribuită: Colebrook-White
         - Debit probabilistic: SR 1343-1:2006
         """)
+    marcaj("Documentație")
 
 # ======================== FOOTER ========================
 def footer():
@@ -1472,5 +1241,10 @@ def footer():
 
 # ======================== RULARE APLICAȚIE ========================
 if __name__ == "__main__":
-    main()
-    footer()
\ No newline at end of file
+    with ProfilRerun(cprofile=st.session_state.get('profil_cprofile', False)) as profil:
+        init_session_state()
+        marcaj("Inițializare sesiune")
+        main()
+        footer()
+        marcaj("Footer")
+    afiseaza_profil(profil)
\ No newline at end of file
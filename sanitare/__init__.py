@@ -0,0 +1,65 @@
+"""
+Motor de calcul pentru instalații sanitare (I9-2022, SR 1343-1:2006)
+
+Pachetul poate fi importat fără Streamlit, plotly, reportlab sau pandas:
+interfața (calculator-sanitare.py), procesele batch și workerii folosesc
+aceleași funcții. Modulele cu dependențe grele se importă explicit, doar
+acolo unde este nevoie: `sanitare.raport` (PDF, reportlab) și
+`sanitare.retea` (rețele inelare, scipy).
+"""
+
+from .date import (
+    G,
+    TEMPERATURA_ACM_IMPLICITA,
+    DESTINATII_CLADIRE,
+    COEFICIENTI_PIERDERI_LOCALE,
+    CORELARE_DN_DIAMETRE,
+    TIP_NOTATIE_MATERIAL,
+    NOTATII_MATERIALE,
+    MATERIALE_CONDUCTE,
+    PRETURI_CONDUCTE,
+    CONSUMATORI,
+)
+from .frecare import (
+    MODELE_FRECARE,
+    MODEL_FRECARE_IMPLICIT,
+    viscozitate_cinematica_apa,
+    factor_frecare,
+)
+from .catalog import (
+    catalog,
+    diametre_material,
+    notatie_dn,
+    invalideaza_catalog,
+    statistici_cache,
+    citeste_catalog_furnizor,
+    inregistreaza_catalog_furnizor,
+    incarca_catalog_furnizor,
+)
+from .hidraulica import (
+    calcul_debit_cu_destinatie,
+    calcul_factor_f,
+    viscozitate_cinematica,
+    calculeaza_reynolds,
+    calculeaza_lambda_haaland,
+    dimensioneaza_tronson,
+    calcul_debit_probabilistic,
+    calcul_diametru_minim,
+    reynolds,
+    factor_frecare_colebrook,
+    pierdere_presiune_distribuita,
+    pierdere_presiune_locala,
+    calcul_pierderi_locale_tronson,
+    selectare_diametru_material,
+    get_diametru_specific,
+)
+from .echipamente import (
+    calcul_bransament,
+    calcul_vas_tampon,
+    calcul_hidrofor,
+    calcul_reducator_presiune,
+)
+from .vectorizat import dimensioneaza_tronsoane
+from .tronsoane import CalculIncrementalTronsoane, calcul_tronsoane, tronsoane_acm
+
+__version__ = "6.1"
@@ -0,0 +1,32 @@
+"""Linia de comandă: python -m sanitare <comandă> ..."""
+
+import argparse
+import sys
+
+from .lot import comanda_lot
+from .server import FEREASTRA_MS, LOT_MAXIM, PORT_IMPLICIT, comanda_server
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sanitare", description="Calculator instalații sanitare")
+    subcomenzi = parser.add_subparsers(dest="comanda", required=True)
+
+    lot = subcomenzi.add_parser("lot", help="dimensionează în paralel toate proiectele JSON dintr-un director")
+    lot.add_argument("director", help="directorul cu proiecte *.json")
+    lot.add_argument("-o", "--iesire", help="directorul pentru rezultate (implicit directorul de intrare)")
+    lot.add_argument("-p", "--procese", type=int, default=None, help="număr de procese (implicit: toate nucleele)")
+    lot.set_defaults(functie=comanda_lot)
+
+    server = subcomenzi.add_parser("server", help="serviciu HTTP local (JSON) pentru motorul de calcul")
+    server.add_argument("--gazda", default="127.0.0.1", help="adresa de ascultare (implicit 127.0.0.1)")
+    server.add_argument("--port", type=int, default=PORT_IMPLICIT, help=f"portul (implicit {PORT_IMPLICIT})")
+    server.add_argument("-p", "--procese", type=int, default=None, help="număr de procese (implicit: toate nucleele)")
+    server.add_argument("--lot-maxim", type=int, default=LOT_MAXIM, help=f"cereri pe lot (implicit {LOT_MAXIM})")
+    server.add_argument("--fereastra-ms", type=float, default=FEREASTRA_MS,
+                        help=f"fereastra de grupare a cererilor în loturi (implicit {FEREASTRA_MS} ms)")
+    server.set_defaults(functie=comanda_server)
+
+    argumente = parser.parse_args(argv)
+    return argumente.functie(argumente)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Cache-ul cataloagelor compilate (destinații, materiale, fitinguri, consumatori)
+
+Dicționarele din sanitare.date sunt compilate o singură dată pe proces în
+tuple și vectori sortați plus indexuri nume -> poziție, comune tuturor
+sesiunilor și tuturor apelurilor de dimensionare. Dacă un catalog se
+modifică (ex. se încarcă un catalog de furnizor), cache-ul se golește
+explicit cu invalideaza_catalog(); următorul acces îl recompilează.
+
+Cataloagele de furnizor (CSV sau JSON, un rând pe produs) se încarcă cu
+incarca_catalog_furnizor. Coloanele recunoscute:
+
+    material, dn, d_int_mm, rugozitate_mm, v_max     (obligatorii)
+    notatie, sdr, pret_lei_m                          (opționale)
+
+Fiecare material din fișier înlocuiește complet intrarea cu același nume din
+MATERIALE_CONDUCTE (diametre, notații, SDR, prețuri).
+"""
+
+import csv
+import io
+import json
+import math
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .date import (
+    COEFICIENTI_PIERDERI_LOCALE,
+    CONSUMATORI,
+    CORELARE_DN_DIAMETRE,
+    DESTINATII_CLADIRE,
+    MATERIALE_CONDUCTE,
+    NOTATII_MATERIALE,
+    PRETURI_CONDUCTE,
+    TIP_NOTATIE_MATERIAL,
+)
+
+COLOANE_OBLIGATORII = ("material", "dn", "d_int_mm", "rugozitate_mm", "v_max")
+COLOANE_OPTIONALE = ("notatie", "sdr", "pret_lei_m")
+
+# ======================== STRUCTURI COMPILATE ========================
+
+class DiametreMaterial:
+    """Diametrele unui material, sortate după DN, cu selecție prin căutare binară"""
+
+    def __init__(self, info_material: dict, notatii: Optional[Dict] = None, preturi: Optional[Dict] = None):
+        elemente = sorted(info_material["diametre_mm"].items())
+        self.info = info_material
+        self.rugozitate_mm = info_material["rugozitate_mm"]
+        self.v_max = info_material["v_max"]
+        self.dn = tuple(dn for dn, _ in elemente)
+        self.d_int = tuple(float(d) for _, d in elemente)
+        # Maximul cumulat al d_int este monoton, deci primul element >= d_min
+        # găsit prin bisect este primul DN (crescător) cu d_int >= d_min
+        self.d_int_cumulat = tuple(np.maximum.accumulate(self.d_int).tolist()) if elemente else ()
+        self.dn_np = np.array(self.dn)
+        self.d_int_np = np.array(self.d_int)
+        self.d_int_cumulat_np = np.array(self.d_int_cumulat)
+        self.idx_dn_max = len(self.dn) - 1
+        self.index_dn = {dn: i for i, dn in enumerate(self.dn)}
+        self.notatii = dict(notatii or {})
+        sdr = info_material.get("sdr", {})
+        self.sdr = tuple(sdr.get(dn) for dn in self.dn)
+        preturi = preturi or {}
+        self.pret_np = np.array([preturi.get(dn, np.nan) for dn in self.dn], dtype=float)
+
+    def selecteaza(self, d_min: float) -> Tuple[int, float]:
+        """Primul DN cu d_int >= d_min; cel mai mare DN dacă niciunul nu ajunge"""
+        idx = bisect_left(self.d_int_cumulat, d_min)
+        if idx >= len(self.dn):
+            idx = self.idx_dn_max
+        return self.dn[idx], self.d_int[idx]
+
+class CatalogCompilat:
+    """Toate cataloagele, compilate în tuple, vectori și indexuri"""
+
+    def __init__(self):
+        self.destinatii = tuple(DESTINATII_CLADIRE)
+        self.index_destinatii = {nume: i for i, nume in enumerate(self.destinatii)}
+
+        self.materiale = tuple(MATERIALE_CONDUCTE)
+        self.index_materiale = {nume: i for i, nume in enumerate(self.materiale)}
+        self.diametre = {
+            nume: DiametreMaterial(info, _notatii_material(nume), PRETURI_CONDUCTE.get(nume))
+            for nume, info in MATERIALE_CONDUCTE.items()
+        }
+        self._diametre_dupa_info = {id(d.info): d for d in self.diametre.values()}
+
+        self.fitinguri = tuple(COEFICIENTI_PIERDERI_LOCALE)
+        self.zeta_fitinguri = np.array([COEFICIENTI_PIERDERI_LOCALE[f] for f in self.fitinguri])
+
+        self.consumatori = tuple(CONSUMATORI)
+        self.index_consumatori = {nume: i for i, nume in enumerate(self.consumatori)}
+        self.debite_consumatori = np.array([CONSUMATORI[c]["debit"] for c in self.consumatori])
+        self.unitati_consumatori = np.array([CONSUMATORI[c]["unitate"] for c in self.consumatori])
+        self.categorii_consumatori: Dict[str, Tuple[str, ...]] = {}
+        for nume in self.consumatori:
+            categorie = CONSUMATORI[nume].get("categorie", "")
+            self.categorii_consumatori[categorie] = self.categorii_consumatori.get(categorie, ()) + (nume,)
+
+    def diametre_pentru(self, info_material: dict) -> Optional[DiametreMaterial]:
+        """Diametrele compilate ale unei intrări din MATERIALE_CONDUCTE (după identitate)"""
+        diametre = self._diametre_dupa_info.get(id(info_material))
+        return diametre if diametre is not None and diametre.info is info_material else None
+
+def _notatii_material(material: str) -> Dict:
+    notatii = dict(CORELARE_DN_DIAMETRE.get(TIP_NOTATIE_MATERIAL.get(material), {}))
+    notatii.update(NOTATII_MATERIALE.get(material, {}))
+    return notatii
+
+# ======================== CACHE ========================
+
+_lock = threading.Lock()
+_catalog: Optional[CatalogCompilat] = None
+_statistici = {"accesari": 0, "ratari": 0, "compilari": 0, "invalidari": 0}
+
+def catalog() -> CatalogCompilat:
+    """Catalogul compilat, comun procesului (compilat la primul acces după invalidare)"""
+    global _catalog
+    with _lock:
+        if _catalog is not None:
+            _statistici["accesari"] += 1
+            return _catalog
+        _statistici["ratari"] += 1
+        _statistici["compilari"] += 1
+        _catalog = CatalogCompilat()
+        return _catalog
+
+def diametre_material(info_material: dict) -> DiametreMaterial:
+    """
+    Diametrele sortate ale unui material
+
+    Intrările din MATERIALE_CONDUCTE vin din cache; un dicționar din afara
+    catalogului (ex. un material definit ad-hoc) se compilează la fiecare apel
+    și se numără ca ratare.
+    """
+    diametre = catalog().diametre_pentru(info_material)
+    if diametre is not None:
+        return diametre
+    with _lock:
+        _statistici["ratari"] += 1
+    return DiametreMaterial(info_material)
+
+def notatie_dn(material: str, dn) -> Optional[str]:
+    """Notația comercială (ex. "d25", "3/4\"") a unui DN; None dacă nu e în catalog"""
+    diametre = catalog().diametre.get(material)
+    return diametre.notatii.get(dn) if diametre is not None else None
+
+def invalideaza_catalog():
+    """Golește cache-ul după modificarea oricărui catalog din sanitare.date"""
+    global _catalog
+    with _lock:
+        _catalog = None
+        _statistici["invalidari"] += 1
+
+def statistici_cache() -> Dict[str, float]:
+    """Accesări reușite, ratări, compilări, invalidări și rata de reușită"""
+    with _lock:
+        statistici = dict(_statistici)
+    total = statistici["accesari"] + statistici["ratari"]
+    statistici["rata_reusita"] = statistici["accesari"] / total if total else 0.0
+    return statistici
+
+# ======================== CATALOAGE FURNIZORI ========================
+
+def citeste_numar(valoare, camp: str, rand: int) -> Optional[float]:
+    """
+    Valoarea numerică a unei celule de catalog (CSV sau JSON); None pentru celulele goale
+
+    Acceptă virgula zecimală; valorile nenumerice sau infinite dau ValueError
+    cu rândul și câmpul.
+    """
+    if valoare is None or (isinstance(valoare, str) and not valoare.strip()):
+        return None
+    try:
+        numar = float(str(valoare).replace(",", ".")) if isinstance(valoare, str) else float(valoare)
+    except ValueError:
+        raise ValueError(f"Rândul {rand}: valoare nenumerică pentru '{camp}': {valoare!r}") from None
+    if not math.isfinite(numar):
+        raise ValueError(f"Rândul {rand}: valoare invalidă pentru '{camp}': {valoare!r}")
+    return numar
+
+def citeste_catalog_furnizor(continut: str, format: str = "csv") -> List[Dict]:
+    """
+    Citește produsele unui catalog de furnizor (text CSV sau JSON)
+
+    CSV-ul poate fi separat prin virgulă sau punct și virgulă; JSON-ul este o
+    listă de produse sau un obiect cu cheia "produse".
+
+    Returns:
+        Lista produselor, cu valorile numerice convertite
+    """
+    if format == "json":
+        date = json.loads(continut)
+        randuri = date.get("produse", []) if isinstance(date, dict) else date
+    elif format == "csv":
+        prima_linie = continut.lstrip("\ufeff").split("\n", 1)[0]
+        separator = ";" if prima_linie.count(";") > prima_linie.count(",") else ","
+        randuri = list(csv.DictReader(io.StringIO(continut.lstrip("\ufeff")), delimiter=separator))
+    else:
+        raise ValueError(f"Format de catalog necunoscut: {format}")
+
+    produse = []
+    for i, rand in enumerate(randuri, start=1):
+        rand = {str(cheie).strip().lower(): valoare for cheie, valoare in rand.items() if cheie is not None}
+        lipsa = [camp for camp in COLOANE_OBLIGATORII if rand.get(camp) in (None, "")]
+        if lipsa:
+            raise ValueError(f"Rândul {i}: lipsesc câmpurile {lipsa}")
+        dn = citeste_numar(rand["dn"], "dn", i)
+        d_int = citeste_numar(rand["d_int_mm"], "d_int_mm", i)
+        if dn <= 0 or d_int <= 0:
+            raise ValueError(f"Rândul {i}: DN și d_int trebuie să fie pozitive")
+        notatie = rand.get("notatie")
+        produse.append({
+            "material": str(rand["material"]).strip(),
+            "dn": int(dn) if dn.is_integer() else dn,
+            "d_int_mm": d_int,
+            "rugozitate_mm": citeste_numar(rand["rugozitate_mm"], "rugozitate_mm", i),
+            "v_max": citeste_numar(rand["v_max"], "v_max", i),
+            "notatie": str(notatie).strip() if notatie not in (None, "") else None,
+            "sdr": citeste_numar(rand.get("sdr"), "sdr", i),
+            "pret_lei_m": citeste_numar(rand.get("pret_lei_m"), "pret_lei_m", i),
+        })
+    return produse
+
+def inregistreaza_catalog_furnizor(produse: List[Dict], info: str = "Catalog furnizor") -> List[str]:
+    """
+    Adaugă produsele în cataloagele din sanitare.date și invalidează cache-ul
+
+    Args:
+        produse: rezultatul citeste_catalog_furnizor
+        info: descrierea afișată pentru materialele încărcate
+
+    Returns:
+        Materialele încărcate, în ordinea din fișier
+    """
+    pe_material: Dict[str, List[Dict]] = {}
+    for produs in produse:
+        pe_material.setdefault(produs["material"], []).append(produs)
+
+    intrari = {}
+    for material, randuri in pe_material.items():
+        dn_vazute = set()
+        for produs in randuri:
+            if produs["dn"] in dn_vazute:
+                raise ValueError(f"DN {produs['dn']} apare de mai multe ori pentru {material}")
+            dn_vazute.add(produs["dn"])
+        for camp in ("rugozitate_mm", "v_max"):
+            valori = {produs[camp] for produs in randuri}
+            if len(valori) > 1:
+                raise ValueError(f"{material}: '{camp}' trebuie să fie același pentru toate produsele")
+        intrari[material] = {
+            "rugozitate_mm": randuri[0]["rugozitate_mm"],
+            "diametre_mm": {p["dn"]: p["d_int_mm"] for p in randuri},
+            "v_max": randuri[0]["v_max"],
+            "sdr": {p["dn"]: p["sdr"] for p in randuri if p["sdr"] is not None},
+            "info": info,
+            "_notatii": {p["dn"]: p["notatie"] for p in randuri if p["notatie"]},
+            "_preturi": {p["dn"]: p["pret_lei_m"] for p in randuri if p["pret_lei_m"] is not None},
+        }
+
+    # Totul a fost validat; abia acum se modifică cataloagele comune
+    with _lock:
+        for material, intrare in intrari.items():
+            notatii = intrare.pop("_notatii")
+            preturi = intrare.pop("_preturi")
+            MATERIALE_CONDUCTE[material] = intrare
+            NOTATII_MATERIALE[material] = notatii
+            if preturi:
+                PRETURI_CONDUCTE[material] = preturi
+            else:
+                PRETURI_CONDUCTE.pop(material, None)
+    invalideaza_catalog()
+    return list(intrari)
+
+def incarca_catalog_furnizor(cale, info: Optional[str] = None) -> List[str]:
+    """Încarcă un fișier de catalog (.csv sau .json); întoarce materialele încărcate"""
+    cale = Path(cale)
+    format = "json" if cale.suffix.lower() == ".json" else "csv"
+    produse = citeste_catalog_furnizor(cale.read_text(encoding="utf-8"), format)
+    return inregistreaza_catalog_furnizor(produse, info or f"Catalog furnizor ({cale.name})")
@@ -0,0 +1,373 @@
+"""Baze de date: destinații, pierderi locale, materiale și consumatori."""
+
+# ======================== CONSTANTE ========================
+G = 9.81  # gravitație m/s²
+TEMPERATURA_ACM_IMPLICITA = 55.0  # °C, apa caldă de consum la punctele de utilizare
+
+# ======================== DESTINAȚII CLĂDIRI ========================
+DESTINATII_CLADIRE = {
+    "Clădiri de locuit": {
+        "k_canalizare": 0.5,
+        "coef_a_arm": 0.45,
+        "coef_b_acm": 0.45,
+        "metoda": "B",
+        "v_min": 0.20,
+    },
+    "Clădiri administrative/birouri": {
+        "k_canalizare": 0.5,
+        "coef_a_arm": 0.55,
+        "coef_b_acm": 0.25,
+        "metoda": "C",
+        "E_min": 1.5,
+    },
+    "Instituții învățământ/școli": {
+        "k_canalizare": 0.7,
+        "coef_a_arm": 0.60,
+        "coef_b_acm": 0.27,
+        "metoda": "C",
+        "E_min": 1.8,
+    },
+    "Spitale/sanatorii": {
+        "k_canalizare": 0.7,
+        "coef_a_arm": 0.67,
+        "coef_b_acm": 0.30,
+        "metoda": "C",
+        "E_min": 2.2,
+    },
+    "Hoteluri cu grup sanitar în cameră": {
+        "k_canalizare": 0.7,
+        "coef_a_arm": 0.60,
+        "coef_b_acm": 0.27,
+        "metoda": "C",
+        "E_min": 1.8,
+    },
+    "Hoteluri cu grup sanitar comun": {
+        "k_canalizare": 1.0,
+        "coef_a_arm": 0.85,
+        "coef_b_acm": 0.38,
+        "metoda": "C",
+        "E_min": 3.6,
+    },
+}
+
+# ======================== COEFICIENȚI PIERDERI LOCALE ========================
+COEFICIENTI_PIERDERI_LOCALE = {
+    # Armături
+    "Robinet cu sertar DN15-50": 0.5,
+    "Robinet cu sertar DN65-100": 0.3,
+    "Robinet cu sferă (bilă) - deschis total": 0.1,
+    "Robinet colțar": 8.0,
+    "Clapetă de sens": 2.5,
+    "Clapetă de sens cu arc": 3.0,
+    "Filtru Y": 2.0,
+    "Contor apă DN15-20": 10.0,
+    "Contor apă DN25-40": 7.0,
+    "Contor apă DN50-100": 5.0,
+    
+    # Fitinguri - Coturi
+    "Cot 90° cu rază mică (r/d=1)": 1.5,
+    "Cot 90° cu rază normală (r/d=1.5)": 0.9,
+    "Cot 90° cu rază mare (r/d=2)": 0.7,
+    "Cot 45°": 0.4,
+    "Cot 30°": 0.25,
+    
+    # Fitinguri - Tee-uri
+    "Tee - trecere directă": 0.3,
+    "Tee - derivație 90° (ramificație)": 1.8,
+    "Tee - confluență": 1.5,
+    
+    # Reducții
+    "Reducție graduală (unghi < 20°)": 0.15,
+    "Reducție bruscă 2:1": 0.5,
+    "Reducție bruscă 3:2": 0.3,
+    "Lărgire graduală": 0.3,
+    "Lărgire bruscă 1:2": 1.0,
+    
+    # Intrări/Ieșiri
+    "Intrare în conductă (muchie ascuțită)": 0.5,
+    "Intrare în conductă (racordată)": 0.25,
+    "Ieșire din conductă": 1.0,
+    "Ieșire în rezervor": 1.0,
+}
+
+# ======================== CORELAȚIE DN - DIAMETRE SPECIFICE ========================
+CORELARE_DN_DIAMETRE = {
+    "Oțel": {
+        15: "1/2\"",
+        20: "3/4\"", 
+        25: "1\"",
+        32: "1 1/4\"",
+        40: "1 1/2\"",
+        50: "2\"",
+        65: "2 1/2\"",
+        80: "3\"",
+        100: "4\"",
+        125: "5\"",
+        150: "6\""
+    },
+    "PPR": {
+        10: "d16",
+        15: "d20",
+        20: "d25",
+        25: "d32",
+        32: "d40",
+        40: "d50",
+        50: "d63",
+        65: "d75",
+        80: "d90",
+        100: "d110",
+        125: "d125",
+        150: "d160"
+    },
+    "PEX/Multistrat": {
+        10: "16x2",
+        12: "16x2",
+        15: "20x2",
+        20: "25x2.5",
+        25: "32x3",
+        32: "40x3.5",
+        40: "50x4",
+        50: "63x4.5"
+    },
+    "Cupru": {
+        10: "12x1",
+        12: "15x1",
+        15: "18x1",
+        20: "22x1",
+        25: "28x1.5",
+        32: "35x1.5",
+        40: "42x1.5",
+        50: "54x2",
+        65: "76x2",
+        80: "88.9x2",
+        100: "108x2.5"
+    },
+    "PE-HD": {
+        15: "d20",
+        20: "d25",
+        25: "d32",
+        32: "d40",
+        40: "d50",
+        50: "d63",
+        65: "d75",
+        80: "d90",
+        100: "d110",
+        125: "d125",
+        150: "d160",
+        200: "d200"
+    }
+}
+
+# ======================== BAZE DE DATE MATERIALE ========================
+MATERIALE_CONDUCTE = {
+    "PPR (Polipropilenă) PN20": {
+        "rugozitate_mm": 0.007,
+        "diametre_mm": {20: 13.2, 25: 16.6, 32: 21.2, 40: 26.6, 50: 33.2, 63: 42.0, 75: 50.0, 90: 60.0, 110: 73.2},
+        "v_max": 2.0,
+        "info": "SDR 6, Seria 2.5, pentru apă rece/caldă presiune ridicată"
+    },
+    "PPR (Polipropilenă) PN16": {
+        "rugozitate_mm": 0.007,
+        "diametre_mm": {20: 14.4, 25: 18.0, 32: 23.2, 40: 29.0, 50: 36.2, 63: 45.8, 75: 54.4, 90: 65.4, 110: 79.8},
+        "v_max": 2.0,
+        "info": "SDR 7.4, Seria 3.2, uzual pentru apă rece"
+    },
+    "PE-HD (Polietilenă) PE100 PN16": {
+        "rugozitate_mm": 0.007,
+        "diametre_mm": {20: 16.0, 25: 20.4, 32: 26.0, 40: 32.6, 50: 40.8, 63: 51.4, 75: 61.4, 90: 73.6, 110: 90.0},
+        "v_max": 2.0,
+        "info": "Branșamente și rețele exterioare, SDR 11"
+    },
+    "PEX (Polietilenă reticulată)": {
+        "rugozitate_mm": 0.007,
+        "diametre_mm": {16: 12.0, 20: 16.0, 25: 20.0, 32: 26.0, 40: 32.6, 50: 40.8, 63: 51.4},
+        "v_max": 2.0,
+        "info": "Încălzire și sanitare, flexibil"
+    },
+    "Cupru (Teavă trasă)": {
+        "rugozitate_mm": 0.0015,
+        "diametre_mm": {15: 13.0, 18: 16.0, 22: 20.0, 28: 26.0, 35: 33.0, 42: 40.0, 54: 52.0},
+        "v_max": 1.5,
+        "info": "Instalații aparente, calitate superioară"
+    },
+    "Oțel Zincat": {
+        "rugozitate_mm": 0.15,
+        "diametre_mm": {15: 16.0, 20: 21.6, 25: 27.2, 32: 35.9, 40: 41.8, 50: 53.0, 65: 68.8, 80: 80.8, 100: 105.3},
+        "v_max": 2.0,
+        "info": "Instalații industriale, PSI"
+    }
+}
+
+# ======================== NOTAȚII DIMENSIUNI ========================
+# Seria din CORELARE_DN_DIAMETRE folosită de fiecare material (cheie exactă)
+TIP_NOTATIE_MATERIAL = {
+    "PPR (Polipropilenă) PN20": "PPR",
+    "PPR (Polipropilenă) PN16": "PPR",
+    "PE-HD (Polietilenă) PE100 PN16": "PE-HD",
+    "PEX (Polietilenă reticulată)": "PEX/Multistrat",
+    "Cupru (Teavă trasă)": "Cupru",
+    "Oțel Zincat": "Oțel",
+}
+
+# Notațiile producătorului pe material și DN (completate la încărcarea
+# cataloagelor de furnizor; au prioritate față de CORELARE_DN_DIAMETRE)
+NOTATII_MATERIALE = {}
+
+# ======================== PREȚURI CONDUCTE ========================
+# Prețuri orientative (lei/m, fără TVA, fără montaj) pe DN; se actualizează
+# din oferta furnizorului înainte de optimizarea costurilor
+PRETURI_CONDUCTE = {
+    "PPR (Polipropilenă) PN20": {20: 4.5, 25: 7.0, 32: 11.0, 40: 17.0, 50: 27.0, 63: 42.0, 75: 60.0, 90: 85.0, 110: 125.0},
+    "PPR (Polipropilenă) PN16": {20: 3.8, 25: 6.0, 32: 9.5, 40: 14.5, 50: 23.0, 63: 36.0, 75: 51.0, 90: 72.0, 110: 106.0},
+    "PE-HD (Polietilenă) PE100 PN16": {20: 2.5, 25: 3.5, 32: 5.5, 40: 8.5, 50: 13.0, 63: 20.0, 75: 28.0, 90: 40.0, 110: 60.0},
+    "PEX (Polietilenă reticulată)": {16: 5.0, 20: 7.0, 25: 11.0, 32: 17.0, 40: 28.0, 50: 45.0, 63: 70.0},
+    "Cupru (Teavă trasă)": {15: 35.0, 18: 45.0, 22: 58.0, 28: 80.0, 35: 115.0, 42: 145.0, 54: 210.0},
+    "Oțel Zincat": {15: 22.0, 20: 28.0, 25: 40.0, 32: 52.0, 40: 60.0, 50: 80.0, 65: 110.0, 80: 135.0, 100: 190.0},
+}
+
+# ======================== PROBABILITĂȚI DE UTILIZARE ========================
+# Probabilitatea ca un consumator să fie deschis într-un moment oarecare din
+# perioada de vârf (valori orientative, de calibrat pe măsurători), folosite
+# de simularea Monte Carlo a simultaneității
+PROBABILITATI_UTILIZARE = {
+    "WC cu rezervor": 0.03,
+    "WC cu robinet flotor": 0.02,
+    "Pisoar cu robinet": 0.05,
+    "Lavoar": 0.04,
+    "Duș": 0.06,
+    "Cadă < 150L": 0.03,
+    "Cadă > 150L": 0.03,
+    "Spălător vase": 0.04,
+    "Mașină spălat vase": 0.02,
+    "Mașină spălat rufe": 0.02,
+    "Robinet serviciu 1/2\"": 0.01,
+    "Robinet serviciu 3/4\"": 0.01,
+    "Robinet grădină": 0.01,
+}
+
+# Multiplicatorul probabilităților pentru fiecare destinație (orientativ)
+FACTOR_UTILIZARE_DESTINATIE = {
+    "Clădiri de locuit": 1.0,
+    "Clădiri administrative/birouri": 0.8,
+    "Instituții învățământ/școli": 1.5,
+    "Spitale/sanatorii": 1.2,
+    "Hoteluri cu grup sanitar în cameră": 1.0,
+    "Hoteluri cu grup sanitar comun": 2.0,
+}
+
+# ======================== PROFILURI DE CONSUM ========================
+# Ponderea relativă a consumului în fiecare oră a zilei (0-23), pe destinații
+# (profiluri orientative; se normalizează la consumul zilnic la utilizare)
+PROFILURI_CONSUM_ORAR = {
+    "Clădiri de locuit": [
+        1.0, 0.6, 0.5, 0.5, 0.8, 2.5, 6.0, 8.0, 6.5, 4.5, 4.0, 4.0,
+        4.5, 4.0, 3.5, 3.5, 4.0, 5.5, 7.0, 7.5, 7.0, 5.5, 3.5, 2.0,
+    ],
+    "Clădiri administrative/birouri": [
+        0.2, 0.2, 0.2, 0.2, 0.2, 0.5, 2.0, 6.0, 10.0, 10.0, 9.0, 9.0,
+        11.0, 10.0, 9.0, 8.0, 6.0, 3.0, 1.0, 0.5, 0.3, 0.2, 0.2, 0.2,
+    ],
+    "Instituții învățământ/școli": [
+        0.1, 0.1, 0.1, 0.1, 0.1, 0.3, 1.5, 8.0, 12.0, 11.0, 13.0, 11.0,
+        12.0, 10.0, 8.0, 5.0, 3.0, 1.5, 0.8, 0.5, 0.2, 0.1, 0.1, 0.1,
+    ],
+    "Spitale/sanatorii": [
+        2.0, 1.5, 1.5, 1.5, 2.0, 3.5, 6.0, 7.0, 6.5, 6.0, 5.5, 5.5,
+        5.5, 5.0, 4.5, 4.5, 4.5, 5.0, 5.5, 5.0, 4.0, 3.5, 2.5, 2.0,
+    ],
+    "Hoteluri cu grup sanitar în cameră": [
+        1.5, 1.0, 0.8, 0.8, 1.0, 2.5, 6.5, 9.0, 8.5, 6.0, 4.0, 3.0,
+        3.0, 3.0, 2.5, 2.5, 3.0, 4.0, 5.5, 6.5, 7.0, 6.5, 5.0, 3.0,
+    ],
+    "Hoteluri cu grup sanitar comun": [
+        1.0, 0.5, 0.5, 0.5, 1.0, 3.0, 9.0, 12.0, 10.0, 5.0, 3.0, 2.5,
+        3.0, 2.5, 2.0, 2.0, 2.5, 3.5, 5.0, 6.5, 7.5, 7.0, 5.0, 2.5,
+    ],
+}
+
+# ======================== POMPE ========================
+# Gamă orientativă de pompe multietajate pentru hidrofor: curbele sunt
+# polinoame de gradul 2 în Q (m³/h), H = h0 + h1·Q + h2·Q² (mCA) și
+# η = eta0 + eta1·Q + eta2·Q²; se înlocuiesc cu catalogul furnizorului
+POMPE = {
+    "MV 3-30": {"q_max_m3h": 3, "h": (30, 0.0, -2.167), "eta": (0.0, 0.5333, -0.1481)},
+    "MV 3-45": {"q_max_m3h": 3, "h": (45, 0.0, -3.25), "eta": (0.0, 0.5333, -0.1481)},
+    "MV 3-60": {"q_max_m3h": 3, "h": (60, 0.0, -4.333), "eta": (0.0, 0.5333, -0.1481)},
+    "MV 3-80": {"q_max_m3h": 3, "h": (80, 0.0, -5.778), "eta": (0.0, 0.5333, -0.1481)},
+    "MV 5-30": {"q_max_m3h": 5, "h": (30, 0.0, -0.78), "eta": (0.0, 0.3667, -0.06111)},
+    "MV 5-45": {"q_max_m3h": 5, "h": (45, 0.0, -1.17), "eta": (0.0, 0.3667, -0.06111)},
+    "MV 5-60": {"q_max_m3h": 5, "h": (60, 0.0, -1.56), "eta": (0.0, 0.3667, -0.06111)},
+    "MV 5-80": {"q_max_m3h": 5, "h": (80, 0.0, -2.08), "eta": (0.0, 0.3667, -0.06111)},
+    "MV 8-30": {"q_max_m3h": 8, "h": (30, 0.0, -0.3047), "eta": (0.0, 0.25, -0.02604)},
+    "MV 8-45": {"q_max_m3h": 8, "h": (45, 0.0, -0.457), "eta": (0.0, 0.25, -0.02604)},
+    "MV 8-60": {"q_max_m3h": 8, "h": (60, 0.0, -0.6094), "eta": (0.0, 0.25, -0.02604)},
+    "MV 8-80": {"q_max_m3h": 8, "h": (80, 0.0, -0.8125), "eta": (0.0, 0.25, -0.02604)},
+    "MV 12-30": {"q_max_m3h": 12, "h": (30, 0.0, -0.1354), "eta": (0.0, 0.1778, -0.01235)},
+    "MV 12-45": {"q_max_m3h": 12, "h": (45, 0.0, -0.2031), "eta": (0.0, 0.1778, -0.01235)},
+    "MV 12-60": {"q_max_m3h": 12, "h": (60, 0.0, -0.2708), "eta": (0.0, 0.1778, -0.01235)},
+    "MV 12-80": {"q_max_m3h": 12, "h": (80, 0.0, -0.3611), "eta": (0.0, 0.1778, -0.01235)},
+    "MV 20-30": {"q_max_m3h": 20, "h": (30, 0.0, -0.04875), "eta": (0.0, 0.1133, -0.004722)},
+    "MV 20-45": {"q_max_m3h": 20, "h": (45, 0.0, -0.07312), "eta": (0.0, 0.1133, -0.004722)},
+    "MV 20-60": {"q_max_m3h": 20, "h": (60, 0.0, -0.0975), "eta": (0.0, 0.1133, -0.004722)},
+    "MV 20-80": {"q_max_m3h": 20, "h": (80, 0.0, -0.13), "eta": (0.0, 0.1133, -0.004722)},
+    "MV 32-30": {"q_max_m3h": 32, "h": (30, 0.0, -0.01904), "eta": (0.0, 0.07396, -0.001926)},
+    "MV 32-45": {"q_max_m3h": 32, "h": (45, 0.0, -0.02856), "eta": (0.0, 0.07396, -0.001926)},
+    "MV 32-60": {"q_max_m3h": 32, "h": (60, 0.0, -0.03809), "eta": (0.0, 0.07396, -0.001926)},
+    "MV 32-80": {"q_max_m3h": 32, "h": (80, 0.0, -0.05078), "eta": (0.0, 0.07396, -0.001926)},
+}
+
+# ======================== CONSUMATORI ========================
+CONSUMATORI = {
+    "WC cu rezervor": {
+        "debit": 0.10, "unitate": 1.0, "presiune_min": 8.0, "diametru_min": 10,
+        "acm": False, "categorie": "Baie"
+    },
+    "WC cu robinet flotor": {
+        "debit": 1.50, "unitate": 5.0, "presiune_min": 50.0, "diametru_min": 20,
+        "acm": False, "categorie": "Baie"
+    },
+    "Pisoar cu robinet": {
+        "debit": 0.30, "unitate": 2.0, "presiune_min": 15.0, "diametru_min": 12,
+        "acm": False, "categorie": "Baie"
+    },
+    "Lavoar": {
+        "debit": 0.10, "unitate": 1.0, "presiune_min": 10.0, "diametru_min": 10,
+        "acm": True, "categorie": "Baie"
+    },
+    "Duș": {
+        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
+        "acm": True, "categorie": "Baie"
+    },
+    "Cadă < 150L": {
+        "debit": 0.25, "unitate": 3.0, "presiune_min": 13.0, "diametru_min": 13,
+        "acm": True, "categorie": "Baie"
+    },
+    "Cadă > 150L": {
+        "debit": 0.33, "unitate": 4.0, "presiune_min": 13.0, "diametru_min": 13,
+        "acm": True, "categorie": "Baie"
+    },
+    "Spălător vase": {
+        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
+        "acm": True, "categorie": "Bucătărie"
+    },
+    "Mașină spălat vase": {
+        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
+        "acm": False, "categorie": "Bucătărie"
+    },
+    "Mașină spălat rufe": {
+        "debit": 0.20, "unitate": 2.0, "presiune_min": 12.0, "diametru_min": 12,
+        "acm": False, "categorie": "Utilitate"
+    },
+    "Robinet serviciu 1/2\"": {
+        "debit": 0.20, "unitate": 1.5, "presiune_min": 10.0, "diametru_min": 13,
+        "acm": False, "categorie": "Utilitate"
+    },
+    "Robinet serviciu 3/4\"": {
+        "debit": 0.40, "unitate": 2.5, "presiune_min": 10.0, "diametru_min": 19,
+        "acm": False, "categorie": "Utilitate"
+    },
+    "Robinet grădină": {
+        "debit": 0.70, "unitate": 3.5, "presiune_min": 15.0, "diametru_min": 19,
+        "acm": False, "categorie": "Exterior"
+    }
+}
@@ -0,0 +1,124 @@
+"""Dimensionarea echipamentelor: branșament, vas tampon, hidrofor, reducător."""
+
+import math
+from typing import Dict
+
+from .date import MATERIALE_CONDUCTE
+from .hidrofor import VOLUME_STANDARD_HIDROFOR
+from .vas_tampon import VOLUME_STANDARD_VAS_TAMPON
+from .hidraulica import (
+    calcul_diametru_minim,
+    selectare_diametru_material,
+    pierdere_presiune_distribuita,
+    get_diametru_specific,
+)
+
+# ======================== FUNCȚII ECHIPAMENTE NOI ========================
+
+def calcul_bransament(debit_total: float, lungime: float = 50, 
+                     diferenta_cota: float = 2.0) -> Dict:
+    """Dimensionează conducta de branșament"""
+    # Folosim PE-HD pentru branșament
+    material = "PE-HD (Polietilenă) PE100 PN16"
+    v_max = 2.5  # m/s pentru branșament
+    
+    # Diametru minim necesar
+    d_min = calcul_diametru_minim(debit_total, v_max)
+    dn, di = selectare_diametru_material(material, d_min)
+    
+    # Calcul pierderi
+    rugozitate = MATERIALE_CONDUCTE[material]["rugozitate_mm"]
+    pierdere_dist = pierdere_presiune_distribuita(debit_total, lungime, di, rugozitate)
+    pierdere_locala = diferenta_cota  # Pierdere geometrică
+    
+    return {
+        "material": material,
+        "dn": dn,
+        "diametru_interior": di,
+        "diametru_specific": get_diametru_specific(material, dn),
+        "lungime": lungime,
+        "debit": debit_total,
+        "viteza": 4 * debit_total / (math.pi * (di/1000)**2),
+        "pierdere_totala": pierdere_dist + pierdere_locala,
+        "presiune_necesara_bransament": max(20.0, pierdere_dist + pierdere_locala + 5.0)
+    }
+
+def calcul_vas_tampon(debit_orar_maxim: float, timp_rezerva_min: float = 30) -> Dict:
+    """Calculează volumul vasului tampon (rezervor de rupere)"""
+    # Volum necesar = debit orar maxim * timp rezervă
+    volum_necesar = debit_orar_maxim * 3600 * (timp_rezerva_min / 60)  # litri
+    
+    # Rotunjim la valori standard
+    volume_standard = list(VOLUME_STANDARD_VAS_TAMPON)
+    volum_ales = next((v for v in volume_standard if v >= volum_necesar), volume_standard[-1])
+    
+    return {
+        "volum_necesar": volum_necesar,
+        "volum_ales": volum_ales,
+        "timp_rezerva": timp_rezerva_min,
+        "debit_alimentare": debit_orar_maxim * 1.2,  # 20% marjă de siguranță
+        "diametru_alimentare": int(calcul_diametru_minim(debit_orar_maxim * 1.2 / 3600, 1.5)),
+        "diametru_plecare": int(calcul_diametru_minim(debit_orar_maxim / 3600, 2.0)),
+        "diametru_golire": max(50, int(volum_ales / 100))  # DN minim 50mm
+    }
+
+def calcul_hidrofor(debit: float, presiune_necesara: float, 
+                   numar_pompe: int = 2) -> Dict:
+    """Dimensionează stația de hidrofor"""
+    # Presiuni de lucru
+    presiune_pornire = presiune_necesara
+    presiune_oprire = presiune_pornire + 20  # +2 bar
+    presiune_medie = (presiune_pornire + presiune_oprire) / 2
+    
+    # Volum rezervor hidrofor (formula Aquamax)
+    porniri_pe_ora = 15  # maxim recomandat
+    volum_rezervor_m3 = (debit * 3600 * 0.25) / porniri_pe_ora
+    volum_rezervor_litri = volum_rezervor_m3 * 1000  # Conversie în litri
+    
+    # Rotunjire la valori standard
+    volume_standard = list(VOLUME_STANDARD_HIDROFOR)
+    volum_ales = next((v for v in volume_standard if v >= volum_rezervor_litri), volume_standard[-1])
+    
+    # Caracteristici pompă
+    debit_pompa = debit / numar_pompe if numar_pompe > 1 else debit * 1.1
+    inaltime_pompare = presiune_oprire
+    
+    # Putere hidraulică (kW) = (Q * H * rho * g) / (eta * 1000)
+    # rho = 1000 kg/m3, g = 9.81
+    # eta (randament) estimat la 0.65
+    putere_hidraulica = (debit_pompa * inaltime_pompare * 9.81) / (0.65 * 1000)
+    putere_motor_estimata = putere_hidraulica * 1.2  # +20% rezervă
+    
+    return {
+        "numar_pompe": numar_pompe,
+        "debit_pompa": debit_pompa * 3600,  # m³/h
+        "inaltime_pompare": inaltime_pompare,
+        "presiune_pornire": presiune_pornire,
+        "presiune_oprire": presiune_oprire,
+        "volum_rezervor": volum_ales,
+        "porniri_ora_max": porniri_pe_ora,
+        "putere_estimata": putere_motor_estimata,
+        "configuratie": f"{numar_pompe}x pompe active" if numar_pompe > 1 else "1 pompă activă"
+    }
+
+def calcul_reducator_presiune(presiune_intrare: float, presiune_iesire: float,
+                             debit: float) -> Dict:
+    """Selectează reducător de presiune"""
+    # Calculăm DN bazat pe debit
+    viteza_recomandata = 2.0  # m/s prin reducător
+    dn_necesar = calcul_diametru_minim(debit, viteza_recomandata)
+    
+    # Selectăm DN standard
+    dn_standard = [15, 20, 25, 32, 40, 50, 65, 80, 100]
+    dn_ales = next((d for d in dn_standard if d >= dn_necesar), dn_standard[-1])
+    
+    return {
+        "dn": dn_ales,
+        "presiune_intrare_max": presiune_intrare,
+        "presiune_reglata": presiune_iesire,
+        "debit_nominal": debit * 3600,  # m³/h
+        "raport_reducere": presiune_intrare / presiune_iesire,
+        "tip_recomandat": "Cu pistoane" if dn_ales <= 50 else "Cu membrană",
+        "manometru_intrare": "0-10 bar" if presiune_intrare <= 60 else "0-16 bar",
+        "manometru_iesire": "0-6 bar"
+    }
@@ -0,0 +1,88 @@
+"""
+Eșantionarea seriilor lungi pentru grafice (pe server, înainte de plotly)
+
+Un grafic nu poate arăta mai multe puncte decât are pixeli pe orizontală,
+deci seriile peste PRAG_WEBGL puncte se reduc la PUNCTE_GRAFIC:
+
+    min_max   în fiecare interval se păstrează minimul și maximul, în ordinea
+              lor; vârfurile și golurile nu dispar (vectorizat, O(n))
+    lttb      Largest-Triangle-Three-Buckets: din fiecare interval punctul
+              care formează triunghiul cel mai mare cu vecinii aleși; păstrează
+              forma curbei cu mai puține puncte
+
+Primul și ultimul punct se păstrează întotdeauna.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+PRAG_WEBGL = 2_000
+PUNCTE_GRAFIC = 2_000
+METODE_ESANTIONARE = ("min_max", "lttb")
+
+# ======================== METODE ========================
+
+def indici_min_max(y, puncte: int) -> np.ndarray:
+    """Indicii punctelor păstrate: minimul și maximul din puncte // 2 intervale"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= puncte:
+        return np.arange(n)
+    intervale = max(1, (puncte - 2) // 2)
+    interior = y[1:n - 1]
+    # Intervale consecutive, nevide (n - 2 >= 2 * intervale), fără sortare
+    inceputuri = -((-np.arange(intervale) * (n - 2)) // intervale)
+    lungimi = np.diff(np.append(inceputuri, n - 2))
+    pozitii = np.arange(n - 2)
+    alesi = [np.array([0])]
+    # fmin/fmax ignoră NaN-urile (golurile din serie) din interval
+    for reducere in (np.fmin, np.fmax):
+        extrem = np.repeat(reducere.reduceat(interior, inceputuri), lungimi)
+        candidati = np.where(interior == extrem, pozitii, n)
+        # Doar un interval numai cu NaN nu are extrem: își păstrează ultimul punct
+        alesi.append(np.minimum(np.minimum.reduceat(candidati, inceputuri), inceputuri + lungimi - 1) + 1)
+    alesi.append(np.array([n - 1]))
+    return np.unique(np.concatenate(alesi))
+
+def indici_lttb(x, y, puncte: int) -> np.ndarray:
+    """Indicii punctelor păstrate de algoritmul Largest-Triangle-Three-Buckets"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= puncte or puncte < 3:
+        return np.arange(n) if n <= puncte else np.array([0, n - 1])
+    margini = np.linspace(1, n - 1, puncte - 1).astype(np.int64)
+    alesi = np.empty(puncte, dtype=np.int64)
+    alesi[0], alesi[-1] = 0, n - 1
+    a = 0
+    for k in range(puncte - 2):
+        inceput, sfarsit = margini[k], margini[k + 1]
+        # Vârful al treilea: media intervalului următor (ultimul punct la final)
+        if k + 2 < len(margini):
+            x_urm = x[margini[k + 1]:margini[k + 2]].mean()
+            y_urm = y[margini[k + 1]:margini[k + 2]].mean()
+        else:
+            x_urm, y_urm = x[n - 1], y[n - 1]
+        xs, ys = x[inceput:sfarsit], y[inceput:sfarsit]
+        arii = np.abs((x[a] - x_urm) * (ys - y[a]) - (x[a] - xs) * (y_urm - y[a]))
+        a = inceput + int(np.argmax(arii))
+        alesi[k + 1] = a
+    return alesi
+
+def esantioneaza(x, y, puncte: int = PUNCTE_GRAFIC, metoda: str = "min_max") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce seria (x, y) la cel mult puncte puncte; seriile scurte rămân neschimbate
+
+    Args:
+        x: abscisele, crescătoare (ex. numărul tronsonului, timpul)
+        y: valorile
+        puncte: numărul maxim de puncte păstrate
+        metoda: "min_max" sau "lttb"
+    """
+    if metoda not in METODE_ESANTIONARE:
+        raise ValueError(f"Metodă de eșantionare necunoscută: {metoda}")
+    x = np.asarray(x)
+    y = np.asarray(y)
+    idx = indici_min_max(y, puncte) if metoda == "min_max" else indici_lttb(x, y, puncte)
+    return x[idx], y[idx]
@@ -0,0 +1,61 @@
+"""
+Exportul tabelelor de rezultate în Excel (necesită xlsxwriter)
+
+Foaia se scrie rând cu rând în modul constant_memory al xlsxwriter, direct
+din coloanele motorului de calcul, fără un DataFrame intermediar. Fișierul
+rezultat se întoarce ca bytes, pentru un buton de descărcare.
+"""
+
+import io
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import xlsxwriter
+
+from .profilare import cronometrat
+
+# Formatul numeric al coloanelor reale (cele întregi și textele rămân ca atare)
+FORMAT_NUMERIC = "0.000"
+RANDURI_PE_BLOC = 4096
+
+@cronometrat
+def export_excel(coloane: Dict[str, Sequence], foaie: str = "ARM",
+                 ordine: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Scrie un tabel (coloană -> valori) într-un fișier .xlsx ținut în memorie
+
+    Args:
+        coloane: coloanele tabelului, de lungimi egale (ex. CalculIncrementalTronsoane.coloane())
+        foaie: numele foii de calcul
+        ordine: ordinea coloanelor (implicit ordinea cheilor)
+
+    Returns:
+        Conținutul fișierului .xlsx
+    """
+    nume_coloane: List[str] = list(ordine) if ordine is not None else list(coloane)
+    valori = [np.asarray(coloane[nume]) for nume in nume_coloane]
+    numar_randuri = len(valori[0]) if valori else 0
+
+    buffer = io.BytesIO()
+    # constant_memory: fiecare rând se golește din memorie după ce a fost scris,
+    # deci rândurile trebuie scrise strict în ordine
+    workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True, "nan_inf_to_errors": True})
+    worksheet = workbook.add_worksheet(foaie)
+    format_antet = workbook.add_format({"bold": True, "bg_color": "#D9D9D9", "border": 1})
+    format_numeric = workbook.add_format({"num_format": FORMAT_NUMERIC})
+
+    worksheet.write_row(0, 0, nume_coloane, format_antet)
+    for j, (nume, coloana) in enumerate(zip(nume_coloane, valori)):
+        worksheet.set_column(j, j, max(8, len(nume) + 2),
+                             format_numeric if coloana.dtype.kind == "f" else None)
+    worksheet.freeze_panes(1, 0)
+
+    # Conversia la tipuri Python se face pe blocuri de rânduri, ca memoria să nu
+    # crească odată cu tabelul
+    for inceput in range(0, numar_randuri, RANDURI_PE_BLOC):
+        bloc = [coloana[inceput:inceput + RANDURI_PE_BLOC].tolist() for coloana in valori]
+        for i, rand in enumerate(zip(*bloc), start=inceput + 1):
+            worksheet.write_row(i, 0, rand)
+
+    workbook.close()
+    return buffer.getvalue()
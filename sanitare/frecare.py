@@ -0,0 +1,155 @@
+"""
+Coeficientul de frecare λ și viscozitatea apei
+
+Toate căile de calcul (tronsoane, branșament, calcul vectorizat) folosesc
+aceleași funcții, deci același λ pentru aceleași date de intrare.
+
+Modele disponibile (erori maxime față de Colebrook-White, verificate pe
+4000 <= Re <= 1e8 și 1e-6 <= ε/D <= 0.05):
+    - "colebrook": ecuația implicită, rezolvată Newton în x = 1/sqrt(λ);
+      pornind de la Swamee-Jain converge în 2-4 iterații la toleranța cerută
+    - "haaland": explicită, ±1.5%
+    - "swamee-jain": explicită, ±1.2% pentru Re >= 1e4 și ε/D <= 1e-3,
+      până la ±3.5% în regimul de tranziție (Re < 1e4) sau la ε/D mare
+Sub Re = 2300 toate modelele folosesc regimul laminar λ = 64/Re, iar între
+Re = 2300 și Re = 4000 λ se interpolează liniar între valoarea laminară și
+cea turbulentă, astfel încât λ(Re) să fie continuă (necesar pentru
+convergența rezolvării rețelelor).
+
+Intrările scalare (un tronson) trec prin aceleași formule scrise cu math,
+fără conversiile numpy, care la un singur element ar costa de zeci de ori
+mai mult decât calculul însuși.
+"""
+
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+MODELE_FRECARE = ("colebrook", "haaland", "swamee-jain")
+MODEL_FRECARE_IMPLICIT = "colebrook"
+
+RE_LAMINAR = 2300
+RE_TURBULENT = 4000
+TOLERANTA_COLEBROOK = 1e-10  # eroare relativă maximă pe 1/sqrt(λ)
+_ITERATII_MAX_COLEBROOK = 20
+
+# Viscozitatea cinematică a apei (m²/s) la presiune atmosferică, interpolată liniar
+TEMPERATURI_VISCOZITATE = np.array([0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0])
+VALORI_VISCOZITATE = np.array([1.787e-6, 1.519e-6, 1.307e-6, 1.139e-6, 1.004e-6, 0.893e-6, 0.801e-6,
+                               0.658e-6, 0.553e-6, 0.475e-6, 0.413e-6, 0.365e-6, 0.326e-6, 0.294e-6])
+# Aceleași tabele ca liste, pentru calea scalară (fără costul conversiei în numpy)
+_TEMPERATURI = TEMPERATURI_VISCOZITATE.tolist()
+_VISCOZITATI = VALORI_VISCOZITATE.tolist()
+
+def _scalar(valoare) -> bool:
+    # Verificarea rapidă întâi: float/int (inclusiv np.float64), apoi tablourile 0-d
+    return isinstance(valoare, (float, int)) or np.ndim(valoare) == 0
+
+# ======================== VISCOZITATE ========================
+
+def viscozitate_cinematica_apa(temperaturi):
+    """Viscozitatea cinematică (m²/s) pentru o temperatură sau un vector de temperaturi (°C)"""
+    if _scalar(temperaturi):
+        return _viscozitate_scalar(float(temperaturi))
+    valori = np.interp(temperaturi, TEMPERATURI_VISCOZITATE, VALORI_VISCOZITATE)
+    return float(valori) if np.ndim(valori) == 0 else valori
+
+def _viscozitate_scalar(temperatura: float) -> float:
+    # Interpolare liniară ca np.interp, cu aceleași valori la capete
+    if temperatura <= _TEMPERATURI[0]:
+        return _VISCOZITATI[0]
+    if temperatura >= _TEMPERATURI[-1]:
+        return _VISCOZITATI[-1]
+    i = bisect_right(_TEMPERATURI, temperatura) - 1
+    t0, t1 = _TEMPERATURI[i], _TEMPERATURI[i + 1]
+    return _VISCOZITATI[i] + (_VISCOZITATI[i + 1] - _VISCOZITATI[i]) * (temperatura - t0) / (t1 - t0)
+
+# ======================== COEFICIENT DE FRECARE ========================
+
+def _lambda_haaland(re: np.ndarray, rr: np.ndarray) -> np.ndarray:
+    return (-1.8 * np.log10((rr / 3.7) ** 1.11 + 6.9 / re)) ** (-2)
+
+def _lambda_swamee_jain(re: np.ndarray, rr: np.ndarray) -> np.ndarray:
+    return 0.25 / np.log10(rr / 3.7 + 5.74 / re**0.9) ** 2
+
+def _lambda_colebrook(re: np.ndarray, rr: np.ndarray, toleranta: float) -> np.ndarray:
+    # F(x) = x + 2 log10(ε/3.7D + 2.51 x / Re) = 0, cu x = 1/sqrt(λ)
+    a = rr / 3.7
+    b = 2.51 / re
+    x = 1 / np.sqrt(_lambda_swamee_jain(re, rr))
+    for _ in range(_ITERATII_MAX_COLEBROOK):
+        argument = a + b * x
+        F = x + 2 * np.log10(argument)
+        dF = 1 + (2 / math.log(10)) * b / argument
+        pas = F / dF
+        x = x - pas
+        if np.all(np.abs(pas) <= toleranta * np.abs(x)):
+            break
+    return 1 / x**2
+
+def _factor_frecare_scalar(re: float, rr: float, model: str, toleranta: float) -> float:
+    """Aceleași formule ca pe vectori, cu math: un apel scalar nu plătește conversiile numpy"""
+    if re <= 0:
+        return 0.02
+    if re < RE_LAMINAR:
+        return 64 / re
+    re_t = max(re, RE_TURBULENT)
+    if model == "haaland":
+        lambda_t = (-1.8 * math.log10((rr / 3.7) ** 1.11 + 6.9 / re_t)) ** (-2)
+    else:
+        lambda_t = 0.25 / math.log10(rr / 3.7 + 5.74 / re_t**0.9) ** 2
+        if model == "colebrook":
+            a = rr / 3.7
+            b = 2.51 / re_t
+            x = 1 / math.sqrt(lambda_t)
+            for _ in range(_ITERATII_MAX_COLEBROOK):
+                argument = a + b * x
+                pas = (x + 2 * math.log10(argument)) / (1 + (2 / math.log(10)) * b / argument)
+                x = x - pas
+                if abs(pas) <= toleranta * abs(x):
+                    break
+            lambda_t = 1 / x**2
+    pondere = min(max((re - RE_LAMINAR) / (RE_TURBULENT - RE_LAMINAR), 0.0), 1.0)
+    return (1 - pondere) * (64 / RE_LAMINAR) + pondere * lambda_t
+
+def factor_frecare(reynolds, rugozitate_rel, model: str = MODEL_FRECARE_IMPLICIT,
+                   toleranta: float = TOLERANTA_COLEBROOK):
+    """
+    Coeficientul de frecare λ (Darcy) pentru un Re sau un vector de Re
+
+    Args:
+        reynolds: numărul Reynolds (scalar sau vector)
+        rugozitate_rel: rugozitatea relativă ε/D (scalar sau vector)
+        model: unul dintre MODELE_FRECARE
+        toleranta: toleranța relativă pentru Colebrook-White
+
+    Returns:
+        λ, de aceeași formă ca intrările (float pentru intrări scalare)
+    """
+    if model not in MODELE_FRECARE:
+        raise ValueError(f"Model de frecare necunoscut: {model}")
+    if _scalar(reynolds) and _scalar(rugozitate_rel):
+        return _factor_frecare_scalar(float(reynolds), float(rugozitate_rel), model, toleranta)
+
+    re, rr = np.broadcast_arrays(np.asarray(reynolds, dtype=float), np.asarray(rugozitate_rel, dtype=float))
+    lambda_val = np.full(re.shape, 0.02)
+
+    laminar = (re > 0) & (re < RE_LAMINAR)
+    lambda_val[laminar] = 64 / re[laminar]
+
+    turbulent = re >= RE_LAMINAR
+    if np.any(turbulent):
+        # În zona de tranziție se evaluează formula turbulentă la Re = 4000
+        re_t = np.maximum(re[turbulent], RE_TURBULENT)
+        rr_t = rr[turbulent]
+        if model == "haaland":
+            lambda_t = _lambda_haaland(re_t, rr_t)
+        elif model == "swamee-jain":
+            lambda_t = _lambda_swamee_jain(re_t, rr_t)
+        else:
+            lambda_t = _lambda_colebrook(re_t, rr_t, toleranta)
+        pondere = np.clip((re[turbulent] - RE_LAMINAR) / (RE_TURBULENT - RE_LAMINAR), 0.0, 1.0)
+        lambda_val[turbulent] = (1 - pondere) * (64 / RE_LAMINAR) + pondere * lambda_t
+
+    return float(lambda_val) if lambda_val.ndim == 0 else lambda_val
@@ -0,0 +1,184 @@
+"""Funcții de calcul hidraulic pentru tronsoane de alimentare cu apă."""
+
+import math
+from typing import List, Dict, Tuple
+
+from .date import (
+    G,
+    DESTINATII_CLADIRE,
+    COEFICIENTI_PIERDERI_LOCALE,
+)
+from .frecare import MODEL_FRECARE_IMPLICIT, viscozitate_cinematica_apa, factor_frecare
+from .catalog import catalog, diametre_material, notatie_dn
+
+# ======================== FUNCȚII DE CALCUL ========================
+
+def calcul_debit_cu_destinatie(suma_vs: float, suma_E: float, destinatie: str, tip_apa: str = "ARM"):
+    """Calculează debitul conform destinației"""
+    config = DESTINATII_CLADIRE[destinatie]
+    
+    if config["metoda"] == "B":
+        if suma_vs >= config["v_min"]:
+            debit = config["coef_a_arm"] * math.sqrt(suma_vs)
+        else:
+            debit = suma_vs
+    else:  # Metoda C
+        coef = config["coef_b_acm"] if tip_apa == "ACM" else config["coef_a_arm"]
+        if suma_E >= config["E_min"]:
+            debit = coef * math.sqrt(suma_E)
+        else:
+            debit = 0.2 * suma_E
+    
+    return debit
+
+def calcul_factor_f(N: int, destinatie: str):
+    """Calculează factorul de simultaneitate f"""
+    # Formula din normativ pentru clădiri de locuit
+    if N <= 0:
+        return 0
+    elif N == 1:
+        return 1.0
+    else:
+        return 1.0 / math.sqrt(N)
+
+def viscozitate_cinematica(temperatura: float) -> float:
+    """Viscozitate cinematică (interpolată din tabelul apei)"""
+    return viscozitate_cinematica_apa(temperatura)
+
+def calculeaza_reynolds(viteza: float, diametru_m: float, viscozitate: float) -> float:
+    if viscozitate == 0:
+        return 0
+    return (viteza * diametru_m) / viscozitate
+
+def calculeaza_lambda_haaland(reynolds: float, rugozitate_rel: float) -> float:
+    return factor_frecare(reynolds, rugozitate_rel, "haaland")
+
+def dimensioneaza_tronson(debit_ls: float, lungime_m: float, material: str, 
+                         temperatura: float, suma_zeta: float, info_material: dict,
+                         model_frecare: str = MODEL_FRECARE_IMPLICIT):
+    """Dimensionează un tronson"""
+    if debit_ls <= 0:
+        return None
+    
+    rugozitate_mm = info_material["rugozitate_mm"]
+    v_max_admis = info_material["v_max"]
+    
+    # Diametru minim teoretic
+    d_min = math.sqrt((4 * debit_ls / 1000) / (math.pi * v_max_admis)) * 1000
+    
+    # Selectez DN comercial (diametrele sortate vin din cache-ul catalogului)
+    dn_ales, d_int_mm = diametre_material(info_material).selecteaza(d_min)
+    
+    # Calcule hidraulice
+    sectiune = math.pi * (d_int_mm/1000)**2 / 4
+    viteza = (debit_ls / 1000) / sectiune if sectiune > 0 else 0
+    
+    viscozitate = viscozitate_cinematica(temperatura)
+    reynolds = calculeaza_reynolds(viteza, d_int_mm/1000, viscozitate)
+    rugozitate_rel = rugozitate_mm / d_int_mm
+    lambda_coef = factor_frecare(reynolds, rugozitate_rel, model_frecare)
+    
+    # Pierderi
+    h_lin_m = lambda_coef * (lungime_m / (d_int_mm/1000)) * (viteza**2 / (2 * G))
+    h_loc_m = suma_zeta * (viteza**2 / (2 * G))
+    i_specific = (h_lin_m / lungime_m) * 1000 * G if lungime_m > 0 else 0
+    
+    return {
+        "dn": dn_ales,
+        "d_int_mm": d_int_mm,
+        "viteza_ms": viteza,
+        "reynolds": reynolds,
+        "lambda": lambda_coef,
+        "h_lin_m": h_lin_m,
+        "h_loc_m": h_loc_m,
+        "i_specific_pa_m": i_specific,
+        "i_L": h_lin_m * 1000,  # în mmCA
+        "h_loc_mmca": h_loc_m * 1000
+    }
+
+def calcul_debit_probabilistic(consumatori_selectati: List[Dict]) -> float:
+    """Calculează debitul probabilistic conform SR 1343-1:2006"""
+    suma_debit_unitate = sum(c["debit"] * c["unitate"] * c["cantitate"] 
+                              for c in consumatori_selectati)
+    
+    if suma_debit_unitate <= 0:
+        return 0.0
+    elif suma_debit_unitate <= 0.2:
+        return suma_debit_unitate
+    elif suma_debit_unitate <= 1.6:
+        return 0.2 + 0.25 * (suma_debit_unitate - 0.2)**0.5
+    else:
+        return 0.466 * suma_debit_unitate**0.5
+
+def calcul_diametru_minim(debit: float, viteza_max: float) -> float:
+    """Calculează diametrul minim necesar în mm"""
+    if debit <= 0 or viteza_max <= 0:
+        return 0.0
+    return 1000 * math.sqrt(4 * debit / (math.pi * viteza_max))
+
+def reynolds(viteza: float, diametru: float, temperatura: float = 10.0) -> float:
+    """Calculează numărul Reynolds"""
+    return viteza * diametru / viscozitate_cinematica(temperatura)
+
+def factor_frecare_colebrook(re: float, rugozitate: float, diametru: float, 
+                            epsilon: float = 1e-6) -> float:
+    """Calculează factorul de frecare prin formula Colebrook-White"""
+    return factor_frecare(re, rugozitate / diametru, "colebrook", toleranta=epsilon)
+
+def pierdere_presiune_distribuita(debit: float, lungime: float, 
+                                 diametru: float, rugozitate: float,
+                                 temperatura: float = 10.0,
+                                 model_frecare: str = MODEL_FRECARE_IMPLICIT) -> float:
+    """Calculează pierderea de presiune distribuită în mCA"""
+    if diametru <= 0 or debit <= 0:
+        return 0.0
+    
+    viteza = 4 * debit / (math.pi * (diametru/1000)**2)
+    re = reynolds(viteza, diametru/1000, temperatura)
+    f = factor_frecare(re, rugozitate / diametru, model_frecare)
+    
+    return f * lungime * viteza**2 / (2 * G * diametru/1000)
+
+def pierdere_presiune_locala(viteza: float, coeficient: float) -> float:
+    """Calculează pierderea de presiune locală în mCA"""
+    return coeficient * viteza**2 / (2 * G)
+
+def calcul_pierderi_locale_tronson(viteza: float, elemente_locale: Dict[str, int], 
+                                   este_ultimul_etaj: bool = False) -> float:
+    """
+    Calculează pierderile locale pentru un tronson
+    
+    Args:
+        viteza: viteza fluidului în m/s
+        elemente_locale: dicționar cu elementele și cantitățile lor
+        este_ultimul_etaj: True pentru ultimul etaj (cel mai defavorabil)
+    
+    Returns:
+        Pierderea locală totală în mCA
+    """
+    pierdere_totala = 0.0
+    
+    for element, cantitate in elemente_locale.items():
+        if element in COEFICIENTI_PIERDERI_LOCALE:
+            # Pentru etajele inferioare, luăm în calcul doar tee-urile
+            if not este_ultimul_etaj and "Tee" not in element:
+                continue
+            
+            coef = COEFICIENTI_PIERDERI_LOCALE[element]
+            pierdere_totala += cantitate * pierdere_presiune_locala(viteza, coef)
+    
+    return pierdere_totala
+
+def selectare_diametru_material(material: str, diametru_minim: float) -> Tuple[float, float]:
+    """Selectează diametrul comercial disponibil și returnează DN"""
+    diametre = catalog().diametre.get(material)
+    if diametre is None:
+        return 0, 0
+    
+    return diametre.selecteaza(diametru_minim)
+
+def get_diametru_specific(material: str, dn: float) -> str:
+    """Obține diametrul specific pentru un material și DN dat"""
+    # Notațiile sunt indexate exact pe material și DN în catalogul compilat
+    notatie = notatie_dn(material, dn)
+    return notatie if notatie is not None else f"DN{int(dn)}"
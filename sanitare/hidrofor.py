@@ -0,0 +1,187 @@
+"""
+Simularea pe evenimente a stației de hidrofor (vas sub presiune + pompe în cascadă)
+
+Apa din vas respectă legea Boyle-Mariotte: la presiunea absolută P, un vas de
+volum V cu presiunea de precărcare P0 conține W(P) = V (1 - P0 / P) litri.
+Pompele pornesc în cascadă: pompa k pornește la p_pornire + (n-1-k)·decalaj
+și oprește cu banda de presiune mai sus, deci pompele în funcțiune sunt
+mereu primele r. Între două evenimente (schimbarea cererii, atingerea unui
+prag de pornire/oprire, golirea vasului) volumul de apă variază liniar, deci
+momentul fiecărui eveniment se calculează exact, fără pas de timp fix.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .profilare import cronometrat
+
+PRESIUNE_ATMOSFERICA = 10.33  # mCA
+BANDA_PRESIUNE = 20.0  # mCA între pornire și oprire (ca în calcul_hidrofor)
+DECALAJ_CASCADA = 3.0  # mCA între pragurile pompelor succesive
+FACTOR_PRECARCARE = 0.9  # precărcarea, față de cel mai jos prag de pornire (absolut)
+VOLUME_STANDARD_HIDROFOR = (24, 50, 80, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000)  # litri
+PORNIRI_ORA_ADMISE = 15
+
+# ======================== SIMULARE ========================
+
+def debit_pompa_cascada(debit_varf_ls: float, numar_pompe: int) -> float:
+    """Debitul unei pompe, cu aceeași regulă ca în calcul_hidrofor (l/s)"""
+    return debit_varf_ls / numar_pompe if numar_pompe > 1 else debit_varf_ls * 1.1
+
+def simuleaza_hidrofor(cerere_ls, pas_s: float, volum_l: float, numar_pompe: int,
+                       debit_pompa_ls: float, presiune_pornire: float,
+                       banda: float = BANDA_PRESIUNE, decalaj: float = DECALAJ_CASCADA,
+                       presiune_minima: Optional[float] = None) -> Dict:
+    """
+    Simulează stația pe o serie de cereri constante pe fiecare pas
+
+    Args:
+        cerere_ls: cererea (l/s) pe fiecare pas
+        pas_s: durata unui pas (s)
+        volum_l: volumul vasului de hidrofor
+        numar_pompe: pompele din cascadă (toate active, fără pompă de rezervă)
+        debit_pompa_ls: debitul unei pompe (l/s)
+        presiune_pornire: pragul de pornire al ultimei pompe din cascadă (mCA)
+        banda: diferența oprire - pornire pentru fiecare pompă (mCA)
+        decalaj: diferența dintre pragurile a două pompe succesive (mCA)
+        presiune_minima: presiunea sub care se consideră ieșire din bandă
+            (implicit presiune_pornire)
+
+    Returns:
+        Dicționar cu porniri, porniri maxime pe oră și timp de funcționare
+        (pe pompă), timpul sub presiunea minimă, timpul cu vasul gol
+        (cerere neacoperită), presiunea minimă atinsă și numărul de evenimente
+    """
+    cerere = np.asarray(cerere_ls, dtype=float)
+    n = int(numar_pompe)
+    presiune_minima = presiune_pornire if presiune_minima is None else presiune_minima
+    p_pornire = [presiune_pornire + (n - 1 - k) * decalaj for k in range(n)]
+    p_oprire = [p + banda for p in p_pornire]
+    P0 = FACTOR_PRECARCARE * (min(p_pornire) + PRESIUNE_ATMOSFERICA)
+
+    def apa(p):
+        return volum_l * (1 - P0 / (p + PRESIUNE_ATMOSFERICA))
+
+    W_pornire = [apa(p) for p in p_pornire] + [0.0]  # sub ultima pompă: vasul gol
+    W_oprire = [apa(p) for p in p_oprire]
+    # Toleranța evită contorizarea erorilor de rotunjire la pragul ultimei pompe
+    W_minim = max(apa(presiune_minima), 0.0) - 1e-9 * volum_l
+    Q = float(debit_pompa_ls)
+
+    ore = int(np.ceil(len(cerere) * pas_s / 3600)) or 1
+    porniri_ora = np.zeros((n, ore), dtype=np.int64)
+    functionare = [0.0] * n
+    timp_sub_minim = 0.0
+    timp_gol = 0.0
+    W_min_atins = W = W_oprire[0]  # pornește cu vasul plin, toate pompele oprite
+    r = 0
+    t = 0.0
+    evenimente = 0
+
+    for d in cerere.tolist():
+        t_final = t + pas_s
+        while t < t_final:
+            net = r * Q - d
+            if net > 0:
+                dt_eveniment = (W_oprire[r - 1] - W) / net
+            elif net < 0:
+                if W <= 0.0 and r == n:
+                    # Vasul gol: cererea peste capacitatea pompelor nu e acoperită
+                    dt = t_final - t
+                    timp_gol += dt
+                    timp_sub_minim += dt
+                    for k in range(r):
+                        functionare[k] += dt
+                    t = t_final
+                    break
+                dt_eveniment = max(W - W_pornire[r], 0.0) / -net
+            else:
+                dt_eveniment = float("inf")
+
+            dt = min(dt_eveniment, t_final - t)
+            W_nou = W + net * dt
+            for k in range(r):
+                functionare[k] += dt
+            # Partea din interval petrecută sub presiunea minimă (W variază liniar)
+            jos, sus = (W, W_nou) if W <= W_nou else (W_nou, W)
+            if jos < W_minim:
+                timp_sub_minim += dt if sus <= W_minim or sus == jos else dt * (W_minim - jos) / (sus - jos)
+            W_min_atins = min(W_min_atins, W_nou)
+            t += dt
+            W = W_nou
+
+            if dt == dt_eveniment:
+                evenimente += 1
+                if net > 0:
+                    r -= 1
+                    W = W_oprire[r]
+                elif r < n:
+                    W = W_pornire[r]
+                    porniri_ora[r, min(int(t // 3600), ore - 1)] += 1
+                    r += 1
+                else:
+                    W = 0.0
+
+    porniri = porniri_ora.sum(axis=1)
+    presiune_min_atinsa = P0 / (1 - max(W_min_atins, 0.0) / volum_l) - PRESIUNE_ATMOSFERICA
+    return {
+        "volum_l": volum_l,
+        "numar_pompe": n,
+        "porniri": porniri,
+        "porniri_ora_max": porniri_ora.max(axis=1),
+        "functionare_h": np.array(functionare) / 3600,
+        "timp_sub_minim_s": timp_sub_minim,
+        "timp_gol_s": timp_gol,
+        "presiune_minima_atinsa": presiune_min_atinsa,
+        "evenimente": evenimente,
+    }
+
+def _simuleaza_configuratie(argumente) -> Dict:
+    cerere_ls, pas_s, volum, n, debit_varf_ls, presiune_pornire, banda, decalaj = argumente
+    return simuleaza_hidrofor(cerere_ls, pas_s, volum, n, debit_pompa_cascada(debit_varf_ls, n),
+                              presiune_pornire, banda, decalaj)
+
+@cronometrat
+def matrice_hidrofor(cerere_ls, pas_s: float, debit_varf_ls: float, presiune_pornire: float,
+                     volume_l: Sequence[float] = VOLUME_STANDARD_HIDROFOR,
+                     configuratii_pompe: Sequence[int] = (1, 2, 3, 4),
+                     banda: float = BANDA_PRESIUNE, decalaj: float = DECALAJ_CASCADA,
+                     porniri_admise: int = PORNIRI_ORA_ADMISE,
+                     procese: Optional[int] = 1) -> List[Dict]:
+    """
+    Simulează fiecare volum standard x configurație de pompe pe aceeași cerere
+
+    Returns:
+        Câte un rând pe combinație: volumul, numărul de pompe, pornirile maxime
+        pe oră (cea mai solicitată pompă), orele de funcționare pe pompă,
+        timpul sub presiunea minimă și "Admis" (porniri <= porniri_admise și
+        presiunea nu iese din bandă)
+    """
+    sarcini = [
+        (cerere_ls, pas_s, volum, n, debit_varf_ls, presiune_pornire, banda, decalaj)
+        for n in configuratii_pompe for volum in volume_l
+    ]
+    procese = procese or os.cpu_count() or 1
+    if procese == 1:
+        rezultate = [_simuleaza_configuratie(s) for s in sarcini]
+    else:
+        with ProcessPoolExecutor(max_workers=procese) as executor:
+            rezultate = list(executor.map(_simuleaza_configuratie, sarcini,
+                                          chunksize=max(1, len(sarcini) // (4 * procese))))
+
+    matrice = []
+    for rezultat in rezultate:
+        porniri_max = int(rezultat["porniri_ora_max"].max())
+        matrice.append({
+            "Volum (L)": rezultat["volum_l"],
+            "Pompe": rezultat["numar_pompe"],
+            "Porniri/oră max": porniri_max,
+            "Funcționare (h/pompă)": ", ".join(f"{h:.1f}" for h in rezultat["functionare_h"]),
+            "Sub presiune (s)": rezultat["timp_sub_minim_s"],
+            "Presiune min (mCA)": rezultat["presiune_minima_atinsa"],
+            "Admis": porniri_max <= porniri_admise and rezultat["timp_sub_minim_s"] == 0,
+        })
+    return matrice
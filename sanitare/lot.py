@@ -0,0 +1,165 @@
+"""
+Dimensionarea în lot a mai multor proiecte, în paralel pe toate nucleele
+
+Fiecare proiect este un fișier JSON cu aceleași date ca în interfață:
+
+    {
+        "destinatie": "Clădiri de locuit",
+        "material": "PPR (Polipropilenă) PN20",
+        "temperatura": 10,
+        "model_frecare": "colebrook",            (opțional)
+        "tronsoane": [
+            {"nr": 1, "consumatori": {"Lavoar": 2}, "lungime": 5.0,
+             "diferenta_nivel": 3.0, "suma_zeta": 4.3},
+            ...
+        ]
+    }
+
+Pentru fiecare proiect se scrie <nume>.csv cu tabelul tronsoanelor, iar la
+final sumar.csv cu debitul, DN-ul și h_tot finale ale fiecărui proiect.
+Proiectele cu date greșite (câmpuri lipsă, tipuri greșite, consumatori
+necunoscuți) apar în sumar cu starea "eroare" și mesajul, fără să oprească lotul.
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .date import CONSUMATORI, DESTINATII_CLADIRE, MATERIALE_CONDUCTE
+from .frecare import MODEL_FRECARE_IMPLICIT, MODELE_FRECARE
+from .tronsoane import COLOANE_REZULTATE, calcul_tronsoane
+
+COLOANE_SUMAR = ["Proiect", "Stare", "Tronsoane", "Vc", "DN", "v", "h_tot", "Eroare"]
+
+# ======================== PROIECTE ========================
+
+def incarca_proiect(cale) -> Dict:
+    """Citește și validează un fișier de proiect"""
+    with open(cale, encoding="utf-8") as f:
+        return valideaza_proiect(json.load(f))
+
+def valideaza_proiect(proiect: Dict) -> Dict:
+    """Verifică datele unui proiect și completează câmpurile opționale ale tronsoanelor"""
+    if not isinstance(proiect, dict):
+        raise ValueError("Proiectul trebuie să fie un obiect JSON")
+    for camp in ("destinatie", "material", "tronsoane"):
+        if camp not in proiect:
+            raise ValueError(f"Lipsește câmpul '{camp}'")
+    if proiect["destinatie"] not in DESTINATII_CLADIRE:
+        raise ValueError(f"Destinație necunoscută: {proiect['destinatie']}")
+    if proiect["material"] not in MATERIALE_CONDUCTE:
+        raise ValueError(f"Material necunoscut: {proiect['material']}")
+    if "temperatura" in proiect and not _este_numar(proiect["temperatura"]):
+        raise ValueError("'temperatura' trebuie să fie un număr")
+    if proiect.get("model_frecare", MODEL_FRECARE_IMPLICIT) not in MODELE_FRECARE:
+        raise ValueError(f"Model de frecare necunoscut: {proiect['model_frecare']}")
+    if not isinstance(proiect["tronsoane"], list):
+        raise ValueError("'tronsoane' trebuie să fie o listă de obiecte")
+    for i, tronson in enumerate(proiect["tronsoane"], start=1):
+        _valideaza_tronson(tronson, i)
+        tronson.setdefault("nr", i)
+        tronson.setdefault("diferenta_nivel", 0.0)
+        tronson.setdefault("suma_zeta", 0.0)
+    return proiect
+
+def _este_numar(valoare) -> bool:
+    # bool este subclasă a lui int, dar true/false din JSON nu sunt lungimi
+    return isinstance(valoare, (int, float)) and not isinstance(valoare, bool) and math.isfinite(valoare)
+
+def _valideaza_tronson(tronson, i: int):
+    if not isinstance(tronson, dict):
+        raise ValueError(f"Tronsonul {i} trebuie să fie un obiect")
+    consumatori = tronson.get("consumatori")
+    if not isinstance(consumatori, dict):
+        raise ValueError(f"Tronsonul {i}: 'consumatori' trebuie să fie un obiect {{nume: cantitate}}")
+    for nume, cantitate in consumatori.items():
+        if nume not in CONSUMATORI:
+            raise ValueError(f"Tronsonul {i}: consumator necunoscut: {nume}")
+        if not isinstance(cantitate, int) or isinstance(cantitate, bool) or cantitate < 0:
+            raise ValueError(f"Tronsonul {i}: cantitatea pentru {nume} trebuie să fie un întreg >= 0")
+    if not _este_numar(tronson.get("lungime")) or tronson["lungime"] < 0:
+        raise ValueError(f"Tronsonul {i}: 'lungime' trebuie să fie un număr >= 0")
+    for camp in ("diferenta_nivel", "suma_zeta"):
+        if camp in tronson and not _este_numar(tronson[camp]):
+            raise ValueError(f"Tronsonul {i}: '{camp}' trebuie să fie un număr")
+    if "nr" in tronson and (not isinstance(tronson["nr"], int) or isinstance(tronson["nr"], bool)):
+        raise ValueError(f"Tronsonul {i}: 'nr' trebuie să fie un întreg")
+
+def calculeaza_proiect(cale, director_iesire) -> Dict:
+    """Dimensionează un proiect și scrie tabelul lui; rulează în procesul worker"""
+    nume = Path(cale).stem
+    try:
+        proiect = incarca_proiect(cale)
+        rezultate = calcul_tronsoane(
+            proiect["tronsoane"], proiect["destinatie"], proiect["material"],
+            proiect.get("temperatura", 10), "ARM",
+            proiect.get("model_frecare", MODEL_FRECARE_IMPLICIT)
+        )
+        with open(Path(director_iesire) / f"{nume}.csv", "w", newline="", encoding="utf-8") as f:
+            scriitor = csv.DictWriter(f, fieldnames=COLOANE_REZULTATE)
+            scriitor.writeheader()
+            scriitor.writerows(rezultate)
+    except Exception as exc:  # orice proiect defect se raportează, fără să oprească lotul
+        return {"Proiect": nume, "Stare": "eroare", "Eroare": f"{type(exc).__name__}: {exc}"}
+
+    if not rezultate:
+        return {"Proiect": nume, "Stare": "gol", "Tronsoane": 0}
+    final = rezultate[-1]
+    return {
+        "Proiect": nume,
+        "Stare": "ok",
+        "Tronsoane": len(rezultate),
+        "Vc": final["Vc"],
+        "DN": final["DN"],
+        "v": final["v"],
+        "h_tot": final["h_tot"],
+    }
+
+def ruleaza_lot(director_intrare, director_iesire, procese: Optional[int] = None) -> List[Dict]:
+    """
+    Dimensionează toate proiectele *.json dintr-un director
+
+    Args:
+        director_intrare: directorul cu fișierele de proiect
+        director_iesire: unde se scriu tabelele și sumar.csv
+        procese: numărul de procese worker (implicit numărul de nuclee)
+
+    Returns:
+        Rândurile sumarului, în ordinea alfabetică a proiectelor
+    """
+    fisiere = sorted(Path(director_intrare).glob("*.json"))
+    Path(director_iesire).mkdir(parents=True, exist_ok=True)
+    procese = procese or os.cpu_count() or 1
+
+    if procese == 1 or len(fisiere) <= 1:
+        sumar = [calculeaza_proiect(cale, director_iesire) for cale in fisiere]
+    else:
+        with ProcessPoolExecutor(max_workers=procese) as executor:
+            sumar = list(executor.map(
+                calculeaza_proiect, fisiere, [director_iesire] * len(fisiere),
+                chunksize=max(1, len(fisiere) // (4 * procese))
+            ))
+
+    with open(Path(director_iesire) / "sumar.csv", "w", newline="", encoding="utf-8") as f:
+        scriitor = csv.DictWriter(f, fieldnames=COLOANE_SUMAR)
+        scriitor.writeheader()
+        scriitor.writerows(sumar)
+    return sumar
+
+# ======================== LINIE DE COMANDĂ ========================
+
+def comanda_lot(argumente) -> int:
+    """Punctul de intrare pentru `python -m sanitare lot`"""
+    start = time.perf_counter()
+    sumar = ruleaza_lot(argumente.director, argumente.iesire or argumente.director, argumente.procese)
+    durata = time.perf_counter() - start
+    erori = [rand for rand in sumar if rand["Stare"] == "eroare"]
+    print(f"{len(sumar)} proiecte dimensionate în {durata:.2f} s ({len(erori)} cu erori)")
+    for rand in erori:
+        print(f"  {rand['Proiect']}: {rand['Eroare']}")
+    return 1 if erori else 0
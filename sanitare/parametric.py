@@ -0,0 +1,150 @@
+"""
+Studiu parametric: aceleași tronsoane pentru toate combinațiile de
+destinație, material și temperatură
+
+Σ Vs și Σ E nu depind de variantă, debitul de calcul depinde doar de
+destinație, iar DN-ul ales nu depinde de temperatură. De aceea unitatea de
+lucru este perechea (destinație, material): toate temperaturile ei se
+dimensionează într-un singur apel vectorizat. Perechile se împart pe procese
+doar când volumul de calcul justifică pornirea lor.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .date import CONSUMATORI, DESTINATII_CLADIRE, MATERIALE_CONDUCTE, PRETURI_CONDUCTE
+from .frecare import MODEL_FRECARE_IMPLICIT
+from .profilare import cronometrat
+from .vectorizat import calcul_debit_cu_destinatie_vect, dimensioneaza_tronsoane
+
+COLOANE_VARIANTE = ["Destinație", "Material", "Temperatura", "Vc", "DN", "v", "h_tot", "Cost", "Pareto"]
+
+# Sub acest număr de rânduri dimensionate (tronsoane x variante) procesele nu se justifică
+PRAG_PARALEL = 200_000
+
+# ======================== EVALUARE VARIANTE ========================
+
+def _sume_prefix(tronsoane: List[Dict]):
+    vs = np.array([sum(CONSUMATORI[c]["debit"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    E = np.array([sum(CONSUMATORI[c]["unitate"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    return np.cumsum(vs), np.cumsum(E)
+
+def _evalueaza_pereche(tronsoane: List[Dict], destinatie: str, material: str, info_material: dict,
+                       preturi: Dict, temperaturi: Sequence[float], model_frecare: str) -> List[Dict]:
+    """
+    Toate temperaturile unei perechi (destinație, material); rulează și în procesul worker
+
+    Intrarea de catalog și prețurile se primesc explicit, ca workerii să
+    folosească și cataloagele de furnizor încărcate în procesul principal.
+    """
+    n, T = len(tronsoane), len(temperaturi)
+    suma_vs, suma_E = _sume_prefix(tronsoane)
+    lungimi = np.array([t["lungime"] for t in tronsoane], dtype=float)
+    zeta = np.array([t["suma_zeta"] for t in tronsoane], dtype=float)
+    geom = np.array([t.get("diferenta_nivel", 0) for t in tronsoane], dtype=float)
+
+    Vc = calcul_debit_cu_destinatie_vect(suma_vs, suma_E, destinatie)
+    dim = dimensioneaza_tronsoane(
+        np.tile(Vc, T), np.tile(lungimi, T), np.tile(zeta, T),
+        np.repeat(np.asarray(temperaturi, dtype=float), n), info_material, model_frecare
+    )
+    valid = dim["valid"][:n]
+
+    # Pierderile se cumulează doar pe tronsoanele dimensionate (cele nedimensionate au 0)
+    h_lin_mm = dim["i_L"].reshape(T, n).sum(axis=1)
+    h_loc_mm = dim["h_loc_mmca"].reshape(T, n).sum(axis=1)
+    h_tot = (h_lin_mm + h_loc_mm) / 1000 + np.sum(np.where(valid, geom, 0.0))
+
+    dn = dim["dn"][:n]
+    cost = float(sum(L * preturi.get(d, np.nan) for L, d, ok in zip(lungimi, dn, valid) if ok))
+
+    if not np.any(valid):
+        return []
+    viteza_finala = dim["viteza_ms"].reshape(T, n)[:, -1]
+    return [
+        {
+            "Destinație": destinatie,
+            "Material": material,
+            "Temperatura": float(temperatura),
+            "Vc": float(Vc[-1]),
+            "DN": int(dn[-1]),
+            "v": float(viteza_finala[k]),
+            "h_tot": float(h_tot[k]),
+            "Cost": cost,
+        }
+        for k, temperatura in enumerate(temperaturi)
+    ]
+
+def marcheaza_pareto(variante: List[Dict]) -> List[Dict]:
+    """
+    Marchează variantele nedominate în (h_tot, Cost), ambele de minimizat
+
+    Fronturile se calculează separat pentru fiecare destinație și temperatură:
+    doar variantele cu același debit și aceeași apă sunt alternative reale.
+    """
+    grupuri: Dict[tuple, List[Dict]] = {}
+    for varianta in variante:
+        varianta["Pareto"] = False
+        grupuri.setdefault((varianta["Destinație"], varianta["Temperatura"]), []).append(varianta)
+    for grup in grupuri.values():
+        candidati = sorted(
+            (v for v in grup if np.isfinite(v["Cost"])), key=lambda v: (v["h_tot"], v["Cost"])
+        )
+        cost_minim = np.inf
+        for varianta in candidati:
+            if varianta["Cost"] < cost_minim:
+                varianta["Pareto"] = True
+                cost_minim = varianta["Cost"]
+    return variante
+
+@cronometrat
+def studiu_parametric(tronsoane: List[Dict],
+                      materiale: Optional[Sequence[str]] = None,
+                      temperaturi: Sequence[float] = (10.0,),
+                      destinatii: Optional[Sequence[str]] = None,
+                      model_frecare: str = MODEL_FRECARE_IMPLICIT,
+                      procese: Optional[int] = None) -> List[Dict]:
+    """
+    Evaluează produsul cartezian material x temperatură x destinație
+
+    Args:
+        tronsoane: lista de tronsoane, în formatul din interfață
+        materiale: materialele comparate (implicit toate din MATERIALE_CONDUCTE)
+        temperaturi: temperaturile apei, °C
+        destinatii: destinațiile comparate (implicit toate din DESTINATII_CLADIRE)
+        model_frecare: modelul pentru λ
+        procese: număr de procese (implicit toate nucleele, dacă volumul o justifică)
+
+    Returns:
+        Câte un rând (COLOANE_VARIANTE) pentru fiecare variantă: Vc, DN, v și
+        h_tot ale ultimului tronson, costul conductelor (NaN dacă lipsesc
+        prețuri) și apartenența la frontul Pareto h_tot-cost
+    """
+    if not tronsoane:
+        return []
+    materiale = list(materiale) if materiale is not None else list(MATERIALE_CONDUCTE)
+    destinatii = list(destinatii) if destinatii is not None else list(DESTINATII_CLADIRE)
+    temperaturi = list(temperaturi)
+    perechi = [(d, m) for d in destinatii for m in materiale]
+
+    procese = procese or os.cpu_count() or 1
+    volum = len(tronsoane) * len(perechi) * len(temperaturi)
+    if procese == 1 or len(perechi) <= 1 or volum < PRAG_PARALEL:
+        rezultate = [
+            _evalueaza_pereche(tronsoane, d, m, MATERIALE_CONDUCTE[m], PRETURI_CONDUCTE.get(m, {}),
+                               temperaturi, model_frecare)
+            for d, m in perechi
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=procese) as executor:
+            n = len(perechi)
+            rezultate = list(executor.map(
+                _evalueaza_pereche, [tronsoane] * n, [d for d, _ in perechi], [m for _, m in perechi],
+                [MATERIALE_CONDUCTE[m] for _, m in perechi], [PRETURI_CONDUCTE.get(m, {}) for _, m in perechi],
+                [temperaturi] * n, [model_frecare] * n,
+                chunksize=max(1, n // (4 * procese))
+            ))
+    return marcheaza_pareto([rand for grup in rezultate for rand in grup])
@@ -0,0 +1,218 @@
+"""
+Selecția pompei din catalog: punctul de funcționare pe curba rețelei
+
+Curba rețelei se construiește din rezultatele tronsoanelor:
+
+    H_rețea(Q) = H_static + k·Q²,   k = (Σ i*L + Σ h_loc) / Q_calcul²
+
+cu H_static = Σ h_geom + presiunea de utilizare. Curbele pompelor sunt
+polinoame de gradul 2 (POMPE sau catalogul furnizorului), deci punctul de
+funcționare al fiecărei pompe este rădăcina pozitivă a unei ecuații de
+gradul 2; toată gama se rezolvă dintr-o singură operație vectorizată.
+Pentru n pompe identice în paralel, fiecare pompă preia Q/n.
+
+Cataloagele de furnizor (CSV sau JSON, un rând pe pompă) au coloanele:
+
+    model, q_max_m3h, h0, h1, h2, eta0, eta1, eta2
+
+Debitele sunt în m³/h, înălțimile în mCA, randamentul ca fracție (0-1).
+"""
+
+import csv
+import io
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .catalog import citeste_numar
+from .date import G, POMPE
+from .profilare import cronometrat
+
+ORE_FUNCTIONARE_AN = 2000
+COLOANE_SELECTIE_POMPE = ["Model", "Q (m³/h)", "H (mCA)", "η (%)", "P (kW)", "Energie (kWh/an)", "Q/Qc", "Acoperă"]
+
+# ======================== CATALOG COMPILAT ========================
+
+class CatalogPompe:
+    """Gama de pompe ca vectori: coeficienții curbelor H-Q și η-Q, debitul maxim"""
+
+    def __init__(self, pompe: Dict[str, Dict]):
+        self.modele = tuple(pompe)
+        self.q_max = np.array([p["q_max_m3h"] for p in pompe.values()], dtype=float).reshape(-1)
+        self.h = np.array([p["h"] for p in pompe.values()], dtype=float).reshape(-1, 3)
+        self.eta = np.array([p["eta"] for p in pompe.values()], dtype=float).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.modele)
+
+_lock = threading.Lock()
+_catalog_pompe: Optional[CatalogPompe] = None
+
+def catalog_pompe() -> CatalogPompe:
+    """Gama de pompe din POMPE, compilată o singură dată pe proces"""
+    global _catalog_pompe
+    compilat = _catalog_pompe
+    if compilat is None:
+        with _lock:
+            if _catalog_pompe is None:
+                _catalog_pompe = CatalogPompe(POMPE)
+            compilat = _catalog_pompe
+    return compilat
+
+# ======================== CATALOAGE FURNIZORI ========================
+
+def citeste_catalog_pompe(continut: str, format: str = "csv") -> Dict[str, Dict]:
+    """
+    Citește curbele pompelor dintr-un catalog de furnizor (text CSV sau JSON)
+
+    Returns:
+        Dicționar model -> {"q_max_m3h", "h", "eta"}, în formatul POMPE
+    """
+    if format == "json":
+        date = json.loads(continut)
+        randuri = date.get("pompe", []) if isinstance(date, dict) else date
+    elif format == "csv":
+        prima_linie = continut.lstrip("\ufeff").split("\n", 1)[0]
+        separator = ";" if prima_linie.count(";") > prima_linie.count(",") else ","
+        randuri = list(csv.DictReader(io.StringIO(continut.lstrip("\ufeff")), delimiter=separator))
+    else:
+        raise ValueError(f"Format de catalog necunoscut: {format}")
+
+    pompe = {}
+    for i, rand in enumerate(randuri, start=1):
+        rand = {str(cheie).strip().lower(): valoare for cheie, valoare in rand.items() if cheie is not None}
+        lipsa = [camp for camp in ("model", "q_max_m3h", "h0") if rand.get(camp) in (None, "")]
+        if lipsa:
+            raise ValueError(f"Rândul {i}: lipsesc câmpurile {lipsa}")
+        model = str(rand["model"]).strip()
+        if model in pompe:
+            raise ValueError(f"Rândul {i}: modelul {model} apare de mai multe ori")
+        q_max = citeste_numar(rand["q_max_m3h"], "q_max_m3h", i)
+        if q_max <= 0:
+            raise ValueError(f"Rândul {i}: q_max_m3h trebuie să fie pozitiv")
+        pompe[model] = {
+            "q_max_m3h": q_max,
+            "h": tuple(citeste_numar(rand.get(f"h{j}"), f"h{j}", i) or 0.0 for j in range(3)),
+            "eta": tuple(citeste_numar(rand.get(f"eta{j}"), f"eta{j}", i) or 0.0 for j in range(3)),
+        }
+    return pompe
+
+def inregistreaza_catalog_pompe(pompe: Dict[str, Dict], inlocuieste: bool = False) -> List[str]:
+    """
+    Adaugă pompele în POMPE (modelele existente se suprascriu) și golește cache-ul
+
+    Args:
+        pompe: rezultatul citeste_catalog_pompe
+        inlocuieste: elimină întâi gama existentă (se lucrează doar cu catalogul nou)
+    """
+    global _catalog_pompe
+    with _lock:
+        if inlocuieste:
+            POMPE.clear()
+        POMPE.update(pompe)
+        _catalog_pompe = None
+    return list(pompe)
+
+def incarca_catalog_pompe(cale, inlocuieste: bool = False) -> List[str]:
+    """Încarcă un fișier de pompe (.csv sau .json); întoarce modelele încărcate"""
+    cale = Path(cale)
+    format = "json" if cale.suffix.lower() == ".json" else "csv"
+    return inregistreaza_catalog_pompe(citeste_catalog_pompe(cale.read_text(encoding="utf-8"), format),
+                                       inlocuieste)
+
+# ======================== PUNCT DE FUNCȚIONARE ========================
+
+def curba_retea(debit_calcul_ls: float, pierderi_mca: float, h_static: float) -> Dict[str, float]:
+    """
+    Curba rețelei H = h_static + k·Q² (Q în m³/h)
+
+    Args:
+        debit_calcul_ls: debitul de calcul al ultimului tronson (l/s)
+        pierderi_mca: pierderile liniare și locale la acest debit, (Σ i*L + Σ h_loc) / 1000
+        h_static: înălțimea geodezică plus presiunea de utilizare (mCA)
+    """
+    q = debit_calcul_ls * 3.6
+    return {"h_static": h_static, "k": pierderi_mca / q**2 if q > 0 else 0.0}
+
+def puncte_functionare(pompe: CatalogPompe, h_static: float, k: float,
+                       numar_pompe: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Intersecția curbei rețelei cu fiecare pompă din gamă
+
+    Returns:
+        Vectori pe pompe: debitul total q (m³/h), înălțimea h (mCA),
+        randamentul eta și "valid" (intersecția există, în domeniul curbei)
+    """
+    n = float(numar_pompe)
+    a0, a1, a2 = pompe.h[:, 0], pompe.h[:, 1] / n, pompe.h[:, 2] / n**2
+    # (a2 - k)·Q² + a1·Q + (a0 - h_static) = 0
+    A, B, C = a2 - k, a1, a0 - h_static
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = B * B - 4 * A * C
+        radacina = np.sqrt(np.maximum(delta, 0.0))
+        # A < 0 (curba pompei descrescătoare, rețeaua crescătoare): rădăcina pozitivă
+        q = np.where(A < 0, (-B - radacina) / (2 * A),
+                     np.where(B < 0, -C / B, np.nan))
+    q_pompa = q / n
+    h = h_static + k * q**2
+    eta = pompe.eta[:, 0] + pompe.eta[:, 1] * q_pompa + pompe.eta[:, 2] * q_pompa**2
+    valid = (C > 0) & (delta >= 0) & (q > 0) & (q_pompa <= pompe.q_max) & (eta > 0)
+    return {"q": q, "h": h, "eta": eta, "valid": valid}
+
+@cronometrat
+def selecteaza_pompe(debit_calcul_ls: float, pierderi_mca: float, h_static: float,
+                     numar_pompe: int = 1, volum_anual_m3: Optional[float] = None,
+                     pompe: Optional[CatalogPompe] = None, criteriu: str = "energie",
+                     numar_rezultate: Optional[int] = 20) -> List[Dict]:
+    """
+    Pompele din gamă care pot lucra pe rețea, ordonate după randament sau energie
+
+    Args:
+        debit_calcul_ls: debitul de calcul (l/s)
+        pierderi_mca: pierderile de sarcină la debitul de calcul (mCA)
+        h_static: înălțimea geodezică plus presiunea de utilizare (mCA)
+        numar_pompe: pompe identice în paralel
+        volum_anual_m3: apa pompată pe an; implicit debitul de calcul timp de
+            ORE_FUNCTIONARE_AN ore
+        pompe: gama de pompe (implicit catalog_pompe())
+        criteriu: "energie" (crescător) sau "randament" (descrescător); la
+            egalitate decide celălalt criteriu
+        numar_rezultate: câte pompe se întorc (None = toate)
+
+    Returns:
+        Câte un rând (COLOANE_SELECTIE_POMPE) pe pompă; pompele care acoperă
+        debitul de calcul sunt primele. Energia anuală este ρ·g·H·V / η, deci
+        penalizează și supradimensionarea (H mai mare pe curba rețelei).
+    """
+    if criteriu not in ("randament", "energie"):
+        raise ValueError(f"Criteriu necunoscut: {criteriu}")
+    pompe = catalog_pompe() if pompe is None else pompe
+    retea = curba_retea(debit_calcul_ls, pierderi_mca, h_static)
+    punct = puncte_functionare(pompe, retea["h_static"], retea["k"], numar_pompe)
+    if volum_anual_m3 is None:
+        volum_anual_m3 = debit_calcul_ls * 3.6 * ORE_FUNCTIONARE_AN
+
+    idx = np.flatnonzero(punct["valid"])
+    q, h, eta = punct["q"][idx], punct["h"][idx], punct["eta"][idx]
+    putere_kw = G * (q / 3600) * h / eta  # ρ·g·Q·H / η, kW pentru ρ = 1000
+    energie_kwh = 1000 * G * h * volum_anual_m3 / eta / 3.6e6
+    acopera = q >= debit_calcul_ls * 3.6 * (1 - 1e-9)
+    chei = (energie_kwh, -eta) if criteriu == "randament" else (-eta, energie_kwh)
+    ordine = np.lexsort(chei + (~acopera,))[:numar_rezultate]
+
+    return [
+        {
+            "Model": pompe.modele[idx[j]],
+            "Q (m³/h)": float(q[j]),
+            "H (mCA)": float(h[j]),
+            "η (%)": float(eta[j] * 100),
+            "P (kW)": float(putere_kw[j]),
+            "Energie (kWh/an)": float(energie_kwh[j]),
+            "Q/Qc": float(q[j] / (debit_calcul_ls * 3.6)) if debit_calcul_ls > 0 else float("inf"),
+            "Acoperă": bool(acopera[j]),
+        }
+        for j in ordine
+    ]
@@ -0,0 +1,183 @@
+"""
+Profilarea fiecărei rulări a interfeței (etape și apeluri ale motorului)
+
+Profilul activ se ține într-o ContextVar, deci fiecare sesiune Streamlit
+(rulată pe firul ei) își vede doar propriul profil. Funcțiile motorului
+marcate cu @cronometrat se înregistrează automat sub etapa în care au fost
+apelate; fără un profil activ decoratorul costă o singură citire a
+ContextVar. Apelurile din alte fire sau procese (ex. raportul PDF generat
+în fundal) nu intră în profilul rulării.
+
+    with ProfilRerun() as profil:
+        with etapa("Tabel ARM"):
+            calcul.sincronizeaza(tronsoane)
+        marcaj("Sidebar")          # timpul de la marcajul precedent
+    profil.rezumat()
+
+Opțional, rularea se profilează și cu cProfile, iar profilul se salvează
+pe disc (JSON cu etapele, .prof pentru pstats / snakeviz).
+"""
+
+import cProfile
+import contextvars
+import datetime
+import functools
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+COLOANE_PROFIL = ["Etapă", "ms", "%", "Apeluri"]
+
+_profil_curent: contextvars.ContextVar = contextvars.ContextVar("profil_sanitare", default=None)
+
+# ======================== PROFIL ========================
+
+class ProfilRerun:
+    """
+    Timpii unei rulări: secțiuni (marcaj), etape imbricate și apeluri ale motorului
+
+    Apelurile repetate cu același nume sub același părinte se cumulează într-un
+    singur rând (ex. dimensioneaza_tronsoane apelat în buclă).
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.randuri: List[Dict] = []
+        self._index: Dict[tuple, Dict] = {}
+        self._stiva: List[Dict] = []
+        self._inceput_sectiune = 0
+        self._sectiune = 0
+        self._ultimul_marcaj = 0.0
+        self._token = None
+        self.inceput = 0.0
+        self.durata = 0.0
+        self.moment = None
+
+    def __enter__(self):
+        self.moment = datetime.datetime.now()
+        self.inceput = self._ultimul_marcaj = time.perf_counter()
+        self._token = _profil_curent.set(self)
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.durata = time.perf_counter() - self.inceput
+        _profil_curent.reset(self._token)
+        return False
+
+    def _rand(self, nume: str, nivel: int, parinte: Optional[Dict], pozitie: Optional[int] = None) -> Dict:
+        # Etapele de nivel 1 aparțin secțiunii curente (cea închisă de următorul marcaj)
+        cheie = (id(parinte) if parinte is not None else self._sectiune, nivel, nume)
+        rand = self._index.get(cheie)
+        if rand is None:
+            rand = {"nume": nume, "nivel": nivel, "secunde": 0.0, "apeluri": 0}
+            if pozitie is None:
+                self.randuri.append(rand)
+            else:
+                # Secțiunea se inserează înaintea etapelor care i-au aparținut
+                self.randuri.insert(pozitie, rand)
+            self._index[cheie] = rand
+        return rand
+
+    @contextmanager
+    def etapa(self, nume: str):
+        """Cronometrează blocul ca etapă, imbricată în etapa curentă"""
+        parinte = self._stiva[-1] if self._stiva else None
+        rand = self._rand(nume, parinte["nivel"] + 1 if parinte is not None else 1, parinte)
+        self._stiva.append(rand)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stiva.pop()
+            rand["secunde"] += time.perf_counter() - start
+            rand["apeluri"] += 1
+
+    def marcaj(self, nume: str):
+        """Închide secțiunea curentă: timpul de la marcajul precedent, sub numele dat"""
+        acum = time.perf_counter()
+        rand = self._rand(nume, 0, None, self._inceput_sectiune)
+        rand["secunde"] += acum - self._ultimul_marcaj
+        rand["apeluri"] += 1
+        self._ultimul_marcaj = acum
+        self._inceput_sectiune = len(self.randuri)
+        self._sectiune += 1
+
+    def inregistreaza(self, nume: str, secunde: float):
+        """Adaugă o durată măsurată în altă parte (ex. o lucrare terminată în fundal)"""
+        rand = self._rand(nume, 1, None)
+        rand["secunde"] += secunde
+        rand["apeluri"] += 1
+
+    def rezumat(self) -> List[Dict]:
+        """Rândurile profilului (COLOANE_PROFIL), cu numele indentate după nivel"""
+        total = self.durata or (time.perf_counter() - self.inceput)
+        return [
+            {
+                "Etapă": "\u2003" * rand["nivel"] + rand["nume"],
+                "ms": rand["secunde"] * 1000,
+                "%": 100 * rand["secunde"] / total if total > 0 else 0.0,
+                "Apeluri": rand["apeluri"],
+            }
+            for rand in self.randuri
+        ]
+
+    def salveaza(self, director, sesiune: str) -> Path:
+        """Scrie profilul în director/<sesiune>/<moment>.json (și .prof cu cProfile)"""
+        director = Path(director) / sesiune
+        director.mkdir(parents=True, exist_ok=True)
+        baza = director / self.moment.strftime("%Y%m%d-%H%M%S-%f")
+        with open(baza.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "sesiune": sesiune,
+                "moment": self.moment.isoformat(),
+                "total_ms": self.durata * 1000,
+                "etape": [
+                    {"nume": r["nume"], "nivel": r["nivel"], "ms": r["secunde"] * 1000, "apeluri": r["apeluri"]}
+                    for r in self.randuri
+                ],
+            }, f, ensure_ascii=False, indent=2)
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(baza.with_suffix(".prof"))
+        return baza.with_suffix(".json")
+
+# ======================== FUNCȚII DE MODUL ========================
+
+def profil_curent() -> Optional[ProfilRerun]:
+    return _profil_curent.get()
+
+@contextmanager
+def etapa(nume: str):
+    """Etapă în profilul activ; fără profil activ blocul rulează necronometrat"""
+    profil = _profil_curent.get()
+    if profil is None:
+        yield
+    else:
+        with profil.etapa(nume):
+            yield
+
+def marcaj(nume: str):
+    """Marcaj de secțiune în profilul activ (fără efect dacă nu există)"""
+    profil = _profil_curent.get()
+    if profil is not None:
+        profil.marcaj(nume)
+
+def cronometrat(functie=None, *, nume: Optional[str] = None):
+    """Decorator: apelurile funcției apar ca etape în profilul activ"""
+    if functie is None:
+        return functools.partial(cronometrat, nume=nume)
+    eticheta = nume or functie.__qualname__
+
+    @functools.wraps(functie)
+    def cu_cronometru(*args, **kwargs):
+        profil = _profil_curent.get()
+        if profil is None:
+            return functie(*args, **kwargs)
+        with profil.etapa(eticheta):
+            return functie(*args, **kwargs)
+    return cu_cronometru
@@ -0,0 +1,412 @@
+"""
+Generarea memoriului tehnic în format PDF (necesită reportlab).
+
+Fonturile și stilurile se înregistrează o singură dată pe proces, iar PDF-ul
+finalizat se păstrează într-un cache după amprenta datelor de intrare (și
+data zilei, tipărită pe pagina de titlu). Din interfață raportul se cere cu
+raport_pdf_async, care îl construiește pe un fir separat.
+"""
+
+import io
+import datetime
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from .profilare import cronometrat
+
+# Fonturi TrueType cu diacritice (normal, bold), în ordinea preferinței
+FONTURI_CANDIDATE = [
+    ("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("DejaVuSans", "/usr/share/fonts/TTF/DejaVuSans.ttf", "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+    ("Arial", "/System/Library/Fonts/Supplemental/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf"),
+    ("Arial", "C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+]
+
+RAPOARTE_IN_CACHE = 32
+FIRE_RAPOARTE = 2
+
+_cache_rapoarte: "OrderedDict[str, bytes]" = OrderedDict()
+_in_lucru: dict = {}
+_lock_rapoarte = threading.Lock()
+_executor_rapoarte: ThreadPoolExecutor = None
+
+# ======================== FONTURI ȘI STILURI ========================
+
+@lru_cache(maxsize=None)
+def font_raport() -> str:
+    """Înregistrează (o singură dată pe proces) primul font disponibil; Helvetica dacă nu există niciunul"""
+    for nume, cale_normal, cale_bold in FONTURI_CANDIDATE:
+        if not os.path.exists(cale_normal):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(nume, cale_normal))
+            bold = nume
+            if os.path.exists(cale_bold):
+                bold = f"{nume}-Bold"
+                pdfmetrics.registerFont(TTFont(bold, cale_bold))
+            pdfmetrics.registerFontFamily(nume, normal=nume, bold=bold, italic=nume, boldItalic=bold)
+            return nume
+        except Exception:
+            continue
+    return 'Helvetica'
+
+@lru_cache(maxsize=None)
+def _stiluri_raport() -> dict:
+    font_name = font_raport()
+    styles = getSampleStyleSheet()
+    
+    # Stiluri personalizate
+    style_title = ParagraphStyle(
+        'CustomTitle', 
+        parent=styles['Heading1'], 
+        fontName=font_name,
+        alignment=1, 
+        spaceAfter=30,
+        fontSize=18,
+        textColor=colors.black
+    )
+    
+    style_heading1 = ParagraphStyle(
+        'CustomHeading1', 
+        parent=styles['Heading1'],
+        fontName=font_name,
+        spaceBefore=20, 
+        spaceAfter=15,
+        fontSize=14,
+        textColor=colors.black,
+        keepWithNext=True
+    )
+    
+    style_heading2 = ParagraphStyle(
+        'CustomHeading2', 
+        parent=styles['Heading2'],
+        fontName=font_name,
+        spaceBefore=15, 
+        spaceAfter=10,
+        fontSize=12,
+        textColor=colors.black,
+        keepWithNext=True
+    )
+    
+    style_normal = ParagraphStyle(
+        'CustomNormal', 
+        parent=styles['Normal'],
+        fontName=font_name,
+        spaceAfter=10,
+        leading=14,
+        alignment=4,  # Justify
+        fontSize=10
+    )
+    
+    style_list = ParagraphStyle(
+        'CustomList',
+        parent=style_normal,
+        leftIndent=20,
+        bulletIndent=10
+    )
+    
+    return {
+        'title': style_title,
+        'heading1': style_heading1,
+        'heading2': style_heading2,
+        'normal': style_normal,
+        'list': style_list,
+    }
+
+# ======================== FUNCȚII RAPOARTE ========================
+@cronometrat
+def create_pdf_report(data: dict):
+    """Generează raportul PDF detaliat - Memoriu Tehnic Extins"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, 
+                          rightMargin=2*cm, leftMargin=2.5*cm, 
+                          topMargin=2*cm, bottomMargin=2*cm)
+    
+    font_name = font_raport()
+    stiluri = _stiluri_raport()
+    style_title = stiluri['title']
+    style_heading1 = stiluri['heading1']
+    style_heading2 = stiluri['heading2']
+    style_normal = stiluri['normal']
+    style_list = stiluri['list']
+    
+    story = []
+    
+    # --- PAGINA DE TITLU ---
+    story.append(Spacer(1, 5*cm))
+    story.append(Paragraph("MEMORIU TEHNIC", style_title))
+    story.append(Paragraph("INSTALAȚII SANITARE INTERIOARE", style_title))
+    story.append(Paragraph("ALIMENTARE CU APĂ", style_title))
+    story.append(Spacer(1, 8*cm))
+    story.append(Paragraph(f"Data elaborării: {datetime.datetime.now().strftime('%d.%m.%Y')}", style_normal))
+    story.append(PageBreak())
+    
+    # --- CAPITOLUL 1: DATE GENERALE ---
+    story.append(Paragraph("1. DATE GENERALE", style_heading1))
+    
+    story.append(Paragraph("1.1. Obiectul proiectului", style_heading2))
+    text_obiect = """Prezenta documentație tratează proiectarea instalațiilor sanitare interioare de alimentare cu apă rece și apă caldă de consum pentru obiectivul analizat. Soluțiile tehnice adoptate au ca scop asigurarea confortului utilizatorilor, siguranța în exploatare și optimizarea consumurilor energetice."""
+    story.append(Paragraph(text_obiect, style_normal))
+    
+    story.append(Paragraph("1.2. Baze de proiectare", style_heading2))
+    story.append(Paragraph("La baza elaborării prezentului proiect au stat următoarele:", style_normal))
+    normative = [
+        "• Tema de proiectare stabilită de beneficiar;",
+        "• Planurile de arhitectură ale clădirii;",
+        "• Normativ I9-2022 - Normativ pentru proiectarea, executarea și exploatarea instalațiilor sanitare;",
+        "• SR 1343-1:2006 - Alimentări cu apă. Determinarea cantităților de apă potabilă pentru localități urbane și rurale;",
+        "• NP 084-2003 - Normativ privind proiectarea, executarea și exploatarea instalațiilor sanitare aferente clădirilor;",
+        "• Legea 10/1995 privind calitatea în construcții, cu modificările și completările ulterioare;",
+        "• P118-99 - Normativ de siguranță la foc a construcțiilor."
+    ]
+    for n in normative:
+        story.append(Paragraph(n, style_list))
+        
+    story.append(Paragraph("1.3. Caracteristicile amplasamentului", style_heading2))
+    info_gen = f"""
+    Clădirea analizată are funcțiunea de <b>{data.get('destinatie', 'Locuință')}</b>.
+    Sursa de apă: Rețeaua publică de distribuție / Sursă proprie.
+    Regimul de presiune disponibil asigură funcționarea normală a instalației, fiind prevăzută (după caz) o stație de pompare hidropneumatică.
+    """
+    story.append(Paragraph(info_gen, style_normal))
+    
+    # --- CAPITOLUL 2: DESCRIEREA INSTALAȚIILOR ---
+    story.append(Paragraph("2. DESCRIEREA TEHNICĂ A INSTALAȚIILOR", style_heading1))
+    
+    story.append(Paragraph("2.1. Alimentarea cu apă rece", style_heading2))
+    descriere_apa = f"""
+    Instalația de alimentare cu apă rece este realizată în sistem ramificat/inelar, dimensionată pentru a asigura debitele și presiunile necesare la punctele de consum cele mai dezavantajate.
+    Conductele de distribuție sunt realizate din <b>{data.get('material', 'N/A')}</b>, material ales pentru rezistența sa la coroziune, depuneri și presiune.
+    Traseele conductelor sunt pozate mascat (în ghene, șape, pereți falși) sau aparent, conform planurilor de arhitectură.
+    """
+    story.append(Paragraph(descriere_apa, style_normal))
+    
+    story.append(Paragraph("2.2. Izolații termice", style_heading2))
+    text_izolatii = """
+    Conductele de distribuție a apei reci se vor izola termic pentru a preveni formarea condensului și încălzirea apei. Izolația va fi de tip elastomer sau polietilenă expandată, cu grosimea minimă de 9-13 mm, în funcție de diametrul conductei și condițiile de montaj.
+    """
+    story.append(Paragraph(text_izolatii, style_normal))
+
+    # --- CAPITOLUL 3: BREVIAR DE CALCUL ---
+    story.append(Paragraph("3. BREVIAR DE CALCUL HIDRAULIC", style_heading1))
+    
+    story.append(Paragraph("3.1. Metodologia de calcul", style_heading2))
+    metodologie = """
+    Dimensionarea conductelor s-a efectuat conform SR 1343-1:2006. Debitul de calcul (qc) s-a determinat probabilistic în funcție de numărul de unități de consum și tipul clădirii.
+    
+    Relațiile de calcul utilizate:
+    """
+    story.append(Paragraph(metodologie, style_normal))
+    
+    formule = [
+        "• Debitul de calcul: qc = a * sqrt(E) [l/s] sau qc = c * sqrt(E) [l/s]",
+        "• Pierderea de sarcină liniară (Darcy-Weisbach): hd = λ * (L/D) * (v²/2g)",
+        "• Coeficientul de frecare (λ): Formula Colebrook-White",
+        "• Pierderea de sarcină locală: hl = Σζ * (v²/2g)",
+        "• Presiunea necesară la branșament: Hnec = Hg + Σhd + Σhl + Hu"
+    ]
+    for f in formule:
+        story.append(Paragraph(f, style_list))
+        
+    story.append(Paragraph("3.2. Parametri de calcul considerați", style_heading2))
+    params = f"""
+    • Temperatura apei reci: {data.get('temperatura', '10')} °C
+    • Presiunea minimă de utilizare la cel mai dezavantajat consumator: 15 mCA (1.5 bar)
+    • Viteze maxime admise: conform normativului I9-2022 (2.0 - 3.0 m/s în funcție de material și amplasare)
+    """
+    story.append(Paragraph(params, style_normal))
+    
+    # --- CAPITOLUL 4: REZULTATELE DIMENSIONĂRII ---
+    story.append(PageBreak())
+    story.append(Paragraph("4. TABEL CENTRALIZATOR DE DIMENSIONARE", style_heading1))
+    
+    if 'rezultate_arm' in data:
+        df = data['rezultate_arm']
+        
+        # Header tabel
+        table_data = [[
+            'Tronson', 
+            'Debit\n(l/s)', 
+            'DN\n(mm)', 
+            'Viteză\n(m/s)', 
+            'L\n(m)', 
+            'ΔH lin\n(mCA)', 
+            'ΔH loc\n(mCA)', 
+            'ΔH tot\n(mCA)'
+        ]]
+        
+        # Date tabel
+        for _, row in df.iterrows():
+            table_data.append([
+                str(row['Tronson']),
+                f"{row['Vc']:.3f}",
+                str(row['DN']),
+                f"{row['v']:.2f}",
+                f"{row['L']:.1f}",
+                f"{row['Σ i*L']:.2f}",
+                f"{row['Σ h_loc']:.2f}",
+                f"{row['h_tot']:.2f}"
+            ])
+            
+        # Stil tabel
+        t = Table(table_data, colWidths=[1.5*cm, 2*cm, 2*cm, 2*cm, 1.5*cm, 2*cm, 2*cm, 2*cm])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), font_name),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ]))
+        story.append(t)
+        
+        story.append(Spacer(1, 15))
+        
+        # Rezultate finale evidențiate
+        story.append(Paragraph("REZULTATE FINALE ȘI NECESAR DE PRESIUNE", style_heading2))
+        
+        final_stats = [
+            f"Debit total de calcul (Qc): {data.get('debit_total', 0):.3f} l/s",
+            f"Pierdere de sarcină totală pe traseu: {data.get('presiune_totala', 0):.2f} mCA",
+            "Presiune de utilizare necesară: 15.00 mCA",
+            f"Presiune totală necesară la branșament (Hnec): {data.get('presiune_totala', 0) + 15.0:.2f} mCA"
+        ]
+        
+        for stat in final_stats:
+            story.append(Paragraph(f"• <b>{stat}</b>", style_normal))
+
+    # --- CAPITOLUL 5: INSTRUCȚIUNI DE EXECUȚIE ȘI MONTAJ ---
+    story.append(PageBreak())
+    story.append(Paragraph("5. CAIET DE SARCINI - INSTRUCȚIUNI DE EXECUȚIE", style_heading1))
+    
+    instructiuni = [
+        "Execuția instalațiilor se va face numai de către personal calificat și autorizat.",
+        "La montajul conductelor se vor respecta instrucțiunile producătorului privind tăierea, îmbinarea și fixarea acestora.",
+        "Se vor prevedea puncte fixe și puncte de alunecare pentru preluarea dilatărilor termice.",
+        "Trecerea conductelor prin pereți și planșee se va face prin tuburi de protecție.",
+        "Distanța dintre elementele de susținere va respecta normativul I9-2022, în funcție de diametrul și materialul conductei.",
+        "După montaj, instalația se va spăla cu apă potabilă până la limpezire."
+    ]
+    
+    for instr in instructiuni:
+        story.append(Paragraph(f"• {instr}", style_list))
+        
+    story.append(Paragraph("5.1. Proba de presiune", style_heading2))
+    proba = """
+    Instalația se va supune probei de presiune la rece. Presiunea de probă va fi de 1.5 x Presiunea de regim, dar nu mai puțin de 6 bar.
+    Durata probei va fi de minim 2 ore. Pe durata probei nu se admit scurgeri sau deformări ale elementelor instalației.
+    Rezultatele probei se vor consemna într-un Proces Verbal de Probe.
+    """
+    story.append(Paragraph(proba, style_normal))
+    
+    # --- CAPITOLUL 6: EXPLOATARE ȘI ÎNTREȚINERE ---
+    story.append(Paragraph("6. EXPLOATARE ȘI ÎNTREȚINERE", style_heading1))
+    mentenanta = """
+    Beneficiarul are obligația de a asigura verificarea periodică a etanșeității instalației și a bunei funcționări a armăturilor.
+    Se recomandă:
+    """
+    story.append(Paragraph(mentenanta, style_normal))
+    
+    recomandari = [
+        "Verificarea vizuală lunară a traseelor aparente;",
+        "Manevrarea robineților de închidere cel puțin o dată la 6 luni pentru a preveni blocarea;",
+        "Curățarea filtrelor Y și a aeratoarelor bateriilor trimestrial;",
+        "Verificarea presiunii în vasul de expansiune al hidroforului (dacă există) semestrial."
+    ]
+    for rec in recomandari:
+        story.append(Paragraph(f"- {rec}", style_list))
+        
+    # --- CAPITOLUL 7: MĂSURI DE SSM ȘI PSI ---
+    story.append(Paragraph("7. MĂSURI DE SĂNĂTATE ȘI SECURITATE ÎN MUNCĂ", style_heading1))
+    ssm = """
+    La execuția lucrărilor se vor respecta normele generale de protecție a muncii și normele specifice pentru lucrări de instalații tehnico-sanitare.
+    Personalul va fi dotat cu echipament de protecție adecvat (salopetă, cască, mănuși, încălțăminte de protecție).
+    Se vor respecta normele de prevenire și stingere a incendiilor specifice șantierelor de construcții.
+    """
+    story.append(Paragraph(ssm, style_normal))
+    
+    # Final
+    story.append(Spacer(1, 2*cm))
+    story.append(Paragraph("Întocmit,", style_normal))
+    story.append(Paragraph("Inginer Proiectant", style_normal))
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+# ======================== CACHE ȘI GENERARE ÎN FUNDAL ========================
+
+def cheie_raport(data: dict) -> str:
+    """Amprenta SHA-256 a datelor raportului (tabelele intră prin conținutul lor CSV)"""
+    h = hashlib.sha256(datetime.date.today().isoformat().encode())
+    for cheie in sorted(data):
+        valoare = data[cheie]
+        h.update(str(cheie).encode())
+        if hasattr(valoare, "to_csv"):
+            h.update(valoare.to_csv(index=False).encode())
+        else:
+            h.update(repr(valoare).encode())
+    return h.hexdigest()
+
+def genereaza_raport_pdf(data: dict, cheie: str = None) -> bytes:
+    """Conținutul PDF pentru data; din cache dacă aceleași date au mai fost generate"""
+    cheie = cheie or cheie_raport(data)
+    with _lock_rapoarte:
+        if cheie in _cache_rapoarte:
+            _cache_rapoarte.move_to_end(cheie)
+            return _cache_rapoarte[cheie]
+    continut = create_pdf_report(data).getvalue()
+    with _lock_rapoarte:
+        _cache_rapoarte[cheie] = continut
+        while len(_cache_rapoarte) > RAPOARTE_IN_CACHE:
+            _cache_rapoarte.popitem(last=False)
+    return continut
+
+def raport_pdf_async(data: dict) -> Future:
+    """
+    Pornește generarea raportului pe un fir de lucru și întoarce un Future cu bytes
+
+    Un raport aflat în cache se întoarce imediat ca Future terminat, iar cereri
+    identice simultane (aceeași amprentă) împart aceeași generare.
+    """
+    global _executor_rapoarte
+    cheie = cheie_raport(data)
+    with _lock_rapoarte:
+        if cheie in _cache_rapoarte:
+            _cache_rapoarte.move_to_end(cheie)
+            gata = Future()
+            gata.set_result(_cache_rapoarte[cheie])
+            return gata
+        if cheie in _in_lucru:
+            return _in_lucru[cheie]
+        if _executor_rapoarte is None:
+            _executor_rapoarte = ThreadPoolExecutor(max_workers=FIRE_RAPOARTE, thread_name_prefix="raport-pdf")
+        start = time.perf_counter()
+        viitor = _executor_rapoarte.submit(genereaza_raport_pdf, data, cheie)
+        _in_lucru[cheie] = viitor
+
+    def _terminat(_):
+        # Durata de la cerere până la PDF (inclusiv așteptarea unui fir liber)
+        viitor.durata_s = time.perf_counter() - start
+        with _lock_rapoarte:
+            _in_lucru.pop(cheie, None)
+
+    viitor.add_done_callback(_terminat)
+    return viitor
@@ -0,0 +1,405 @@
+"""
+Bucla de recirculare ACM: pierderi de căldură, repartiția debitelor pe coloane, pompa
+
+Schema: conducta de distribuție pleacă de la preparator și alimentează pe rând
+coloanele 1..n; fiecare coloană urcă (tur), se leagă la capăt de coloana de
+recirculare (retur), care coboară printr-o vană de echilibrare în conducta de
+retur, paralelă cu distribuția, până la preparator. Tronsonul de distribuție
+j (dintre coloana j-1 și j) transportă debitul coloanelor j..n, la dus și la
+întors.
+
+Pe o conductă cu debitul masic m, temperatura scade exponențial spre
+temperatura mediului:
+
+    T_ieșire = T_amb + (T_intrare - T_amb) · exp(-U·L / (m·c_p))
+
+unde U (W/m·K) depinde de diametrul exterior și de izolație. Pe distribuție
+exponenții se cumulează (cumsum), iar amestecul din nodurile de retur este o
+recurență liniară, rezolvată tot vectorial; o evaluare termică a întregii
+bucle nu are nicio buclă Python pe coloane.
+
+    dimensioneaza()   debitele pe coloane astfel încât apa să nu coboare
+                      nicăieri sub temperatura_minima (legionella), DN-urile
+                      de retur după viteza maximă, setările kv ale vanelor și
+                      punctul de funcționare al pompei; debitele, temperaturile
+                      și DN-urile se iterează până la convergență
+    analizeaza(kv)    pentru setări date ale vanelor și pompă dată: repartiția
+                      debitelor (Newton pe debitele coloanelor, cu λ și
+                      viscozitatea la temperaturile curente) și temperaturile;
+                      câteva milisecunde pentru zeci de coloane, deci vanele
+                      se pot regla interactiv
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+from .catalog import diametre_material
+from .date import G, MATERIALE_CONDUCTE
+from .frecare import MODEL_FRECARE_IMPLICIT, factor_frecare, viscozitate_cinematica_apa
+from .profilare import cronometrat
+
+CP_APA = 4186.0  # J/(kg·K)
+DENSITATE_APA_CALDA = 983.0  # kg/m³, la 60 °C
+TEMPERATURA_PLECARE = 60.0  # °C la ieșirea din preparator
+TEMPERATURA_MINIMA_RETUR = 55.0  # °C în orice punct al buclei (legionella)
+CONDUCTIVITATE_IZOLATIE = 0.035  # W/(m·K), spumă elastomerică / vată minerală
+COEFICIENT_EXTERIOR = 10.0  # W/(m²·K), convecție naturală + radiație
+VITEZA_MAXIMA_RECIRCULARE = 0.5  # m/s pe conductele de retur
+PIERDERE_MINIMA_VANA = 0.2  # mCA pe vana coloanei dezavantajate
+RANDAMENT_POMPA_RECIRCULARE = 0.25  # circulatoare mici
+TOLERANTA_RECIRCULARE = 1e-8  # corecția relativă maximă a debitelor la convergență
+ITERATII_MAX = 100
+ITERATII_DN_LIBERE = 10  # iterații în care DN-urile de retur se pot și micșora
+
+# ======================== PIERDERI DE CĂLDURĂ ========================
+
+def diametru_exterior_mm(dn, d_int_mm) -> np.ndarray:
+    """
+    Diametrul exterior aproximativ: la plastice DN este chiar diametrul
+    exterior, la metale DN este apropiat de cel interior (perete ~15%)
+    """
+    return np.maximum(np.asarray(dn, dtype=float), 1.15 * np.asarray(d_int_mm, dtype=float))
+
+def pierdere_termica_liniara(d_ext_mm, grosime_izolatie_mm,
+                             conductivitate: float = CONDUCTIVITATE_IZOLATIE,
+                             coeficient_exterior: float = COEFICIENT_EXTERIOR) -> np.ndarray:
+    """
+    Coeficientul de pierdere U al conductei, în W pe metru și pe kelvin
+
+    1/U = ln(d_iz / d_ext) / (2π λ_iz) + 1 / (π d_iz h_ext); rezistențele
+    apei și peretelui sunt neglijabile față de izolație și stratul exterior.
+    """
+    d_ext = np.asarray(d_ext_mm, dtype=float) / 1000
+    d_iz = d_ext + 2 * np.asarray(grosime_izolatie_mm, dtype=float) / 1000
+    rezistenta = np.log(d_iz / d_ext) / (2 * math.pi * conductivitate) + 1 / (math.pi * d_iz * coeficient_exterior)
+    return 1 / rezistenta
+
+# ======================== BUCLA DE RECIRCULARE ========================
+
+class BuclaRecirculare:
+    """
+    Distribuția, coloanele și returul unei instalații ACM cu recirculare
+
+    Toți vectorii au câte un element pe coloană, în ordinea de pe distribuție
+    (coloana 1 este cea mai apropiată de preparator).
+    """
+
+    def __init__(self, material: str, lungimi_coloane, dn_coloane, lungimi_distributie, dn_distributie,
+                 izolatie_coloane_mm=20.0, izolatie_distributie_mm=30.0,
+                 temperatura_coloane: float = 20.0, temperatura_distributie: float = 15.0,
+                 zeta_coloane=6.0, zeta_distributie=1.0, dn_retur_coloane=None, dn_retur_distributie=None,
+                 model_frecare: str = MODEL_FRECARE_IMPLICIT):
+        """
+        Args:
+            material: cheie din MATERIALE_CONDUCTE (tur și retur)
+            lungimi_coloane: lungimea fiecărei coloane (m); returul are aceeași lungime
+            dn_coloane: DN-ul coloanelor de tur (ex. din dimensionarea ACM)
+            lungimi_distributie: lungimea tronsonului de distribuție dinaintea fiecărei coloane (m)
+            dn_distributie: DN-ul tronsoanelor de distribuție (tur)
+            izolatie_coloane_mm, izolatie_distributie_mm: grosimea izolației (0 = neizolat)
+            temperatura_coloane: temperatura aerului din ghene (°C)
+            temperatura_distributie: temperatura aerului pe traseul distribuției (°C, ex. subsol)
+            zeta_coloane: Σζ pe circuitul unei coloane (tur + retur, fără vană)
+            zeta_distributie: Σζ pe fiecare tronson de distribuție (tur și retur, fiecare)
+            dn_retur_coloane, dn_retur_distributie: DN-urile de retur; None = se
+                aleg la dimensionare, după VITEZA_MAXIMA_RECIRCULARE
+        """
+        self.material = material
+        self.model_frecare = model_frecare
+        self.diametre = diametre_material(MATERIALE_CONDUCTE[material])
+        self.L_c = np.atleast_1d(np.asarray(lungimi_coloane, dtype=float))
+        n = len(self.L_c)
+        if n == 0:
+            raise ValueError("Bucla trebuie să aibă cel puțin o coloană")
+
+        def vector(valori):
+            return np.broadcast_to(np.asarray(valori, dtype=float), (n,)).copy()
+
+        self.L_d = vector(lungimi_distributie)
+        self.dn_c = vector(dn_coloane).astype(int)
+        self.dn_d = vector(dn_distributie).astype(int)
+        self.izolatie_c = vector(izolatie_coloane_mm)
+        self.izolatie_d = vector(izolatie_distributie_mm)
+        self.T_amb_c = float(temperatura_coloane)
+        self.T_amb_d = float(temperatura_distributie)
+        self.zeta_c = vector(zeta_coloane)
+        self.zeta_d = vector(zeta_distributie)
+        self.dn_rc = None if dn_retur_coloane is None else vector(dn_retur_coloane).astype(int)
+        self.dn_rd = None if dn_retur_distributie is None else vector(dn_retur_distributie).astype(int)
+
+        self.d_c = self._d_int(self.dn_c)
+        self.d_d = self._d_int(self.dn_d)
+        self.U_c = pierdere_termica_liniara(diametru_exterior_mm(self.dn_c, self.d_c), self.izolatie_c)
+        self.U_d = pierdere_termica_liniara(diametru_exterior_mm(self.dn_d, self.d_d), self.izolatie_d)
+
+    def __len__(self):
+        return len(self.L_c)
+
+    def _d_int(self, dn: np.ndarray) -> np.ndarray:
+        idx = np.searchsorted(self.diametre.dn_np, dn)
+        idx = np.minimum(idx, len(self.diametre.dn_np) - 1)
+        if np.any(self.diametre.dn_np[idx] != dn):
+            raise ValueError(f"DN inexistent în catalogul materialului {self.material}")
+        return self.diametre.d_int_np[idx]
+
+    def _dn_dupa_viteza(self, debite_m3s: np.ndarray, viteza_maxima: float) -> np.ndarray:
+        d_min = np.sqrt(4 * debite_m3s / (math.pi * viteza_maxima)) * 1000
+        idx = np.searchsorted(self.diametre.d_int_cumulat_np, d_min, side="left")
+        return self.diametre.dn_np[np.minimum(idx, self.diametre.idx_dn_max)]
+
+    def _retur(self, dn_rc: np.ndarray, dn_rd: np.ndarray):
+        """Diametrele interioare și coeficienții U ai conductelor de retur"""
+        d_rc, d_rd = self._d_int(dn_rc), self._d_int(dn_rd)
+        U_rc = pierdere_termica_liniara(diametru_exterior_mm(dn_rc, d_rc), self.izolatie_c)
+        U_rd = pierdere_termica_liniara(diametru_exterior_mm(dn_rd, d_rd), self.izolatie_d)
+        return d_rc, d_rd, U_rc, U_rd
+
+    # -------- Termic (vectorial) --------
+
+    def _temperaturi(self, m: np.ndarray, T_plecare: float, U_rc: np.ndarray, U_rd: np.ndarray,
+                     T_iesire: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Temperaturile buclei pentru debitele masice m (kg/s) ale coloanelor
+
+        Cu T_iesire dat (dimensionare), temperatura de la vana fiecărei coloane
+        este impusă și se întoarce debitul necesar "m_necesar"; altfel se
+        calculează din debitele m.
+        """
+        M = np.cumsum(m[::-1])[::-1]  # debitul pe tronsonul de distribuție j: coloanele j..n
+        # Tur distribuție: exponenții se cumulează de la preparator spre coloana n
+        exp_d = np.exp(-np.cumsum(self.U_d * self.L_d / (M * CP_APA)))
+        T_baza = self.T_amb_d + (T_plecare - self.T_amb_d) * exp_d
+
+        # Coloana (tur + retur, în serie, la aceeași temperatură a ghenei)
+        UL_coloana = (self.U_c + U_rc) * self.L_c
+        x_baza = T_baza - self.T_amb_c
+        rezultat = {"T_baza": T_baza}
+        if T_iesire is not None:
+            raport = np.maximum(x_baza / (T_iesire - self.T_amb_c), 1 + 1e-12)
+            rezultat["m_necesar"] = UL_coloana / (CP_APA * np.log(raport))
+            rezultat["fezabil"] = bool(np.all(x_baza > T_iesire - self.T_amb_c))
+        else:
+            T_iesire = self.T_amb_c + x_baza * np.exp(-UL_coloana / (m * CP_APA))
+        # Vârful coloanei: după turul coloanei
+        rezultat["T_varf"] = self.T_amb_c + x_baza * np.exp(-self.U_c * self.L_c / (m * CP_APA))
+        rezultat["T_iesire"] = np.broadcast_to(T_iesire, m.shape).astype(float)
+
+        # Retur distribuție: y_j = a_j y_(j+1) + b_j (amestec în nodul j, apoi tronsonul j)
+        e_r = np.exp(-U_rd * self.L_d / (M * CP_APA))
+        b = m * (rezultat["T_iesire"] - self.T_amb_d) / M
+        a = np.append(M[1:] * e_r[1:] / M[:-1], 0.0)
+        c = np.concatenate([[1.0], np.cumprod(a[:-1])])
+        y = np.cumsum((c * b)[::-1])[::-1] / c
+        rezultat["T_nod_retur"] = self.T_amb_d + y
+        rezultat["T_retur_preparator"] = float(self.T_amb_d + e_r[0] * y[0])
+        rezultat["flux_caldura_W"] = float(M[0] * CP_APA * (T_plecare - rezultat["T_retur_preparator"]))
+        rezultat["T_minima"] = float(min(rezultat["T_iesire"].min(), rezultat["T_retur_preparator"]))
+        return rezultat
+
+    # -------- Hidraulic (vectorial) --------
+
+    def _pierderi(self, Q: np.ndarray, d_mm: np.ndarray, L: np.ndarray, zeta: np.ndarray,
+                  T: np.ndarray):
+        """Pierderea de sarcină (m) și derivata ei după Q (m³/s), cu variația lui λ cu Re"""
+        d = d_mm / 1000
+        v = Q / (math.pi * d**2 / 4)
+        re = v * d / viscozitate_cinematica_apa(T)
+        rr = self.diametre.rugozitate_mm / d_mm
+        lam = factor_frecare(re, rr, self.model_frecare)
+        # Exponentul local al lui λ(Re), din diferența finită: laminar -1, turbulent neted ~ -0.25
+        lam_2 = factor_frecare(re * 1.0001, rr, self.model_frecare)
+        beta = np.log(lam_2 / lam) / math.log(1.0001)
+        termen = v**2 / (2 * G)
+        h_frecare = lam * L / d * termen
+        h_local = zeta * termen
+        derivata = ((2 + beta) * h_frecare + 2 * h_local) / Q
+        return h_frecare + h_local, derivata
+
+    def _hidraulica(self, Q: np.ndarray, temperaturi: Dict[str, np.ndarray], T_plecare: float,
+                    d_rc: np.ndarray, d_rd: np.ndarray):
+        """
+        Pierderea pe traseul fiecărei coloane (fără vană) și derivatele pe conducte
+
+        Traseul coloanei i: tur și retur distribuție 1..i, tur și retur coloană i.
+        """
+        QD = np.cumsum(Q[::-1])[::-1]
+        T_baza = temperaturi["T_baza"]
+        T_intrare_d = np.concatenate([[T_plecare], T_baza[:-1]])
+        h_td, dh_td = self._pierderi(QD, self.d_d, self.L_d, self.zeta_d, (T_intrare_d + T_baza) / 2)
+        h_rd, dh_rd = self._pierderi(QD, d_rd, self.L_d, self.zeta_d, temperaturi["T_nod_retur"])
+        T_coloana = (T_baza + temperaturi["T_iesire"]) / 2
+        h_c, dh_c = self._pierderi(np.tile(Q, 2), np.concatenate([self.d_c, d_rc]),
+                                   np.tile(self.L_c, 2), np.tile(self.zeta_c / 2, 2), np.tile(T_coloana, 2))
+        n = len(Q)
+        h_coloana = h_c[:n] + h_c[n:]
+        traseu = np.cumsum(h_td + h_rd) + h_coloana
+        return traseu, dh_td + dh_rd, dh_c[:n] + dh_c[n:]
+
+    # -------- Dimensionare --------
+
+    @cronometrat
+    def dimensioneaza(self, temperatura_plecare: float = TEMPERATURA_PLECARE,
+                      temperatura_minima: float = TEMPERATURA_MINIMA_RETUR,
+                      viteza_maxima: float = VITEZA_MAXIMA_RECIRCULARE,
+                      pierdere_minima_vana: float = PIERDERE_MINIMA_VANA,
+                      toleranta: float = TOLERANTA_RECIRCULARE, iteratii_max: int = ITERATII_MAX) -> Dict:
+        """
+        Debitele de recirculare, DN-urile de retur, vanele și pompa
+
+        Toate coloanele se echilibrează la aceeași temperatură la vană, aleasă
+        astfel încât apa care ajunge înapoi la preparator să aibă exact
+        temperatura_minima. Debitele depind de temperaturile de la baza
+        coloanelor, acestea de debitele pe distribuție, iar DN-urile de retur
+        (și pierderile lor de căldură) de debite, deci totul se iterează
+        până la punct fix.
+
+        Returns:
+            Dicționar cu vectori pe coloane ("debit_lh", "T_baza", "T_varf",
+            "T_iesire", "dn_retur_coloane", "dn_retur_distributie", "kv_vane",
+            "pierdere_vane_m"), punctul pompei ("debit_pompa_m3h",
+            "inaltime_pompa_m", "putere_estimata_W"), fluxul de căldură,
+            temperatura la preparator, "iteratii", "convergent" și "fezabil"
+        """
+        if temperatura_plecare <= temperatura_minima:
+            raise ValueError("Temperatura de plecare trebuie să fie peste temperatura minimă de retur")
+        if temperatura_minima <= max(self.T_amb_c, self.T_amb_d):
+            raise ValueError("Temperatura minimă de retur trebuie să fie peste temperatura mediului")
+
+        n = len(self)
+        dn_rc = self.dn_rc if self.dn_rc is not None else np.full(n, self.diametre.dn_np[0])
+        dn_rd = self.dn_rd if self.dn_rd is not None else np.full(n, self.diametre.dn_np[0])
+        T_iesire = temperatura_minima
+        m = np.full(n, 0.01)
+        convergent = False
+        for iteratie in range(1, iteratii_max + 1):
+            d_rc, d_rd, U_rc, U_rd = self._retur(dn_rc, dn_rd)
+            temperaturi = self._temperaturi(m, temperatura_plecare, U_rc, U_rd, T_iesire)
+            m_nou = temperaturi["m_necesar"]
+            fezabil = temperaturi["fezabil"]
+            # Returul distribuției răcește amestecul: vanele se echilibrează mai sus cu diferența
+            T_iesire_nou = max(temperatura_minima,
+                               T_iesire + temperatura_minima - temperaturi["T_retur_preparator"])
+            # După primele ITERATII_DN_LIBERE, DN-urile de retur doar cresc: la limita
+            # dintre două DN-uri debitele ar oscila altfel între ele (conducta mai
+            # mare pierde mai multă căldură, deci cere mai mult debit)
+            dn_rc_nou, dn_rd_nou = dn_rc, dn_rd
+            if self.dn_rc is None:
+                dn_rc_nou = self._dn_dupa_viteza(m_nou / DENSITATE_APA_CALDA, viteza_maxima)
+            if self.dn_rd is None:
+                dn_rd_nou = self._dn_dupa_viteza(np.cumsum(m_nou[::-1])[::-1] / DENSITATE_APA_CALDA, viteza_maxima)
+            if iteratie > ITERATII_DN_LIBERE:
+                dn_rc_nou, dn_rd_nou = np.maximum(dn_rc, dn_rc_nou), np.maximum(dn_rd, dn_rd_nou)
+            corectie = np.max(np.abs(m_nou - m) / m_nou)
+            stabil = (np.array_equal(dn_rc_nou, dn_rc) and np.array_equal(dn_rd_nou, dn_rd)
+                      and abs(T_iesire_nou - T_iesire) <= toleranta * temperatura_minima)
+            m, T_iesire, dn_rc, dn_rd = m_nou, T_iesire_nou, dn_rc_nou, dn_rd_nou
+            if corectie <= toleranta and stabil:
+                convergent = True
+                break
+
+        d_rc, d_rd, U_rc, U_rd = self._retur(dn_rc, dn_rd)
+        temperaturi = self._temperaturi(m, temperatura_plecare, U_rc, U_rd)
+        Q = m / DENSITATE_APA_CALDA
+        traseu, _, _ = self._hidraulica(Q, temperaturi, temperatura_plecare, d_rc, d_rd)
+        inaltime = float(traseu.max() + pierdere_minima_vana)
+        pierdere_vane = inaltime - traseu
+        # Δp (bar) = (Q / kv)², Q în m³/h
+        kv = Q * 3600 / np.sqrt(pierdere_vane * DENSITATE_APA_CALDA * G / 1e5)
+        debit_pompa = float(Q.sum())
+
+        # Bucla nu reține DN-urile alese: o nouă dimensionare pornește tot de la zero
+        return {
+            "debit_lh": Q * 3.6e6,
+            "T_baza": temperaturi["T_baza"],
+            "T_varf": temperaturi["T_varf"],
+            "T_iesire": temperaturi["T_iesire"],
+            "T_retur_preparator": temperaturi["T_retur_preparator"],
+            "T_minima": temperaturi["T_minima"],
+            "flux_caldura_W": temperaturi["flux_caldura_W"],
+            "dn_retur_coloane": dn_rc,
+            "dn_retur_distributie": dn_rd,
+            "kv_vane": kv,
+            "pierdere_vane_m": pierdere_vane,
+            "debit_pompa_m3h": debit_pompa * 3600,
+            "inaltime_pompa_m": inaltime,
+            "putere_estimata_W": DENSITATE_APA_CALDA * G * debit_pompa * inaltime / RANDAMENT_POMPA_RECIRCULARE,
+            "iteratii": iteratie,
+            "convergent": convergent,
+            "fezabil": fezabil,
+        }
+
+    # -------- Analiză pentru vane date --------
+
+    @cronometrat
+    def analizeaza(self, kv_vane, inaltime_pompa: float, panta_pompa: float = 0.0,
+                   dn_retur_coloane=None, dn_retur_distributie=None,
+                   temperatura_plecare: float = TEMPERATURA_PLECARE,
+                   temperatura_minima: float = TEMPERATURA_MINIMA_RETUR,
+                   toleranta: float = TOLERANTA_RECIRCULARE, iteratii_max: int = ITERATII_MAX) -> Dict:
+        """
+        Repartiția debitelor și temperaturile pentru setări date ale vanelor
+
+        Pompa are curba H = inaltime_pompa - panta_pompa·Q² (Q în m³/h;
+        panta 0 = pompă cu presiune constantă). Sistemul F_i(Q) = pierderea
+        pe traseul coloanei i + vana i - H(ΣQ) = 0 se rezolvă prin Newton;
+        jacobianul este dens (n×n) dar se construiește direct din sumele
+        cumulate: J_ik = Σ_(j<=min(i,k)) h'_dist,j + δ_ik h'_coloana,i + 2·panta·ΣQ.
+        Temperaturile (deci viscozitatea și λ) se reevaluează la fiecare pas.
+        DN-urile de retur lipsă (None) sunt cele date buclei la construcție;
+        pentru o buclă dimensionată se trec cele întoarse de dimensioneaza.
+
+        Returns:
+            Aceleași temperaturi ca dimensioneaza, plus "debit_lh",
+            "debit_pompa_m3h", "inaltime_pompa_m", "sub_minim" (coloanele cu apa
+            sub temperatura_minima), "iteratii" și "convergent"
+        """
+        n = len(self)
+        dn_rc = self.dn_rc if dn_retur_coloane is None else np.broadcast_to(np.asarray(dn_retur_coloane), (n,)).astype(int)
+        dn_rd = self.dn_rd if dn_retur_distributie is None else np.broadcast_to(np.asarray(dn_retur_distributie), (n,)).astype(int)
+        if dn_rc is None or dn_rd is None:
+            raise ValueError("DN-urile de retur lipsesc: dați-le explicit sau pe cele întoarse de dimensioneaza()")
+        kv = np.broadcast_to(np.asarray(kv_vane, dtype=float), (len(self),))
+        if np.any(kv <= 0):
+            raise ValueError("Setările kv ale vanelor trebuie să fie pozitive")
+        d_rc, d_rd, U_rc, U_rd = self._retur(dn_rc, dn_rd)
+        r_vana = (3600 / kv) ** 2 * 1e5 / (DENSITATE_APA_CALDA * G)  # h = r·Q², Q în m³/s
+        panta = panta_pompa * 3600**2  # mCA / (m³/s)²
+        minim = np.minimum.outer(np.arange(n), np.arange(n))
+
+        # Debitele inițiale: vanele singure preiau toată înălțimea pompei
+        Q = np.sqrt(max(inaltime_pompa, 1e-6) / r_vana) / 2
+        convergent = False
+        for iteratie in range(1, iteratii_max + 1):
+            temperaturi = self._temperaturi(Q * DENSITATE_APA_CALDA, temperatura_plecare, U_rc, U_rd)
+            traseu, dh_dist, dh_coloana = self._hidraulica(Q, temperaturi, temperatura_plecare, d_rc, d_rd)
+            Q_total = Q.sum()
+            F = traseu + r_vana * Q**2 - (inaltime_pompa - panta * Q_total**2)
+            J = np.cumsum(dh_dist)[minim] + 2 * panta * Q_total
+            J[np.diag_indices(n)] += dh_coloana + 2 * r_vana * Q
+            pas = np.linalg.solve(J, -F)
+            # Amortizare: debitele rămân pozitive (cel mult o scădere de 10 ori pe pas)
+            Q_nou = np.maximum(Q + pas, Q / 10)
+            corectie = np.max(np.abs(Q_nou - Q) / Q_nou)
+            Q = Q_nou
+            if corectie <= toleranta:
+                convergent = True
+                break
+
+        temperaturi = self._temperaturi(Q * DENSITATE_APA_CALDA, temperatura_plecare, U_rc, U_rd)
+        Q_total = float(Q.sum())
+        return {
+            "debit_lh": Q * 3.6e6,
+            "T_baza": temperaturi["T_baza"],
+            "T_varf": temperaturi["T_varf"],
+            "T_iesire": temperaturi["T_iesire"],
+            "T_retur_preparator": temperaturi["T_retur_preparator"],
+            "T_minima": temperaturi["T_minima"],
+            "flux_caldura_W": temperaturi["flux_caldura_W"],
+            "sub_minim": np.flatnonzero(temperaturi["T_iesire"] < temperatura_minima - 1e-6) + 1,
+            "debit_pompa_m3h": Q_total * 3600,
+            "inaltime_pompa_m": inaltime_pompa - panta * Q_total**2,
+            "iteratii": iteratie,
+            "convergent": convergent,
+        }
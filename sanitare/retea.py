@@ -0,0 +1,619 @@
+"""
+Rețele ramificate și inelare: noduri, conducte și consumatori
+
+Rezolvarea folosește metoda gradientului global (Todini-Pilati), adică
+Newton-Raphson pe sistemul debite-sarcini, cu matrice de incidență rare:
+
+    h(Q) - A_j H_j - A_s H_s = 0      (energie, pe fiecare conductă)
+    -A_j^T Q - q = 0                  (continuitate, în fiecare nod)
+
+unde h(Q) = (λ L/D + Σζ) v|v| / 2g sunt pierderile din dimensioneaza_tronson.
+La fiecare iterație se rezolvă doar sistemul simetric pozitiv definit
+(A_j^T G^-1 A_j) δH = ..., de dimensiunea numărului de noduri.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from .date import G, CONSUMATORI, MATERIALE_CONDUCTE, PRETURI_CONDUCTE
+from .frecare import MODEL_FRECARE_IMPLICIT, RE_LAMINAR, viscozitate_cinematica_apa, factor_frecare
+from .hidraulica import calcul_debit_cu_destinatie
+from .profilare import cronometrat
+from .vectorizat import calcul_debit_cu_destinatie_vect, dimensioneaza_tronsoane
+
+TOLERANTA_DEBIT = 1e-9   # m³/s, corecția maximă admisă la convergență
+ITERATII_MAX = 50
+_DEBIT_MINIM = 1e-9      # m³/s, evită derivata nulă la debit zero
+REZOLUTIE_SARCINA = 0.01  # m, pasul fronturilor Pareto la optimizarea diametrelor
+
+# ======================== FRONTURI PARETO ========================
+
+def _rotunjire_sus(valori, pas: float):
+    return np.ceil(np.asarray(valori) / pas - 1e-9) * pas
+
+def _front_pareto(h: np.ndarray, c: np.ndarray, h_max: float):
+    """Variantele nedominate (sarcină crescătoare, cost strict descrescător), cu h <= h_max"""
+    pastrat = h <= h_max + 1e-9
+    h, c = h[pastrat], c[pastrat]
+    ordine = np.lexsort((c, h))
+    h, c = h[ordine], c[ordine]
+    minim_anterior = np.concatenate([[np.inf], np.minimum.accumulate(c)[:-1]])
+    nedominat = c < minim_anterior
+    return h[nedominat], c[nedominat]
+
+def _combina_fronturi(h_a: np.ndarray, c_a: np.ndarray, h_b: np.ndarray, c_b: np.ndarray):
+    """
+    Frontul nodului cu două ramuri: sarcina necesară este maximul ramurilor,
+    costul este suma; pentru fiecare prag H se adună costurile minime cu h <= H
+    """
+    praguri = np.union1d(h_a, h_b)
+    i_a = np.searchsorted(h_a, praguri, side="right") - 1
+    i_b = np.searchsorted(h_b, praguri, side="right") - 1
+    valid = (i_a >= 0) & (i_b >= 0)
+    praguri = praguri[valid]
+    cost = c_a[i_a[valid]] + c_b[i_b[valid]]
+    return _front_pareto(praguri, cost, np.inf)
+
+# ======================== MODEL REȚEA ========================
+
+class Retea:
+    """
+    Rețea de alimentare cu apă (ramificată sau inelară)
+
+    Nodurile au cotă geometrică, consumatori (din CONSUMATORI) și/sau un debit
+    impus; nodurile sursă (branșament, rezervor, hidrofor) au sarcina
+    piezometrică impusă. Conductele leagă două noduri; sensul declarat
+    (amonte -> aval) este doar convențional, debitul negativ înseamnă curgere
+    în sens invers.
+    """
+
+    def __init__(self, material: str, temperatura: float = 10.0,
+                 destinatie: Optional[str] = None,
+                 model_frecare: str = MODEL_FRECARE_IMPLICIT):
+        self.material = material
+        self.temperatura = temperatura
+        self.destinatie = destinatie
+        self.model_frecare = model_frecare
+
+        self.noduri: List[str] = []
+        self._index_nod: Dict[str, int] = {}
+        self._cote: List[float] = []
+        self._debite_impuse: List[float] = []
+        self._consumatori: List[Dict[str, int]] = []
+        self._sarcini_fixe: Dict[int, float] = {}
+
+        self.conducte: List[str] = []
+        self._index_conducta: Dict[str, int] = {}
+        self._amonte: List[int] = []
+        self._aval: List[int] = []
+        self._lungimi: List[float] = []
+        self._zeta: List[float] = []
+        self._dn: List[Optional[int]] = []
+
+    # -------- Construcția rețelei --------
+
+    @classmethod
+    def din_tronsoane(cls, tronsoane: List[Dict], material: str, temperatura: float,
+                      destinatie: str, sarcina_disponibila_m: float,
+                      model_frecare: str = MODEL_FRECARE_IMPLICIT) -> "Retea":
+        """
+        Construiește lanțul echivalent listei de tronsoane din interfață
+
+        Tronsonul 1 este cel mai depărtat de sursă, iar fiecare tronson următor
+        îi preia pe cei anteriori; nodul de la capătul aval al tronsonului k
+        poartă consumatorii acestuia, la cota Σ diferenta_nivel (k..n).
+        """
+        retea = cls(material, temperatura, destinatie, model_frecare)
+        retea.adauga_nod("Sursă", 0.0, sarcina_m=sarcina_disponibila_m)
+        amonte, cota = "Sursă", 0.0
+        for tronson in reversed(tronsoane):
+            cota += tronson.get("diferenta_nivel", 0)
+            nod = f"Nod {tronson['nr']}"
+            retea.adauga_nod(nod, cota, consumatori=tronson["consumatori"])
+            retea.adauga_conducta(f"Tronson {tronson['nr']}", amonte, nod,
+                                  tronson["lungime"], tronson["suma_zeta"])
+            amonte = nod
+        return retea
+
+    def adauga_nod(self, nume: str, cota: float = 0.0, consumatori: Optional[Dict[str, int]] = None,
+                   debit_ls: float = 0.0, sarcina_m: Optional[float] = None) -> int:
+        """
+        Adaugă un nod
+
+        Args:
+            nume: identificator unic
+            cota: cota geometrică în m
+            consumatori: consumatorii racordați în nod {nume: cantitate}
+            debit_ls: debit suplimentar extras în nod (l/s)
+            sarcina_m: sarcina piezometrică impusă (m), doar pentru noduri sursă
+        """
+        if nume in self._index_nod:
+            raise ValueError(f"Nodul '{nume}' există deja")
+        for cons in (consumatori or {}):
+            if cons not in CONSUMATORI:
+                raise ValueError(f"Consumator necunoscut: {cons}")
+        index = len(self.noduri)
+        self.noduri.append(nume)
+        self._index_nod[nume] = index
+        self._cote.append(cota)
+        self._debite_impuse.append(debit_ls)
+        self._consumatori.append(dict(consumatori or {}))
+        if sarcina_m is not None:
+            self._sarcini_fixe[index] = sarcina_m
+        return index
+
+    def adauga_conducta(self, nume: str, nod_amonte: str, nod_aval: str, lungime: float,
+                        suma_zeta: float = 0.0, dn: Optional[int] = None) -> int:
+        """
+        Adaugă o conductă între două noduri existente
+
+        Args:
+            dn: DN din MATERIALE_CONDUCTE[material]; None = dimensionare automată
+        """
+        if nume in self._index_conducta:
+            raise ValueError(f"Conducta '{nume}' există deja")
+        diametre = MATERIALE_CONDUCTE[self.material]["diametre_mm"]
+        if dn is not None and dn not in diametre:
+            raise ValueError(f"DN{dn} nu există pentru {self.material}")
+        index = len(self.conducte)
+        self.conducte.append(nume)
+        self._index_conducta[nume] = index
+        self._amonte.append(self._index_nod[nod_amonte])
+        self._aval.append(self._index_nod[nod_aval])
+        self._lungimi.append(lungime)
+        self._zeta.append(suma_zeta)
+        self._dn.append(dn)
+        return index
+
+    # -------- Date derivate --------
+
+    def debite_noduri_ls(self) -> np.ndarray:
+        """Debitul extras în fiecare nod (l/s): consumatori + debit impus"""
+        debite = np.array(self._debite_impuse, dtype=float)
+        if self.destinatie is None:
+            return debite
+        for i, consumatori in enumerate(self._consumatori):
+            if consumatori:
+                suma_vs = sum(CONSUMATORI[c]["debit"] * q for c, q in consumatori.items())
+                suma_E = sum(CONSUMATORI[c]["unitate"] * q for c, q in consumatori.items())
+                debite[i] += calcul_debit_cu_destinatie(suma_vs, suma_E, self.destinatie, "ARM")
+        return debite
+
+    def _matrice_incidenta(self) -> sparse.csr_matrix:
+        n_conducte = len(self.conducte)
+        randuri = np.repeat(np.arange(n_conducte), 2)
+        coloane = np.column_stack([self._amonte, self._aval]).ravel()
+        valori = np.tile([1.0, -1.0], n_conducte)
+        return sparse.csr_matrix((valori, (randuri, coloane)), shape=(n_conducte, len(self.noduri)))
+
+    # -------- Rețele ramificate: traseul critic --------
+
+    def _orientare_arbore(self):
+        """Ordinea de parcurgere de la sursă, nodul părinte și conducta de legătură"""
+        if len(self._sarcini_fixe) != 1:
+            raise ValueError("Analiza traseului critic cere o singură sursă")
+        n_noduri = len(self.noduri)
+        if len(self.conducte) != n_noduri - 1:
+            raise ValueError("Rețeaua nu este ramificată (conține inele sau noduri izolate)")
+
+        vecini: List[List[tuple]] = [[] for _ in range(n_noduri)]
+        for p, (a, b) in enumerate(zip(self._amonte, self._aval)):
+            vecini[a].append((b, p))
+            vecini[b].append((a, p))
+
+        sursa = next(iter(self._sarcini_fixe))
+        parinte = np.full(n_noduri, -1)
+        conducta_parinte = np.full(n_noduri, -1)
+        vizitat = np.zeros(n_noduri, dtype=bool)
+        vizitat[sursa] = True
+        ordine = [sursa]
+        for nod in ordine:
+            for vecin, p in vecini[nod]:
+                if not vizitat[vecin]:
+                    vizitat[vecin] = True
+                    parinte[vecin] = nod
+                    conducta_parinte[vecin] = p
+                    ordine.append(vecin)
+        if len(ordine) != n_noduri:
+            raise ValueError("Rețeaua are noduri fără legătură cu sursa")
+        return sursa, np.array(ordine), parinte, conducta_parinte
+
+    def _debite_arbore(self):
+        """Debitele de calcul pe conducte, din consumatorii cumulați pe fiecare ramură"""
+        if self.destinatie is None:
+            raise ValueError("Calculul pe arbore cere destinația clădirii (pentru debitele de calcul)")
+        sursa, ordine, parinte, conducta_parinte = self._orientare_arbore()
+        n_noduri = len(self.noduri)
+
+        # Contribuțiile proprii ale nodurilor
+        vs = np.zeros(n_noduri)
+        E = np.zeros(n_noduri)
+        presiune_min = np.full(n_noduri, np.nan)
+        for i, consumatori in enumerate(self._consumatori):
+            if consumatori:
+                vs[i] = sum(CONSUMATORI[c]["debit"] * q for c, q in consumatori.items())
+                E[i] = sum(CONSUMATORI[c]["unitate"] * q for c, q in consumatori.items())
+                presiune_min[i] = max(CONSUMATORI[c]["presiune_min"] for c in consumatori)
+        debit_impus = np.array(self._debite_impuse, dtype=float)
+
+        # De jos în sus: sume pe subarbori
+        vs_sub, E_sub, impus_sub = vs.copy(), E.copy(), debit_impus.copy()
+        for nod in ordine[:0:-1]:
+            p = parinte[nod]
+            vs_sub[p] += vs_sub[nod]
+            E_sub[p] += E_sub[nod]
+            impus_sub[p] += impus_sub[nod]
+
+        noduri_aval = ordine[1:]
+        Vc = np.zeros(len(self.conducte))
+        Vc[conducta_parinte[noduri_aval]] = (
+            calcul_debit_cu_destinatie_vect(vs_sub[noduri_aval], E_sub[noduri_aval], self.destinatie, "ARM")
+            + impus_sub[noduri_aval]
+        )
+        return sursa, ordine, parinte, conducta_parinte, Vc, presiune_min
+
+    @cronometrat
+    def traseu_critic(self, dn_impus=None) -> Dict[str, object]:
+        """
+        Consumatorul cel mai dezavantajat al unei rețele ramificate (arbore)
+
+        Într-o singură parcurgere liniară: debitele de calcul se obțin de jos
+        în sus din consumatorii cumulați pe fiecare ramură (ca în
+        calcul_tronsoane), iar pierderile se cumulează de la sursă în jos.
+        Pentru fiecare nod cu consumatori (capăt):
+
+            H_nec = cota + Σ(h_lin + h_loc) sursă->nod + max(presiune_min)
+
+        unde presiune_min (mCA) este cea din CONSUMATORI. Rezerva de presiune
+        a capătului este sarcina sursei minus H_nec; traseul critic duce la
+        capătul cu rezerva minimă.
+
+        Args:
+            dn_impus: DN pe fiecare conductă (ex. rezultatul optimizării);
+                implicit DN-ul declarat sau, lipsind, cel ales după v_max
+
+        Returns:
+            Dicționar cu rezultatele pe conducte (debit_ls, dn, d_int_mm,
+            viteza_ms, h_lin_m, h_loc_m), pe noduri (pierderi_cumulate_m,
+            sarcina_necesara_m; NaN în nodurile fără consumatori), lista
+            "capete" și "traseu_critic" (nodurile de la sursă la capătul critic).
+        """
+        sursa, ordine, parinte, conducta_parinte, Vc, presiune_min = self._debite_arbore()
+        n_noduri = len(self.noduri)
+        if dn_impus is None:
+            dn_impus = [dn or 0 for dn in self._dn]
+
+        # Dimensionarea tuturor conductelor într-o trecere
+        dim = dimensioneaza_tronsoane(
+            Vc, self._lungimi, self._zeta, self.temperatura, MATERIALE_CONDUCTE[self.material],
+            self.model_frecare, dn_impus=dn_impus
+        )
+        pierdere_conducta = dim["h_lin_m"] + dim["h_loc_m"]
+
+        # De sus în jos: pierderi cumulate de la sursă
+        pierderi = np.zeros(n_noduri)
+        for nod in ordine[1:]:
+            pierderi[nod] = pierderi[parinte[nod]] + pierdere_conducta[conducta_parinte[nod]]
+
+        cote = np.array(self._cote, dtype=float)
+        sarcina_necesara = cote + pierderi + presiune_min  # NaN unde nu există consumatori
+        sarcina_sursa = self._sarcini_fixe[sursa]
+        capete = [
+            {
+                "nod": self.noduri[i],
+                "sarcina_necesara_m": float(sarcina_necesara[i]),
+                "presiune_min_mca": float(presiune_min[i]),
+                "pierderi_m": float(pierderi[i]),
+                "marja_m": float(sarcina_sursa - sarcina_necesara[i]),
+            }
+            for i in np.flatnonzero(~np.isnan(sarcina_necesara))
+        ]
+        if not capete:
+            raise ValueError("Rețeaua nu are consumatori")
+
+        critic = int(np.nanargmax(sarcina_necesara))
+        traseu = [critic]
+        while parinte[traseu[-1]] >= 0:
+            traseu.append(int(parinte[traseu[-1]]))
+
+        return {
+            "conducte": list(self.conducte),
+            "noduri": list(self.noduri),
+            "debit_ls": Vc,
+            "dn": dim["dn"],
+            "d_int_mm": dim["d_int_mm"],
+            "viteza_ms": dim["viteza_ms"],
+            "h_lin_m": dim["h_lin_m"],
+            "h_loc_m": dim["h_loc_m"],
+            "pierderi_cumulate_m": pierderi,
+            "sarcina_necesara_m": sarcina_necesara,
+            "capete": capete,
+            "nod_critic": self.noduri[critic],
+            "traseu_critic": [self.noduri[i] for i in reversed(traseu)],
+            "sarcina_necesara_sursa_m": float(sarcina_necesara[critic]),
+            "marja_minima_m": float(sarcina_sursa - sarcina_necesara[critic]),
+        }
+
+    # -------- Rețele ramificate: diametre de cost minim --------
+
+    @cronometrat
+    def optimizeaza_diametre(self, preturi: Optional[Dict[int, float]] = None,
+                             rezolutie_m: float = REZOLUTIE_SARCINA) -> Dict[str, object]:
+        """
+        Alege DN-ul fiecărei conducte astfel încât costul total să fie minim
+
+        Restricții: viteza <= v_max pe fiecare conductă și sarcina necesară
+        la fiecare consumator <= sarcina sursei. Programare dinamică pe
+        arbore: fiecare nod păstrează frontul Pareto (sarcina necesară în nod,
+        cost minim al subarborelui), cu sarcina rotunjită în sus la
+        rezolutie_m (deci rezultatul rămâne sigur) și tăiat la sarcina sursei,
+        ceea ce limitează dimensiunea fronturilor. Reconstrucția se face de
+        sus în jos: la un buget de sarcină dat, fiecare ramură își alege
+        independent varianta cea mai ieftină care încape în buget.
+
+        Args:
+            preturi: preț (lei/m) pe DN; implicit PRETURI_CONDUCTE[material]
+            rezolutie_m: pasul de discretizare a sarcinii
+
+        Returns:
+            Dicționar cu "fezabil", "dn" (pe conducte), "cost_total" și
+            rezultatul traseu_critic pentru soluția aleasă. Dacă presiunea
+            sursei nu ajunge nici cu cele mai mari diametre, "fezabil" este
+            False, iar soluția este cea cu diametrele maxime admise (sarcina
+            minimă posibilă, de acoperit cu hidrofor).
+        """
+        preturi = PRETURI_CONDUCTE[self.material] if preturi is None else preturi
+        sursa, ordine, parinte, conducta_parinte, Vc, presiune_min = self._debite_arbore()
+        sarcina_sursa = self._sarcini_fixe[sursa]
+        info = MATERIALE_CONDUCTE[self.material]
+
+        dn_catalog = np.array(sorted(info["diametre_mm"]))
+        lipsa = [dn for dn in dn_catalog if dn not in preturi]
+        if lipsa:
+            raise ValueError(f"Lipsesc prețurile pentru DN {lipsa} ({self.material})")
+        n_conducte, K = len(self.conducte), len(dn_catalog)
+        lungimi = np.array(self._lungimi, dtype=float)
+
+        # Pierderea și costul fiecărei conducte pentru fiecare DN din catalog
+        pierdere = np.empty((n_conducte, K))
+        admis = np.empty((n_conducte, K), dtype=bool)
+        for k, dn in enumerate(dn_catalog):
+            dim = dimensioneaza_tronsoane(
+                Vc, lungimi, self._zeta, self.temperatura, info, self.model_frecare,
+                dn_impus=np.full(n_conducte, dn)
+            )
+            pierdere[:, k] = dim["h_lin_m"] + dim["h_loc_m"]
+            admis[:, k] = dim["viteza_ms"] <= info["v_max"]
+        cost = lungimi[:, None] * np.array([preturi[dn] for dn in dn_catalog])[None, :]
+        fixat = np.array([dn is not None for dn in self._dn])
+        for p in np.flatnonzero(fixat):
+            admis[p] = dn_catalog == self._dn[p]
+        # Dacă niciun DN nu respectă v_max, rămâne admis doar cel mai mare
+        fara_varianta = ~admis.any(axis=1)
+        admis[fara_varianta, K - 1] = True
+
+        # Soluția de sarcină minimă: cel mai mare DN admis pe fiecare conductă
+        dn_maxim = dn_catalog[K - 1 - np.argmax(admis[:, ::-1], axis=1)]
+
+        # De jos în sus: fronturi Pareto (sarcină crescătoare, cost descrescător)
+        cote = np.array(self._cote, dtype=float)
+        necesar_propriu = cote + presiune_min
+        fronturi: List[tuple] = [None] * len(self.noduri)
+        copii: List[List[int]] = [[] for _ in self.noduri]
+        for nod in ordine[1:]:
+            copii[parinte[nod]].append(nod)
+
+        for nod in ordine[::-1]:
+            h = np.array([-np.inf if np.isnan(necesar_propriu[nod]) else
+                          _rotunjire_sus(necesar_propriu[nod], rezolutie_m)])
+            c = np.zeros(1)
+            for copil in copii[nod]:
+                p = conducta_parinte[copil]
+                h_copil, c_copil = fronturi[copil]
+                k_admis = np.flatnonzero(admis[p])
+                h_var = _rotunjire_sus((h_copil[None, :] + pierdere[p, k_admis][:, None]).ravel(), rezolutie_m)
+                c_var = (c_copil[None, :] + cost[p, k_admis][:, None]).ravel()
+                h_var, c_var = _front_pareto(h_var, c_var, sarcina_sursa)
+                h, c = _combina_fronturi(h, c, h_var, c_var)
+                if not len(h):
+                    break
+            fronturi[nod] = (h, c)
+            if not len(h):
+                break
+
+        h_radacina, c_radacina = fronturi[sursa] if fronturi[sursa] is not None else (np.zeros(0), None)
+        if not len(h_radacina):
+            rezultat = self.traseu_critic(dn_impus=dn_maxim)
+            rezultat.update({
+                "fezabil": False,
+                "cost_total": float(np.sum(cost[np.arange(n_conducte), np.searchsorted(dn_catalog, dn_maxim)])),
+            })
+            return rezultat
+
+        # De sus în jos: fiecare conductă primește DN-ul cel mai ieftin care
+        # încape în bugetul de sarcină al nodului amonte
+        buget = np.zeros(len(self.noduri))
+        buget[sursa] = sarcina_sursa
+        dn_ales = np.zeros(n_conducte, dtype=dn_catalog.dtype)
+        for nod in ordine[1:]:
+            p = conducta_parinte[nod]
+            h_copil, c_copil = fronturi[nod]
+            k_admis = np.flatnonzero(admis[p])
+            rest = buget[parinte[nod]] - pierdere[p, k_admis]
+            idx = np.searchsorted(h_copil, rest + 1e-9, side="right") - 1
+            total = np.where(idx >= 0, cost[p, k_admis] + c_copil[np.maximum(idx, 0)], np.inf)
+            alegere = int(np.argmin(total))
+            dn_ales[p] = dn_catalog[k_admis[alegere]]
+            buget[nod] = rest[alegere]
+
+        rezultat = self.traseu_critic(dn_impus=dn_ales)
+        rezultat.update({
+            "fezabil": True,
+            "cost_total": float(np.sum(cost[np.arange(n_conducte), np.searchsorted(dn_catalog, dn_ales)])),
+        })
+        return rezultat
+
+    # -------- Rezolvare --------
+
+    @cronometrat
+    def rezolva(self, toleranta: float = TOLERANTA_DEBIT, iteratii_max: int = ITERATII_MAX,
+                redimensionari_max: int = 10, dn_impus=None) -> Dict[str, object]:
+        """
+        Calculează debitele în conducte și sarcinile în noduri
+
+        Conductele fără DN se dimensionează automat: se rezolvă rețeaua, se
+        alege cel mai mic DN care respectă v_max pentru debitul obținut și se
+        repetă până când diametrele nu se mai schimbă.
+
+        Args:
+            dn_impus: DN pe fiecare conductă (ex. rezultatul optimizării);
+                implicit DN-ul declarat sau, lipsind, dimensionarea automată
+
+        Returns:
+            Dicționar cu vectori pe conducte (debit_ls, dn, d_int_mm, viteza_ms,
+            reynolds, lambda, h_lin_m, h_loc_m) și pe noduri (sarcina_m,
+            presiune_mca), numărul de iterații Newton și starea rezolvării:
+            "convergent" (Newton a atins toleranța și diametrele s-au
+            stabilizat), "diametre_stabile", "reziduu_energie_m" și
+            "reziduu_continuitate_ls" (abaterile maxime din ecuații la soluția
+            întoarsă). Soluția neconvergentă se întoarce totuși, ca ultimă iterație.
+        """
+        if not self._sarcini_fixe:
+            raise ValueError("Rețeaua nu are niciun nod sursă (cu sarcină impusă)")
+        if iteratii_max < 1 or redimensionari_max < 0:
+            raise ValueError("iteratii_max trebuie să fie >= 1, iar redimensionari_max >= 0")
+
+        info = MATERIALE_CONDUCTE[self.material]
+        elemente = sorted(info["diametre_mm"].items())
+        dn_catalog = np.array([dn for dn, _ in elemente])
+        d_catalog = np.array([d for _, d in elemente], dtype=float)
+
+        dn_conducte = self._dn if dn_impus is None else [None if dn is None else int(dn) for dn in dn_impus]
+        if len(dn_conducte) != len(self.conducte):
+            raise ValueError("dn_impus trebuie să aibă câte un DN pe conductă")
+        for dn in dn_conducte:
+            if dn is not None and dn not in info["diametre_mm"]:
+                raise ValueError(f"DN{dn} nu există pentru {self.material}")
+        automat = np.array([dn is None for dn in dn_conducte])
+        idx_dn = np.array([
+            len(dn_catalog) // 2 if dn is None else int(np.searchsorted(dn_catalog, dn))
+            for dn in dn_conducte
+        ], dtype=int)
+
+        Q = None
+        iteratii_total = 0
+        stabile = True
+        for redimensionare in range(redimensionari_max + 1):
+            d_m = d_catalog[idx_dn] / 1000
+            Q, H, iteratii, newton_convergent, reziduu_energie, reziduu_continuitate = self._newton(
+                d_m, Q, toleranta, iteratii_max)
+            iteratii_total += iteratii
+            if not automat.any():
+                break
+            # Cel mai mic DN care respectă v_max (aceeași regulă ca dimensioneaza_tronson)
+            d_min = np.sqrt(4 * np.abs(Q) / (math.pi * info["v_max"])) * 1000
+            idx_nou = np.searchsorted(np.maximum.accumulate(d_catalog), d_min, side="left")
+            idx_nou = np.minimum(idx_nou, len(d_catalog) - 1)
+            idx_nou = np.where(automat, idx_nou, idx_dn)
+            if np.array_equal(idx_nou, idx_dn):
+                break
+            if redimensionare == redimensionari_max:
+                # Diametrele încă se schimbă: se păstrează cele pentru care s-a rezolvat rețeaua
+                stabile = False
+                break
+            idx_dn = idx_nou
+
+        d_m = d_catalog[idx_dn] / 1000
+        viteza, reynolds, lambda_coef, termen_dinamic = self._hidraulica(Q, d_m)
+        lungimi = np.array(self._lungimi, dtype=float)
+        zeta = np.array(self._zeta, dtype=float)
+        cote = np.array(self._cote, dtype=float)
+        return {
+            "conducte": list(self.conducte),
+            "noduri": list(self.noduri),
+            "debit_ls": Q * 1000,
+            "dn": dn_catalog[idx_dn],
+            "d_int_mm": d_catalog[idx_dn],
+            "viteza_ms": viteza,
+            "reynolds": reynolds,
+            "lambda": lambda_coef,
+            "h_lin_m": lambda_coef * lungimi / d_m * termen_dinamic,
+            "h_loc_m": zeta * termen_dinamic,
+            "sarcina_m": H,
+            "presiune_mca": H - cote,
+            "iteratii": iteratii_total,
+            "convergent": bool(newton_convergent and stabile),
+            "diametre_stabile": stabile,
+            "reziduu_energie_m": reziduu_energie,
+            "reziduu_continuitate_ls": reziduu_continuitate,
+        }
+
+    def _hidraulica(self, Q: np.ndarray, d_m: np.ndarray):
+        sectiune = math.pi * d_m**2 / 4
+        viteza = np.abs(Q) / sectiune
+        reynolds = viteza * d_m / viscozitate_cinematica_apa(self.temperatura)
+        rugozitate_rel = MATERIALE_CONDUCTE[self.material]["rugozitate_mm"] / (d_m * 1000)
+        lambda_coef = factor_frecare(reynolds, rugozitate_rel, self.model_frecare)
+        return viteza, reynolds, lambda_coef, viteza**2 / (2 * G)
+
+    def _newton(self, d_m: np.ndarray, Q0: Optional[np.ndarray], toleranta: float, iteratii_max: int):
+        n_noduri = len(self.noduri)
+        surse = np.array(sorted(self._sarcini_fixe), dtype=int)
+        necunoscute = np.setdiff1d(np.arange(n_noduri), surse)
+        H_surse = np.array([self._sarcini_fixe[i] for i in surse], dtype=float)
+
+        A = self._matrice_incidenta()
+        A_j = A[:, necunoscute].tocsc()
+        A_s = A[:, surse].tocsc()
+        cerere = self.debite_noduri_ls()[necunoscute] / 1000
+
+        lungimi = np.array(self._lungimi, dtype=float)
+        zeta = np.array(self._zeta, dtype=float)
+        sectiune = math.pi * d_m**2 / 4
+
+        # Pornire: 1 m/s în sensul declarat, sarcina maximă a surselor în noduri
+        Q = np.array(Q0, dtype=float) if Q0 is not None else sectiune * 1.0
+        H = np.full(len(necunoscute), H_surse.max())
+        termen_surse = A_s @ H_surse
+
+        def reziduuri(Q, H):
+            # F1: energia pe conducte (m), F2: continuitatea în noduri (m³/s)
+            Q_abs = np.maximum(np.abs(Q), _DEBIT_MINIM)
+            _, _, lambda_coef, _ = self._hidraulica(Q_abs, d_m)
+            r = (lambda_coef * lungimi / d_m + zeta) / (2 * G * sectiune**2)
+            return Q_abs, r, r * Q * np.abs(Q) - A_j @ H - termen_surse, -(A_j.T @ Q) - cerere
+
+        convergent = False
+        iteratie = 0
+        for iteratie in range(1, iteratii_max + 1):
+            Q_abs, r, F1, F2 = reziduuri(Q, H)
+            # dh/dQ = (2 - s) r|Q|, s = -dlnλ/dlnRe (1 în regim laminar, ~0 în turbulent)
+            reynolds = Q_abs / sectiune * d_m / viscozitate_cinematica_apa(self.temperatura)
+            exponent = np.where(reynolds < RE_LAMINAR, 1.0, 2.0)
+            G_inv = 1 / (exponent * r * Q_abs)
+
+            M = (A_j.T @ sparse.diags(G_inv) @ A_j).tocsc()
+            try:
+                dH = spsolve(M, A_j.T @ (G_inv * F1) + F2)
+            except RuntimeError as exc:
+                raise ValueError("Rețeaua are noduri fără legătură cu o sursă") from exc
+            dH = np.atleast_1d(dH)
+            if not np.all(np.isfinite(dH)):
+                raise ValueError("Rețeaua are noduri fără legătură cu o sursă")
+            dQ = G_inv * (A_j @ dH - F1)
+            Q = Q + dQ
+            H = H + dH
+            if np.max(np.abs(dQ), initial=0.0) < toleranta:
+                convergent = True
+                break
+
+        _, _, F1, F2 = reziduuri(Q, H)
+        H_toate = np.empty(n_noduri)
+        H_toate[surse] = H_surse
+        H_toate[necunoscute] = H
+        return (Q, H_toate, iteratie, convergent,
+                float(np.max(np.abs(F1), initial=0.0)), float(np.max(np.abs(F2), initial=0.0) * 1000))
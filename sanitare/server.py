@@ -0,0 +1,412 @@
+"""
+Serviciu HTTP local pentru motorul de calcul (JSON, fără dependențe externe)
+
+    python -m sanitare server --port 8765 --procese 4
+
+Rute (cererile POST primesc și întorc JSON):
+
+    POST /api/tronsoane     proiect ca în `sanitare.lot` -> tabelul tronsoanelor
+                            și rândul final (Vc, DN, v, h_tot)
+    POST /api/bransament    argumentele lui calcul_bransament
+    POST /api/vas-tampon    argumentele lui calcul_vas_tampon
+    POST /api/hidrofor      argumentele lui calcul_hidrofor
+    POST /api/reducator     argumentele lui calcul_reducator_presiune
+    POST /api/lot           {"cereri": [{"functie": "hidrofor", "date": {...}}, ...]}
+    GET  /metrici           latențe (p50/p95/p99), debit de cereri, loturi, coadă
+    GET  /sanatate
+
+Fața asincronă (asyncio, HTTP/1.1 cu keep-alive) doar citește și scrie
+cereri; calculele merg într-un pool de procese de mărime fixă. Cererile
+sosite în aceeași fereastră scurtă (fereastra_ms) se grupează într-un singur
+lot trimis unui proces, ca să nu se plătească serializarea pentru fiecare
+cerere în parte. Coada este mărginită: peste ea serviciul răspunde 503, în
+loc să acumuleze latență. Cu procese=1 calculele rulează într-un singur fir
+separat (fără pool de procese, deci fără serializare), ca bucla de evenimente
+să rămână liberă pentru citit și scris. Un lot /api/lot intră în coadă
+întreg sau deloc: peste CERERI_LOT_MAXIME cereri răspunsul e 400, iar dacă nu
+mai are loc în coadă, 503.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .echipamente import calcul_bransament, calcul_hidrofor, calcul_reducator_presiune, calcul_vas_tampon
+from .frecare import MODEL_FRECARE_IMPLICIT
+from .lot import valideaza_proiect
+from .tronsoane import calcul_tronsoane
+
+PORT_IMPLICIT = 8765
+LOT_MAXIM = 64
+FEREASTRA_MS = 2.0
+COADA_MAXIMA = 4096
+CERERI_LOT_MAXIME = 1024
+CORP_MAXIM = 16 * 1024 * 1024
+ESANTIOANE_LATENTA = 10_000
+
+MESAJE_HTTP = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+# ======================== FUNCȚII EXPUSE ========================
+
+def calcul_proiect(proiect: Dict) -> Dict:
+    """Tabelul tronsoanelor unui proiect și rândul final"""
+    proiect = valideaza_proiect(proiect)
+    rezultate = calcul_tronsoane(
+        proiect["tronsoane"], proiect["destinatie"], proiect["material"],
+        proiect.get("temperatura", 10), "ARM",
+        proiect.get("model_frecare", MODEL_FRECARE_IMPLICIT)
+    )
+    final = rezultate[-1] if rezultate else None
+    return {
+        "tronsoane": rezultate,
+        "final": {camp: final[camp] for camp in ("Vc", "DN", "v", "h_tot")} if final else None,
+    }
+
+FUNCTII = {
+    "tronsoane": calcul_proiect,
+    "bransament": calcul_bransament,
+    "vas-tampon": calcul_vas_tampon,
+    "hidrofor": calcul_hidrofor,
+    "reducator": calcul_reducator_presiune,
+}
+
+def _json_implicit(valoare):
+    # Valorile numpy (np.float64, np.int64) din motor
+    if hasattr(valoare, "item"):
+        return valoare.item()
+    raise TypeError(f"Valoare neserializabilă: {type(valoare).__name__}")
+
+def executa_cerere(functie: str, date) -> Dict:
+    """Rulează o funcție expusă; erorile de date devin {"eroare": ...} (răspuns 400)"""
+    try:
+        if functie not in FUNCTII:
+            raise ValueError(f"Funcție necunoscută: {functie}")
+        if functie != "tronsoane" and not isinstance(date, dict):
+            raise ValueError("Argumentele trebuie să fie un obiect JSON")
+        return {"rezultat": FUNCTII[functie](date) if functie == "tronsoane" else FUNCTII[functie](**date)}
+    except (ValueError, KeyError, TypeError, ZeroDivisionError) as exc:
+        return {"eroare": f"{type(exc).__name__}: {exc}"}
+
+def executa_lot(cereri: List[Tuple[str, object]]) -> List[Dict]:
+    """
+    Un lot de cereri, rulat într-un singur apel (în procesul worker)
+
+    Fiecare cerere primește propriul rezultat: o eroare neprevăzută într-o
+    cerere devine {"eroare": ..., "cod": 500} doar pentru ea, nu pentru tot lotul.
+    """
+    rezultate = []
+    for functie, date in cereri:
+        try:
+            rezultate.append(executa_cerere(functie, date))
+        except Exception as exc:
+            rezultate.append({"eroare": f"{type(exc).__name__}: {exc}", "cod": 500})
+    return rezultate
+
+# ======================== METRICI ========================
+
+class Metrici:
+    """Latențe pe rută (ultimele ESANTIOANE_LATENTA cereri), contoare și mărimea loturilor"""
+
+    def __init__(self):
+        self.pornire = time.monotonic()
+        self.cereri: Dict[str, int] = {}
+        self.erori: Dict[str, int] = {}
+        self.latente: Dict[str, deque] = {}
+        self.momente = deque(maxlen=ESANTIOANE_LATENTA)
+        self.loturi = 0
+        self.cereri_in_loturi = 0
+        self.respinse = 0
+
+    def inregistreaza(self, ruta: str, secunde: float, eroare: bool):
+        self.cereri[ruta] = self.cereri.get(ruta, 0) + 1
+        if eroare:
+            self.erori[ruta] = self.erori.get(ruta, 0) + 1
+        self.latente.setdefault(ruta, deque(maxlen=ESANTIOANE_LATENTA)).append(secunde)
+        self.momente.append(time.monotonic())
+
+    def rezumat(self, in_coada: int = 0) -> Dict:
+        acum = time.monotonic()
+        ultimul_minut = sum(1 for moment in self.momente if acum - moment <= 60)
+        rute = {}
+        for ruta, latente in self.latente.items():
+            ordonate = sorted(latente)
+            rute[ruta] = {
+                "cereri": self.cereri[ruta],
+                "erori": self.erori.get(ruta, 0),
+                **{
+                    f"p{p}_ms": ordonate[min(len(ordonate) - 1, int(p / 100 * len(ordonate)))] * 1000
+                    for p in (50, 95, 99)
+                },
+                "max_ms": ordonate[-1] * 1000,
+            }
+        return {
+            "durata_s": acum - self.pornire,
+            "cereri": sum(self.cereri.values()),
+            "cereri_pe_secunda": ultimul_minut / min(60.0, max(acum - self.pornire, 1e-9)),
+            "respinse": self.respinse,
+            "loturi": self.loturi,
+            "lot_mediu": self.cereri_in_loturi / self.loturi if self.loturi else 0.0,
+            "in_coada": in_coada,
+            "rute": rute,
+        }
+
+# ======================== POOL DE CALCUL CU LOTURI ========================
+
+class PoolCalcul:
+    """
+    Grupează cererile în loturi și le trimite unui pool de procese de mărime fixă
+
+    Cel mult 2·procese loturi sunt în lucru simultan (câte unul care rulează
+    și unul care așteaptă pe fiecare proces); restul cererilor stau în coadă.
+    """
+
+    def __init__(self, procese: int = 1, lot_maxim: int = LOT_MAXIM,
+                 fereastra_ms: float = FEREASTRA_MS, coada_maxima: int = COADA_MAXIMA,
+                 metrici: Optional[Metrici] = None):
+        self.procese = max(1, procese)
+        self.lot_maxim = lot_maxim
+        self.fereastra = fereastra_ms / 1000
+        self.metrici = metrici or Metrici()
+        self.coada: asyncio.Queue = asyncio.Queue(maxsize=coada_maxima)
+        self.executor = (ProcessPoolExecutor(max_workers=self.procese) if self.procese > 1
+                         else ThreadPoolExecutor(max_workers=1))
+        self._in_lucru = asyncio.Semaphore(2 * self.procese)
+        self._colector: Optional[asyncio.Task] = None
+        self._sarcini: set = set()
+
+    def porneste(self):
+        self._colector = asyncio.get_running_loop().create_task(self._colecteaza())
+
+    async def opreste(self):
+        if self._colector is not None:
+            self._colector.cancel()
+        if self._sarcini:
+            await asyncio.gather(*self._sarcini, return_exceptions=True)
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def trimite(self, functie: str, date) -> asyncio.Future:
+        """Pune cererea în coadă; ridică asyncio.QueueFull dacă serviciul e supraîncărcat"""
+        viitor = asyncio.get_running_loop().create_future()
+        self.coada.put_nowait((functie, date, viitor))
+        return viitor
+
+    def locuri_libere(self) -> int:
+        """Câte cereri mai încap acum în coadă"""
+        return self.coada.maxsize - self.coada.qsize()
+
+    async def _colecteaza(self):
+        bucla = asyncio.get_running_loop()
+        while True:
+            lot = [await self.coada.get()]
+            # Fereastra de grupare: ce mai sosește până la termen intră în același lot
+            termen = bucla.time() + self.fereastra
+            while len(lot) < self.lot_maxim:
+                try:
+                    lot.append(self.coada.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                ramas = termen - bucla.time()
+                if ramas <= 0:
+                    break
+                try:
+                    lot.append(await asyncio.wait_for(self.coada.get(), ramas))
+                except asyncio.TimeoutError:
+                    break
+            await self._in_lucru.acquire()
+            sarcina = bucla.create_task(self._ruleaza(lot))
+            self._sarcini.add(sarcina)
+            sarcina.add_done_callback(self._sarcini.discard)
+
+    async def _ruleaza(self, lot):
+        try:
+            cereri = [(functie, date) for functie, date, _ in lot]
+            rezultate = await asyncio.get_running_loop().run_in_executor(self.executor, executa_lot, cereri)
+            self.metrici.loturi += 1
+            self.metrici.cereri_in_loturi += len(lot)
+            for (_, _, viitor), rezultat in zip(lot, rezultate):
+                if not viitor.done():
+                    viitor.set_result(rezultat)
+        except Exception as exc:  # procesul worker a căzut: toate cererile lotului eșuează
+            for _, _, viitor in lot:
+                if not viitor.done():
+                    viitor.set_exception(exc)
+        finally:
+            self._in_lucru.release()
+
+# ======================== SERVER HTTP ========================
+
+class ServerCalcul:
+    """Fața HTTP/1.1 asincronă: citește cererile, le trimite în PoolCalcul, scrie răspunsurile"""
+
+    def __init__(self, gazda: str = "127.0.0.1", port: int = PORT_IMPLICIT, procese: int = 1,
+                 lot_maxim: int = LOT_MAXIM, fereastra_ms: float = FEREASTRA_MS,
+                 coada_maxima: int = COADA_MAXIMA):
+        self.gazda = gazda
+        self.port = port
+        self.metrici = Metrici()
+        self._parametri_pool = dict(procese=procese, lot_maxim=lot_maxim, fereastra_ms=fereastra_ms,
+                                    coada_maxima=coada_maxima)
+        self.pool: Optional[PoolCalcul] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._conexiuni: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def porneste(self):
+        self.pool = PoolCalcul(metrici=self.metrici, **self._parametri_pool)
+        self.pool.porneste()
+        self.server = await asyncio.start_server(self._conexiune, self.gazda, self.port)
+        # Portul 0 alege un port liber; se reține cel efectiv
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def opreste(self):
+        if self.server is not None:
+            self.server.close()
+            # Conexiunile keep-alive deschise se închid, iar tratarea lor se termină normal
+            for scriitor in list(self._conexiuni.values()):
+                scriitor.close()
+            await asyncio.gather(*self._conexiuni, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            await self.pool.opreste()
+
+    async def _conexiune(self, cititor: asyncio.StreamReader, scriitor: asyncio.StreamWriter):
+        sarcina = asyncio.current_task()
+        self._conexiuni[sarcina] = scriitor
+        try:
+            while True:
+                try:
+                    antet = await cititor.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                linii = antet.decode("latin-1").split("\r\n")
+                try:
+                    metoda, cale, versiune = linii[0].split(" ", 2)
+                except ValueError:
+                    await self._raspunde(scriitor, 400, {"eroare": "Linie de cerere invalidă"}, False)
+                    break
+                anteturi = {}
+                for linie in linii[1:]:
+                    if ":" in linie:
+                        cheie, valoare = linie.split(":", 1)
+                        anteturi[cheie.strip().lower()] = valoare.strip()
+                pastreaza = (anteturi.get("connection", "").lower() != "close"
+                             if versiune == "HTTP/1.1" else anteturi.get("connection", "").lower() == "keep-alive")
+
+                try:
+                    lungime = int(anteturi.get("content-length", 0) or 0)
+                except ValueError:
+                    lungime = -1
+                if lungime < 0:
+                    # Fără o lungime validă corpul nu poate fi citit, deci conexiunea se închide
+                    await self._raspunde(scriitor, 400, {"eroare": "Content-Length invalid"}, False)
+                    break
+                if lungime > CORP_MAXIM:
+                    await self._raspunde(scriitor, 413, {"eroare": "Corpul cererii este prea mare"}, False)
+                    break
+                corp = await cititor.readexactly(lungime) if lungime else b""
+
+                start = time.perf_counter()
+                try:
+                    cod, raspuns = await self._trateaza(metoda, cale.split("?", 1)[0], corp)
+                except Exception as exc:  # ex. un proces worker a căzut
+                    cod, raspuns = 500, {"eroare": f"{type(exc).__name__}: {exc}"}
+                self.metrici.inregistreaza(cale.split("?", 1)[0], time.perf_counter() - start, cod != 200)
+                await self._raspunde(scriitor, cod, raspuns, pastreaza)
+                if not pastreaza:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._conexiuni.pop(sarcina, None)
+            scriitor.close()
+
+    async def _trateaza(self, metoda: str, cale: str, corp: bytes) -> Tuple[int, Dict]:
+        if cale == "/sanatate":
+            return 200, {"stare": "ok"}
+        if cale == "/metrici":
+            return 200, self.metrici.rezumat(self.pool.coada.qsize())
+        if not cale.startswith("/api/"):
+            return 404, {"eroare": f"Rută necunoscută: {cale}"}
+        functie = cale[len("/api/"):]
+        if functie not in FUNCTII and functie != "lot":
+            return 404, {"eroare": f"Funcție necunoscută: {functie}"}
+        if metoda != "POST":
+            return 405, {"eroare": "Se acceptă doar POST"}
+        try:
+            date = json.loads(corp or b"{}")
+        except ValueError as exc:
+            return 400, {"eroare": f"JSON invalid: {exc}"}
+
+        try:
+            if functie == "lot":
+                cereri = date.get("cereri") if isinstance(date, dict) else None
+                if not isinstance(cereri, list):
+                    return 400, {"eroare": "Lotul trebuie să aibă lista 'cereri'"}
+                maxim = min(CERERI_LOT_MAXIME, self.pool.coada.maxsize)
+                if len(cereri) > maxim:
+                    return 400, {"eroare": f"Lotul are {len(cereri)} cereri, maximul este {maxim}"}
+                # Totul sau nimic: fără loc pentru tot lotul nu se pune nimic în coadă
+                if len(cereri) > self.pool.locuri_libere():
+                    raise asyncio.QueueFull
+                viitoare = [
+                    self.pool.trimite(c.get("functie"), c.get("date", {})) if isinstance(c, dict)
+                    else _rezolvat({"eroare": "Cererea din lot trebuie să fie un obiect"})
+                    for c in cereri
+                ]
+                return 200, {"rezultate": list(await asyncio.gather(*viitoare))}
+            rezultat = await self.pool.trimite(functie, date)
+        except asyncio.QueueFull:
+            self.metrici.respinse += 1
+            return 503, {"eroare": "Serviciu supraîncărcat, reîncercați"}
+        if "eroare" in rezultat:
+            return rezultat.get("cod", 400), {"eroare": rezultat["eroare"]}
+        return 200, rezultat["rezultat"]
+
+    async def _raspunde(self, scriitor: asyncio.StreamWriter, cod: int, continut, pastreaza: bool):
+        corp = json.dumps(continut, ensure_ascii=False, default=_json_implicit).encode("utf-8")
+        antet = (
+            f"HTTP/1.1 {cod} {MESAJE_HTTP.get(cod, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corp)}\r\n"
+            f"Connection: {'keep-alive' if pastreaza else 'close'}\r\n"
+            + ("Retry-After: 1\r\n" if cod == 503 else "")
+            + "\r\n"
+        )
+        scriitor.write(antet.encode("latin-1") + corp)
+        await scriitor.drain()
+
+def _rezolvat(valoare) -> asyncio.Future:
+    viitor = asyncio.get_running_loop().create_future()
+    viitor.set_result(valoare)
+    return viitor
+
+# ======================== LINIE DE COMANDĂ ========================
+
+def comanda_server(argumente) -> int:
+    """Punctul de intrare pentru `python -m sanitare server`"""
+    server = ServerCalcul(
+        argumente.gazda, argumente.port, argumente.procese or os.cpu_count() or 1,
+        argumente.lot_maxim, argumente.fereastra_ms,
+    )
+
+    async def ruleaza():
+        await server.porneste()
+        print(f"Serviciu pornit pe http://{server.gazda}:{server.port} "
+              f"({server.pool.procese} procese, loturi de cel mult {server.pool.lot_maxim})")
+        try:
+            await server.server.serve_forever()
+        finally:
+            await server.opreste()
+
+    try:
+        asyncio.run(ruleaza())
+    except KeyboardInterrupt:
+        pass
+    return 0
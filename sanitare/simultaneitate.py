@@ -0,0 +1,147 @@
+"""
+Simularea Monte Carlo a simultaneității, pentru verificarea debitelor de calcul
+
+În fiecare pas de timp, numărul consumatorilor deschiși de fiecare tip pe
+fiecare tronson este o variabilă binomială (n consumatori, probabilitatea de
+utilizare din PROBABILITATI_UTILIZARE, ajustată cu factorul destinației).
+Debitul propriu al tronsonului este suma debitelor consumatorilor deschiși,
+iar debitul tronsonului este suma cumulată, ca în tabelul progresiv.
+
+Debitele consumatorilor sunt multipli de 0.01 l/s, deci simularea lucrează
+în numere întregi de cuante; percentilele se calculează exact, din
+histogramele cumulate pe blocuri de pași, fără a păstra toată seria.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .date import CONSUMATORI, FACTOR_UTILIZARE_DESTINATIE, PROBABILITATI_UTILIZARE
+from .profilare import cronometrat
+from .vectorizat import calcul_debit_cu_destinatie_vect
+
+PASI_IMPLICITI = 1_000_000
+PASI_PE_BLOC = 50_000
+ELEMENTE_PE_BLOC = 4_000_000  # plafonează memoria unui bloc (perechi x pași)
+PERCENTILE = (50.0, 95.0, 99.0, 99.9)
+COLOANE_SIMULARE = ["Tronson", "N", "Vc", "P50", "P95", "P99", "P99.9", "Max", "Vc/P99"]
+
+# ======================== MODEL ========================
+
+def _model(tronsoane: List[Dict], destinatie: str, probabilitati: Optional[Dict[str, float]]):
+    """Perechile (tronson, tip consumator) cu n > 0, probabilitățile și debitele în cuante"""
+    probabilitati = PROBABILITATI_UTILIZARE if probabilitati is None else probabilitati
+    factor = FACTOR_UTILIZARE_DESTINATIE.get(destinatie, 1.0)
+    tronson, numar, p, debit_ml = [], [], [], []
+    for k, t in enumerate(tronsoane):
+        for consumator, cantitate in t["consumatori"].items():
+            if cantitate > 0:
+                tronson.append(k)
+                numar.append(int(cantitate))
+                p.append(min(1.0, probabilitati[consumator] * factor))
+                debit_ml.append(int(round(CONSUMATORI[consumator]["debit"] * 1000)))
+    cuanta_ml = reduce(math.gcd, debit_ml, 0) or 1
+    return (np.array(tronson, dtype=np.int64), np.array(numar, dtype=np.int64), np.array(p),
+            np.array(debit_ml, dtype=np.int64) // cuanta_ml, cuanta_ml)
+
+def _simuleaza_bloc(n_tronsoane: int, tronson: np.ndarray, numar: np.ndarray, p: np.ndarray,
+                    debit: np.ndarray, pasi: int, seed) -> List[np.ndarray]:
+    """Histogramele debitelor (în cuante) pe fiecare tronson, pentru pasi pași; rulează în worker"""
+    rng = np.random.default_rng(seed)
+    histograme = [np.zeros(1, dtype=np.int64) for _ in range(n_tronsoane)]
+    # Plafonul de memorie se respectă și pentru proiectele foarte mari (până la un pas pe bloc)
+    bloc = max(1, min(PASI_PE_BLOC, ELEMENTE_PE_BLOC // max(len(numar), n_tronsoane, 1)))
+    # Perechile sunt în ordinea tronsoanelor: sumele pe tronson se fac cu reduceat
+    cu_consumatori, inceputuri = np.unique(tronson, return_index=True)
+    for inceput in range(0, pasi, bloc):
+        m = min(bloc, pasi - inceput)
+        deschisi = rng.binomial(numar[:, None], p[:, None], size=(len(numar), m))
+        deschisi *= debit[:, None]
+        propriu = np.zeros((n_tronsoane, m), dtype=np.int64)
+        propriu[cu_consumatori] = np.add.reduceat(deschisi, inceputuri, axis=0)
+        cumulat = np.cumsum(propriu, axis=0)
+        for k in range(n_tronsoane):
+            h = np.bincount(cumulat[k])
+            if len(h) > len(histograme[k]):
+                h[:len(histograme[k])] += histograme[k]
+                histograme[k] = h
+            else:
+                histograme[k][:len(h)] += h
+    return histograme
+
+def _percentila(histograma: np.ndarray, q: float) -> int:
+    cumulat = np.cumsum(histograma)
+    return int(np.searchsorted(cumulat, q / 100 * cumulat[-1], side="left"))
+
+# ======================== SIMULARE ========================
+
+@cronometrat
+def simuleaza_simultaneitate(tronsoane: List[Dict], destinatie: str,
+                             pasi: int = PASI_IMPLICITI,
+                             probabilitati: Optional[Dict[str, float]] = None,
+                             percentile: Sequence[float] = PERCENTILE,
+                             seed: Optional[int] = None,
+                             procese: Optional[int] = None,
+                             tip_apa: str = "ARM") -> List[Dict]:
+    """
+    Distribuția debitului instantaneu pe fiecare tronson, comparată cu Vc normat
+
+    Args:
+        tronsoane: lista de tronsoane, în formatul din interfață
+        destinatie: cheie din DESTINATII_CLADIRE (debitul normat și factorul de utilizare)
+        pasi: numărul de pași de timp simulați
+        probabilitati: probabilitatea de utilizare pe tip de consumator
+            (implicit PROBABILITATI_UTILIZARE)
+        percentile: percentilele raportate
+        seed: sămânța generatorului (rezultate reproductibile)
+        procese: număr de procese (implicit toate nucleele)
+        tip_apa: "ARM" sau "ACM", pentru debitul normat
+
+    Returns:
+        Câte un rând pe tronson: N, Vc normat, percentilele și maximul
+        simulat (l/s) și raportul Vc/P99 (> 1: normativul acoperă vârful)
+    """
+    if not tronsoane:
+        return []
+    n_tronsoane = len(tronsoane)
+    tronson, numar, p, debit, cuanta_ml = _model(tronsoane, destinatie, probabilitati)
+
+    procese = max(1, min(procese or os.cpu_count() or 1, math.ceil(pasi / PASI_PE_BLOC)))
+    seminte = np.random.SeedSequence(seed).spawn(procese)
+    pasi_worker = [pasi // procese + (1 if i < pasi % procese else 0) for i in range(procese)]
+    if len(numar) == 0:
+        rezultate = [[np.array([pasi], dtype=np.int64)] * n_tronsoane]
+    elif procese == 1:
+        rezultate = [_simuleaza_bloc(n_tronsoane, tronson, numar, p, debit, pasi, seminte[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=procese) as executor:
+            rezultate = list(executor.map(
+                _simuleaza_bloc, [n_tronsoane] * procese, [tronson] * procese, [numar] * procese,
+                [p] * procese, [debit] * procese, pasi_worker, seminte
+            ))
+
+    # Debitul normat, din aceleași sume prefix ca tabelul progresiv
+    suma_vs = np.cumsum([sum(CONSUMATORI[c]["debit"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    suma_E = np.cumsum([sum(CONSUMATORI[c]["unitate"] * q for c, q in t["consumatori"].items()) for t in tronsoane])
+    N = np.cumsum([sum(t["consumatori"].values()) for t in tronsoane])
+    Vc = calcul_debit_cu_destinatie_vect(suma_vs, suma_E, destinatie, tip_apa)
+
+    cuanta = cuanta_ml / 1000
+    tabel = []
+    for k, t in enumerate(tronsoane):
+        lungime = max(len(r[k]) for r in rezultate)
+        histograma = np.zeros(lungime, dtype=np.int64)
+        for r in rezultate:
+            histograma[:len(r[k])] += r[k]
+        rand = {"Tronson": t["nr"], "N": int(N[k]), "Vc": float(Vc[k])}
+        for q in percentile:
+            rand[f"P{q:g}"] = round(_percentila(histograma, q) * cuanta, 3)
+        rand["Max"] = round((len(histograma) - 1) * cuanta, 3)
+        p99 = round(_percentila(histograma, 99.0) * cuanta, 3)
+        rand["Vc/P99"] = float(Vc[k]) / p99 if p99 > 0 else float("inf")
+        tabel.append(rand)
+    return tabel
@@ -0,0 +1,234 @@
+"""
+Depozitul persistent de proiecte (SQLite)
+
+Proiectele, tronsoanele și consumatorii fiecărui tronson sunt ținute în
+tabele indexate. Interfața încarcă doar rețeaua proiectului activ și
+salvează câte un tronson la fiecare modificare, în loc să țină totul în
+st.session_state. Cataloagele de furnizor încărcate se păstrează tot aici,
+ca materialele lor să existe și după repornirea serverului.
+"""
+
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from .date import TEMPERATURA_ACM_IMPLICITA
+from .frecare import MODEL_FRECARE_IMPLICIT
+
+CALE_IMPLICITA = "proiecte_sanitare.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS proiecte (
+    id INTEGER PRIMARY KEY,
+    nume TEXT NOT NULL UNIQUE,
+    destinatie TEXT NOT NULL,
+    material TEXT NOT NULL,
+    temperatura REAL NOT NULL,
+    model_frecare TEXT NOT NULL,
+    temperatura_acm REAL NOT NULL DEFAULT 55.0,
+    creat TEXT NOT NULL,
+    modificat TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tronsoane (
+    id INTEGER PRIMARY KEY,
+    proiect_id INTEGER NOT NULL REFERENCES proiecte(id) ON DELETE CASCADE,
+    retea TEXT NOT NULL,
+    nr INTEGER NOT NULL,
+    lungime REAL NOT NULL,
+    diferenta_nivel REAL NOT NULL,
+    suma_zeta REAL NOT NULL,
+    UNIQUE (proiect_id, retea, nr)
+);
+CREATE TABLE IF NOT EXISTS consumatori_tronson (
+    tronson_id INTEGER NOT NULL REFERENCES tronsoane(id) ON DELETE CASCADE,
+    consumator TEXT NOT NULL,
+    cantitate INTEGER NOT NULL,
+    PRIMARY KEY (tronson_id, consumator)
+);
+CREATE TABLE IF NOT EXISTS cataloage_furnizor (
+    id INTEGER PRIMARY KEY,
+    info TEXT NOT NULL,
+    produse TEXT NOT NULL,
+    incarcat TEXT NOT NULL
+);
+"""
+
+_CAMPURI_PROIECT = ("nume", "destinatie", "material", "temperatura", "model_frecare", "temperatura_acm")
+
+# Coloane adăugate după prima versiune a schemei: bazele vechi le primesc la deschidere
+_COLOANE_NOI = {
+    "proiecte": {"temperatura_acm": f"REAL NOT NULL DEFAULT {TEMPERATURA_ACM_IMPLICITA}"},
+}
+
+def _acum() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+# ======================== DEPOZIT PROIECTE ========================
+
+class DepozitProiecte:
+    """
+    Acces la baza de date a proiectelor
+
+    O singură instanță poate fi folosită de toate sesiunile serverului:
+    conexiunea este protejată de un lock, iar baza rulează în modul WAL
+    (cititorii nu îi blochează pe cei care scriu).
+    """
+
+    def __init__(self, cale: str = CALE_IMPLICITA):
+        self.cale = cale
+        self._lock = threading.Lock()
+        self._conexiune = sqlite3.connect(cale, check_same_thread=False)
+        self._conexiune.row_factory = sqlite3.Row
+        with self._lock, self._conexiune:
+            self._conexiune.execute("PRAGMA foreign_keys = ON")
+            if cale != ":memory:":
+                self._conexiune.execute("PRAGMA journal_mode = WAL")
+            self._conexiune.executescript(_SCHEMA)
+            for tabel, coloane in _COLOANE_NOI.items():
+                existente = {rand["name"] for rand in self._conexiune.execute(f"PRAGMA table_info({tabel})")}
+                for coloana, definitie in coloane.items():
+                    if coloana not in existente:
+                        self._conexiune.execute(f"ALTER TABLE {tabel} ADD COLUMN {coloana} {definitie}")
+
+    def inchide(self):
+        with self._lock:
+            self._conexiune.close()
+
+    def _executa(self, sql: str, parametri=()) -> sqlite3.Cursor:
+        with self._lock, self._conexiune:
+            return self._conexiune.execute(sql, parametri)
+
+    def _citeste(self, sql: str, parametri=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conexiune.execute(sql, parametri).fetchall()
+
+    # -------- Proiecte --------
+
+    def creeaza_proiect(self, nume: str, destinatie: str, material: str,
+                        temperatura: float = 10.0, model_frecare: str = MODEL_FRECARE_IMPLICIT,
+                        temperatura_acm: float = TEMPERATURA_ACM_IMPLICITA) -> int:
+        """Creează un proiect gol și întoarce id-ul lui"""
+        moment = _acum()
+        try:
+            cursor = self._executa(
+                "INSERT INTO proiecte (nume, destinatie, material, temperatura, model_frecare, temperatura_acm, "
+                "creat, modificat) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (nume, destinatie, material, temperatura, model_frecare, temperatura_acm, moment, moment),
+            )
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(f"Există deja un proiect numit '{nume}'") from exc
+        return cursor.lastrowid
+
+    def lista_proiecte(self) -> List[Dict]:
+        """Proiectele existente (fără tronsoane), cele modificate recent primele"""
+        randuri = self._citeste("SELECT id, nume, modificat FROM proiecte ORDER BY modificat DESC, id DESC")
+        return [dict(rand) for rand in randuri]
+
+    def incarca_proiect(self, proiect_id: int) -> Optional[Dict]:
+        """Parametrii proiectului (destinație, material, temperaturi ARM și ACM, model λ)"""
+        randuri = self._citeste("SELECT * FROM proiecte WHERE id = ?", (proiect_id,))
+        return dict(randuri[0]) if randuri else None
+
+    def actualizeaza_proiect(self, proiect_id: int, **campuri):
+        """Modifică parametrii proiectului (doar câmpurile primite)"""
+        necunoscute = set(campuri) - set(_CAMPURI_PROIECT)
+        if necunoscute:
+            raise ValueError(f"Câmpuri necunoscute: {sorted(necunoscute)}")
+        if not campuri:
+            return
+        atribuiri = ", ".join(f"{camp} = ?" for camp in campuri)
+        self._executa(
+            f"UPDATE proiecte SET {atribuiri}, modificat = ? WHERE id = ?",
+            (*campuri.values(), _acum(), proiect_id),
+        )
+
+    def sterge_proiect(self, proiect_id: int):
+        self._executa("DELETE FROM proiecte WHERE id = ?", (proiect_id,))
+
+    # -------- Tronsoane --------
+
+    def numar_tronsoane(self, proiect_id: int, retea: str = "ARM") -> int:
+        randuri = self._citeste(
+            "SELECT COUNT(*) FROM tronsoane WHERE proiect_id = ? AND retea = ?", (proiect_id, retea)
+        )
+        return randuri[0][0]
+
+    def incarca_tronsoane(self, proiect_id: int, retea: str = "ARM",
+                          offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Tronsoanele unei rețele, în ordinea numărului, în formatul din interfață
+
+        Cu offset/limit se încarcă doar fereastra necesară (ex. o pagină).
+        """
+        tronsoane = self._citeste(
+            "SELECT id, nr, lungime, diferenta_nivel, suma_zeta FROM tronsoane "
+            "WHERE proiect_id = ? AND retea = ? ORDER BY nr LIMIT ? OFFSET ?",
+            (proiect_id, retea, -1 if limit is None else limit, offset),
+        )
+        if not tronsoane:
+            return []
+        consumatori = self._citeste(
+            "SELECT c.tronson_id, c.consumator, c.cantitate FROM consumatori_tronson c "
+            "JOIN tronsoane t ON t.id = c.tronson_id "
+            "WHERE t.proiect_id = ? AND t.retea = ? AND t.nr BETWEEN ? AND ? ORDER BY c.rowid",
+            (proiect_id, retea, tronsoane[0]["nr"], tronsoane[-1]["nr"]),
+        )
+        pe_tronson: Dict[int, Dict[str, int]] = {}
+        for rand in consumatori:
+            pe_tronson.setdefault(rand["tronson_id"], {})[rand["consumator"]] = rand["cantitate"]
+        return [
+            {
+                "nr": rand["nr"],
+                "consumatori": pe_tronson.get(rand["id"], {}),
+                "lungime": rand["lungime"],
+                "diferenta_nivel": rand["diferenta_nivel"],
+                "suma_zeta": rand["suma_zeta"],
+            }
+            for rand in tronsoane
+        ]
+
+    def salveaza_tronson(self, proiect_id: int, tronson: Dict, retea: str = "ARM"):
+        """Inserează sau înlocuiește un singur tronson (identificat prin nr)"""
+        with self._lock, self._conexiune:
+            conexiune = self._conexiune
+            conexiune.execute(
+                "INSERT INTO tronsoane (proiect_id, retea, nr, lungime, diferenta_nivel, suma_zeta) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (proiect_id, retea, nr) DO UPDATE SET "
+                "lungime = excluded.lungime, diferenta_nivel = excluded.diferenta_nivel, "
+                "suma_zeta = excluded.suma_zeta",
+                (proiect_id, retea, tronson["nr"], tronson["lungime"],
+                 tronson.get("diferenta_nivel", 0.0), tronson.get("suma_zeta", 0.0)),
+            )
+            tronson_id = conexiune.execute(
+                "SELECT id FROM tronsoane WHERE proiect_id = ? AND retea = ? AND nr = ?",
+                (proiect_id, retea, tronson["nr"]),
+            ).fetchone()[0]
+            conexiune.execute("DELETE FROM consumatori_tronson WHERE tronson_id = ?", (tronson_id,))
+            conexiune.executemany(
+                "INSERT INTO consumatori_tronson (tronson_id, consumator, cantitate) VALUES (?, ?, ?)",
+                [(tronson_id, cons, cant) for cons, cant in tronson["consumatori"].items()],
+            )
+            conexiune.execute("UPDATE proiecte SET modificat = ? WHERE id = ?", (_acum(), proiect_id))
+
+    def sterge_tronsoane(self, proiect_id: int, retea: str = "ARM"):
+        """Șterge toate tronsoanele unei rețele a proiectului"""
+        with self._lock, self._conexiune:
+            self._conexiune.execute("DELETE FROM tronsoane WHERE proiect_id = ? AND retea = ?", (proiect_id, retea))
+            self._conexiune.execute("UPDATE proiecte SET modificat = ? WHERE id = ?", (_acum(), proiect_id))
+
+    # -------- Cataloage de furnizor --------
+
+    def salveaza_catalog_furnizor(self, produse: List[Dict], info: str):
+        """Păstrează produsele unui catalog (rezultatul citeste_catalog_furnizor)"""
+        self._executa(
+            "INSERT INTO cataloage_furnizor (info, produse, incarcat) VALUES (?, ?, ?)",
+            (info, json.dumps(produse, ensure_ascii=False), _acum()),
+        )
+
+    def cataloage_furnizor(self) -> List[Dict]:
+        """Cataloagele salvate, în ordinea încărcării: {"info", "produse"}"""
+        randuri = self._citeste("SELECT info, produse FROM cataloage_furnizor ORDER BY id")
+        return [{"info": rand["info"], "produse": json.loads(rand["produse"])} for rand in randuri]
@@ -0,0 +1,323 @@
+"""Calculul cumulat al tronsoanelor ARM (tabelul progresiv din interfață)."""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .date import CONSUMATORI, MATERIALE_CONDUCTE
+from .frecare import MODEL_FRECARE_IMPLICIT
+from .profilare import cronometrat
+from .vectorizat import (
+    calcul_debit_cu_destinatie_vect,
+    calcul_factor_f_vect,
+    dimensioneaza_tronsoane,
+)
+
+# Coloanele tabelului de rezultate, în ordinea afișată
+COLOANE_REZULTATE = [
+    "Tronson", "Consumatori", "Utot", "N", "f", "Vs", "Vc", "DN", "d_int", "v", "i", "L",
+    "i*L", "Σ i*L", "Σ ζ", "h_loc", "Σ h_loc", "h_geom", "Σ h_geom", "h_tot",
+]
+
+# ======================== CALCUL INCREMENTAL TRONSOANE ========================
+
+class CalculIncrementalTronsoane:
+    """
+    Tabelul cumulat al tronsoanelor, recalculat incremental
+
+    Fiecare tronson preia consumatorii tuturor tronsoanelor anterioare, deci
+    Σ Vs, Σ E și N sunt sume prefix ale contribuțiilor proprii, iar pierderile
+    se cumulează progresiv. La adăugarea sau modificarea tronsonului k se
+    recalculează doar sufixul k..n, pornind de la sumele prefix k-1.
+
+    Cu temperatura_acm, rețeaua de apă caldă (aceleași trasee, doar
+    consumatorii cu "acm" în CONSUMATORI) se calculează în aceeași trecere:
+    sumele pe consumatori se adună în aceeași buclă, iar ambele rețele se
+    dimensionează într-un singur apel dimensioneaza_tronsoane, fiecare la
+    temperatura ei.
+    """
+
+    def __init__(self, destinatie: str, material: str, temperatura: float, tip_apa: str = "ARM",
+                 model_frecare: str = MODEL_FRECARE_IMPLICIT, temperatura_acm: Optional[float] = None):
+        if temperatura_acm is not None and tip_apa != "ARM":
+            raise ValueError("Rețeaua ACM se calculează împreună doar cu o rețea ARM")
+        self.destinatie = destinatie
+        self.material = material
+        self.temperatura = temperatura
+        self.tip_apa = tip_apa
+        self.model_frecare = model_frecare
+        self.temperatura_acm = temperatura_acm
+        self.tronsoane: List[Dict] = []
+        self._retele: Dict[str, Dict] = {}
+        self._golire_coloane()
+
+    @property
+    def retele(self) -> tuple:
+        """Rețelele calculate: tip_apa și, cu temperatura_acm, "ACM" """
+        return (self.tip_apa,) if self.temperatura_acm is None else (self.tip_apa, "ACM")
+
+    def _golire_coloane(self):
+        self._retele = {}
+        for retea in self.retele:
+            coloane = {nume: np.zeros(0) for nume in ("vs", "E", "N", "L", "zeta", "geom")}
+            coloane.update({nume: np.zeros(0) for nume in COLOANE_REZULTATE if nume != "Consumatori"})
+            self._retele[retea] = {"coloane": coloane, "etichete": [], "valid": np.zeros(0, dtype=bool)}
+
+    def _retea(self, retea: Optional[str]) -> Dict:
+        retea = retea or self.tip_apa
+        if retea not in self._retele:
+            raise ValueError(f"Rețea necalculată: {retea}")
+        return self._retele[retea]
+
+    def seteaza_parametri(self, destinatie: str, material: str, temperatura: float,
+                          model_frecare: str = MODEL_FRECARE_IMPLICIT,
+                          temperatura_acm: Optional[float] = None):
+        """Schimbă parametrii proiectului; orice modificare invalidează tot tabelul"""
+        parametri = (destinatie, material, temperatura, model_frecare, temperatura_acm)
+        actuali = (self.destinatie, self.material, self.temperatura, self.model_frecare, self.temperatura_acm)
+        if parametri != actuali:
+            if temperatura_acm is not None and self.tip_apa != "ARM":
+                raise ValueError("Rețeaua ACM se calculează împreună doar cu o rețea ARM")
+            retele = self.retele
+            (self.destinatie, self.material, self.temperatura, self.model_frecare,
+             self.temperatura_acm) = parametri
+            if self.retele != retele:
+                self._golire_coloane()
+            self._recalculeaza_de_la(0)
+
+    # -------- Modificări ale listei de tronsoane --------
+
+    def adauga(self, tronson: Dict):
+        """Adaugă un tronson la final; se calculează doar rândul nou"""
+        self.tronsoane.append(tronson)
+        self._recalculeaza_de_la(len(self.tronsoane) - 1)
+
+    def modifica(self, index: int, tronson: Dict):
+        """Înlocuiește tronsonul de pe poziția index și recalculează sufixul"""
+        self.tronsoane[index] = tronson
+        self._recalculeaza_de_la(index)
+
+    def sterge(self, index: int):
+        """Elimină tronsonul de pe poziția index și recalculează sufixul"""
+        del self.tronsoane[index]
+        self._recalculeaza_de_la(index)
+
+    def sincronizeaza(self, tronsoane: List[Dict]):
+        """
+        Aduce motorul la zi cu o listă de tronsoane (ex. st.session_state.tronsoane_arm)
+
+        Se caută primul tronson diferit față de ultima sincronizare și se
+        recalculează doar de acolo; lista nemodificată nu costă niciun calcul.
+        """
+        comun = min(len(tronsoane), len(self.tronsoane))
+        k = next((i for i in range(comun) if tronsoane[i] != self.tronsoane[i]), comun)
+        if k == len(tronsoane) == len(self.tronsoane):
+            return
+        self.tronsoane = [dict(t, consumatori=dict(t["consumatori"])) for t in tronsoane]
+        self._recalculeaza_de_la(k)
+
+    # -------- Calcul --------
+
+    @cronometrat
+    def _recalculeaza_de_la(self, k: int):
+        n = len(self.tronsoane)
+        for stare in self._retele.values():
+            c = stare["coloane"]
+            for nume in c:
+                c[nume] = c[nume][:k]
+            stare["etichete"] = stare["etichete"][:k]
+            stare["valid"] = stare["valid"][:k]
+        if k >= n:
+            return
+
+        sufix = self.tronsoane[k:]
+        m = len(sufix)
+        retele = self.retele
+        cu_acm = len(retele) > 1
+
+        # Contribuțiile proprii ale tronsoanelor din sufix, pe rețele (o singură trecere)
+        vs_propriu = np.zeros((len(retele), m))
+        E_propriu = np.zeros((len(retele), m))
+        N_propriu = np.zeros((len(retele), m))
+        etichete = [self._retele[retea]["etichete"] for retea in retele]
+        for j, tronson in enumerate(sufix):
+            consumatori = tronson["consumatori"]
+            vs = E = N = vs_acm = E_acm = N_acm = 0.0
+            for cons, q in consumatori.items():
+                date = CONSUMATORI[cons]
+                vs += date["debit"] * q
+                E += date["unitate"] * q
+                N += q
+                if cu_acm and date.get("acm", False):
+                    vs_acm += date["debit"] * q
+                    E_acm += date["unitate"] * q
+                    N_acm += q
+            vs_propriu[0, j], E_propriu[0, j], N_propriu[0, j] = vs, E, N
+            etichete[0].append(", ".join([f"{cons}:{q}" for cons, q in consumatori.items()]))
+            if cu_acm:
+                vs_propriu[1, j], E_propriu[1, j], N_propriu[1, j] = vs_acm, E_acm, N_acm
+                etichete[1].append(", ".join([f"{cons}:{q}" for cons, q in consumatori.items()
+                                              if CONSUMATORI[cons].get("acm", False)]))
+
+        lungimi = np.array([t["lungime"] for t in sufix], dtype=float)
+        zeta = np.array([t["suma_zeta"] for t in sufix], dtype=float)
+        geom = np.array([t.get("diferenta_nivel", 0) for t in sufix], dtype=float)
+
+        def prefix(c, nume, valori_proprii):
+            baza = c[nume][-1] if k > 0 else 0.0
+            return baza + np.cumsum(valori_proprii)
+
+        sume = []
+        for r, retea in enumerate(retele):
+            c = self._retele[retea]["coloane"]
+            suma_vs = prefix(c, "vs", vs_propriu[r])
+            suma_E = prefix(c, "E", E_propriu[r])
+            sume.append((suma_vs, suma_E, prefix(c, "N", N_propriu[r]),
+                         calcul_debit_cu_destinatie_vect(suma_vs, suma_E, self.destinatie, retea)))
+
+        # Toate rețelele într-un singur apel vectorizat, fiecare cu temperatura ei
+        temperaturi = (self.temperatura, self.temperatura_acm)[:len(retele)]
+        dim_toate = dimensioneaza_tronsoane(
+            np.concatenate([Vc for *_, Vc in sume]), np.tile(lungimi, len(retele)),
+            np.tile(zeta, len(retele)), np.repeat(temperaturi, m),
+            MATERIALE_CONDUCTE[self.material], self.model_frecare
+        )
+
+        for r, retea in enumerate(retele):
+            stare = self._retele[retea]
+            c = stare["coloane"]
+            suma_vs, suma_E, N, Vc = sume[r]
+            dim = {cheie: valori[r * m:(r + 1) * m] for cheie, valori in dim_toate.items()}
+            valid = dim["valid"]
+
+            # Pierderile se cumulează doar pe tronsoanele dimensionate
+            suma_i_L = prefix(c, "Σ i*L", dim["i_L"])
+            suma_h_loc = prefix(c, "Σ h_loc", dim["h_loc_mmca"])
+            suma_h_geom = prefix(c, "Σ h_geom", np.where(valid, geom, 0.0))
+
+            noi = {
+                "vs": suma_vs, "E": suma_E, "N": N, "L": lungimi, "zeta": zeta, "geom": geom,
+                "Tronson": np.array([t["nr"] for t in sufix]),
+                "Utot": suma_E,  # Utot = E
+                "f": calcul_factor_f_vect(N),
+                "Vs": suma_vs,
+                "Vc": Vc,
+                "DN": dim["dn"],
+                "d_int": dim["d_int_mm"],
+                "v": dim["viteza_ms"],
+                "i": dim["i_specific_pa_m"],
+                "i*L": dim["i_L"],
+                "Σ i*L": suma_i_L,
+                "Σ ζ": zeta,
+                "h_loc": dim["h_loc_mmca"],
+                "Σ h_loc": suma_h_loc,
+                "h_geom": geom,
+                "Σ h_geom": suma_h_geom,
+                # h_tot (mCA) = (Liniare + Locale) / 1000 + Geometrice
+                "h_tot": (suma_i_L + suma_h_loc) / 1000 + suma_h_geom,
+            }
+            for nume, valori in noi.items():
+                c[nume] = np.concatenate([c[nume], valori])
+            stare["valid"] = np.concatenate([stare["valid"], valid])
+
+    # -------- Rezultate --------
+
+    def coloane(self, retea: Optional[str] = None) -> Dict[str, object]:
+        """Rezultatele pe coloane (vectori), doar pentru tronsoanele dimensionate"""
+        pozitii = np.flatnonzero(self._retea(retea)["valid"])
+        return self.pagina(pozitii, 0, len(pozitii), retea)
+
+    def selecteaza(self, dn: Optional[Iterable[int]] = None, peste_v_max: bool = False,
+                   sortare: Optional[str] = None, descrescator: bool = False,
+                   retea: Optional[str] = None) -> np.ndarray:
+        """
+        Filtrează și ordonează tronsoanele dimensionate, fără a construi tabelul
+
+        Args:
+            dn: păstrează doar tronsoanele cu aceste DN (None = toate)
+            peste_v_max: doar tronsoanele cu viteza peste v_max a materialului
+            sortare: coloana după care se ordonează (din COLOANE_REZULTATE);
+                None păstrează ordinea tronsoanelor
+            descrescator: ordinea sortării
+            retea: "ARM" sau "ACM" (implicit tip_apa)
+
+        Returns:
+            Pozițiile rândurilor selectate, în ordinea cerută (argument pentru pagina)
+        """
+        stare = self._retea(retea)
+        c = stare["coloane"]
+        pozitii = np.flatnonzero(stare["valid"])
+        masca = np.ones(len(pozitii), dtype=bool)
+        if dn is not None:
+            masca &= np.isin(c["DN"][pozitii], np.fromiter(dn, dtype=float))
+        if peste_v_max:
+            masca &= c["v"][pozitii] > MATERIALE_CONDUCTE[self.material]["v_max"]
+        pozitii = pozitii[masca]
+        if sortare is not None:
+            if sortare == "Consumatori":
+                chei = np.array([stare["etichete"][i] for i in pozitii], dtype=object)
+            elif sortare in COLOANE_REZULTATE:
+                chei = c[sortare][pozitii]
+            else:
+                raise ValueError(f"Coloană necunoscută: {sortare}")
+            if descrescator:
+                # Sortarea stabilă a șirului inversat, inversată: egalitățile rămân în ordinea tronsoanelor
+                ordine = len(chei) - 1 - np.argsort(chei[::-1], kind="stable")[::-1]
+            else:
+                ordine = np.argsort(chei, kind="stable")
+            pozitii = pozitii[ordine]
+        return pozitii
+
+    def pagina(self, pozitii: np.ndarray, inceput: int = 0, numar: int = 100,
+               retea: Optional[str] = None) -> Dict[str, object]:
+        """Rândurile pozitii[inceput:inceput + numar], pe coloane, ca în coloane()"""
+        stare = self._retea(retea)
+        alese = pozitii[inceput:inceput + numar]
+        tabel = {}
+        for nume in COLOANE_REZULTATE:
+            if nume == "Consumatori":
+                tabel[nume] = [stare["etichete"][i] for i in alese]
+            elif nume in ("Tronson", "N", "DN"):
+                tabel[nume] = stare["coloane"][nume][alese].astype(int)
+            else:
+                tabel[nume] = stare["coloane"][nume][alese]
+        return tabel
+
+    def rezultate(self, retea: Optional[str] = None) -> List[Dict]:
+        """Rezultatele ca listă de rânduri, în formatul tabelului din interfață"""
+        tabel = self.coloane(retea)
+        return [
+            {nume: (valori[i].item() if isinstance(valori, np.ndarray) else valori[i])
+             for nume, valori in tabel.items()}
+            for i in range(len(tabel["Tronson"]))
+        ]
+
+def tronsoane_acm(tronsoane: List[Dict]) -> List[Dict]:
+    """Tronsoanele rețelei de apă caldă: aceleași trasee, doar consumatorii cu "acm" """
+    return [
+        dict(t, consumatori={cons: q for cons, q in t["consumatori"].items() if CONSUMATORI[cons].get("acm", False)})
+        for t in tronsoane
+    ]
+
+# ======================== CALCUL CUMULAT TRONSOANE ========================
+
+def calcul_tronsoane(tronsoane: List[Dict], destinatie: str, material: str,
+                     temperatura: float, tip_apa: str = "ARM",
+                     model_frecare: str = MODEL_FRECARE_IMPLICIT) -> List[Dict]:
+    """
+    Calculează tabelul cumulat al tronsoanelor
+
+    Args:
+        tronsoane: lista tronsoanelor (nr, consumatori, lungime, diferenta_nivel, suma_zeta)
+        destinatie: cheie din DESTINATII_CLADIRE
+        material: cheie din MATERIALE_CONDUCTE
+        temperatura: temperatura apei în °C
+        tip_apa: "ARM" sau "ACM"
+        model_frecare: modelul pentru λ (vezi sanitare.frecare.MODELE_FRECARE)
+
+    Returns:
+        Lista de rânduri (câte unul pentru fiecare tronson dimensionat)
+    """
+    calcul = CalculIncrementalTronsoane(destinatie, material, temperatura, tip_apa, model_frecare)
+    calcul.sincronizeaza(tronsoane)
+    return calcul.rezultate()
@@ -0,0 +1,114 @@
+"""
+Simularea în timp a vasului tampon (rezervor de rupere)
+
+Vasul pornește plin și este alimentat cu debit constant până la umplere
+(robinet cu flotor). Deficitul față de plin urmează recursia Lindley
+
+    D_t = max(0, D_{t-1} + (cerere_t - alimentare) * Δt)
+
+a cărei soluție este D = S - min(0, min cumulat S), cu S suma cumulată a
+diferențelor. Deficitul nu depinde de volumul vasului, deci o singură trecere
+(cumsum + minim cumulat) pe fiecare debit de alimentare decide simultan
+pentru toate volumele candidate: vasul de volum V nu se golește niciodată
+dacă V >= max D. Nivelul este V - D, iar apa oprită de flotor (deversată,
+dacă alimentarea nu ar fi controlată) rezultă din bilanț.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .date import PROFILURI_CONSUM_ORAR
+from .profilare import cronometrat
+
+VOLUME_STANDARD_VAS_TAMPON = (500, 1000, 2000, 3000, 5000, 10000)  # litri
+
+# ======================== PROFIL DE CONSUM ========================
+
+def profil_consum(destinatie: str, volum_zilnic_m3: float, zile: int = 1, pas_min: float = 1.0,
+                  variatie: float = 0.0, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Cererea de apă (m³/h) la fiecare pas de timp, din profilul orar al destinației
+
+    Args:
+        destinatie: cheie din PROFILURI_CONSUM_ORAR
+        volum_zilnic_m3: consumul zilnic total
+        zile: numărul de zile simulate
+        pas_min: pasul de timp în minute (trebuie să dividă ora)
+        variatie: coeficientul de variație al fluctuațiilor din interiorul orei
+            (lognormale, de medie 1); 0 = cerere constantă pe fiecare oră
+        seed: sămânța generatorului pentru fluctuații
+
+    Returns:
+        Vector de lungime zile * 24 * 60 / pas_min
+    """
+    pasi_pe_ora = 60 / pas_min
+    if pasi_pe_ora != int(pasi_pe_ora):
+        raise ValueError("Pasul de timp trebuie să dividă ora")
+    ponderi = np.asarray(PROFILURI_CONSUM_ORAR[destinatie], dtype=float)
+    debit_orar = volum_zilnic_m3 * ponderi / ponderi.sum()  # m³ în fiecare oră = m³/h
+    cerere = np.repeat(np.tile(debit_orar, zile), int(pasi_pe_ora))
+    if variatie > 0:
+        sigma2 = np.log1p(variatie**2)
+        rng = np.random.default_rng(seed)
+        cerere = cerere * rng.lognormal(-sigma2 / 2, np.sqrt(sigma2), size=cerere.shape)
+    return cerere
+
+# ======================== SIMULARE ========================
+
+@cronometrat
+def simuleaza_vas_tampon(cerere_m3h, debite_alimentare_m3h, pas_min: float = 1.0,
+                         volume_l: Sequence[float] = VOLUME_STANDARD_VAS_TAMPON) -> Dict[str, np.ndarray]:
+    """
+    Bilanțul vasului tampon pentru mai multe debite de alimentare și volume
+
+    Args:
+        cerere_m3h: cererea la fiecare pas (ex. profil_consum)
+        debite_alimentare_m3h: debitele de alimentare comparate
+        pas_min: pasul de timp în minute
+        volume_l: volumele candidate (litri), crescătoare
+
+    Returns:
+        Dicționar cu, pe fiecare debit de alimentare (primul indice):
+            "deficit_maxim_l": volumul minim teoretic al vasului
+            "volum_ales_l": cel mai mic volum candidat suficient (NaN dacă niciunul)
+            "volum_oprit_l": apa oprită de flotor (deversată fără flotor)
+            "deficit_final_l": deficitul la final (crește de la o zi la alta
+                dacă alimentarea e sub consumul mediu)
+        și pe perechi (debit, volum):
+            "fezabil": vasul nu se golește niciodată
+            "rezerva_minima_l": nivelul minim atins (negativ = lipsa de apă)
+    """
+    cerere = np.asarray(cerere_m3h, dtype=float)
+    alimentare = np.atleast_1d(np.asarray(debite_alimentare_m3h, dtype=float))
+    volume = np.asarray(volume_l, dtype=float)
+    dt_h = pas_min / 60
+
+    # Litri pe pas: (cerere - alimentare) m³/h * Δt h * 1000
+    S = np.cumsum((cerere[None, :] - alimentare[:, None]) * (dt_h * 1000), axis=1)
+    D = S - np.minimum(np.minimum.accumulate(S, axis=1), 0.0)
+    deficit_maxim = np.maximum(D.max(axis=1), 0.0)
+    deficit_final = D[:, -1]
+    # Bilanț: intrat efectiv = consumat + deficit final; restul a fost oprit de flotor
+    volum_oprit = alimentare * dt_h * 1000 * len(cerere) - cerere.sum() * dt_h * 1000 + deficit_final
+
+    fezabil = volume[None, :] >= deficit_maxim[:, None]
+    idx = np.argmax(fezabil, axis=1)
+    volum_ales = np.where(fezabil.any(axis=1), volume[idx], np.nan)
+
+    return {
+        "debite_alimentare_m3h": alimentare,
+        "volume_l": volume,
+        "deficit_maxim_l": deficit_maxim,
+        "volum_ales_l": volum_ales,
+        "volum_oprit_l": volum_oprit,
+        "deficit_final_l": deficit_final,
+        "fezabil": fezabil,
+        "rezerva_minima_l": volume[None, :] - deficit_maxim[:, None],
+    }
+
+def nivel_vas_tampon(cerere_m3h, debit_alimentare_m3h: float, volum_l: float,
+                     pas_min: float = 1.0) -> np.ndarray:
+    """Nivelul apei în vas (litri) la fiecare pas, pentru un vas care nu se golește"""
+    S = np.cumsum((np.asarray(cerere_m3h, dtype=float) - debit_alimentare_m3h) * (pas_min / 60 * 1000))
+    return volum_l - (S - np.minimum(np.minimum.accumulate(S), 0.0))
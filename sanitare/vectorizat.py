@@ -0,0 +1,107 @@
+"""Dimensionarea vectorizată (NumPy) a unui număr mare de tronsoane."""
+
+from typing import Dict
+
+import numpy as np
+
+from .date import G, DESTINATII_CLADIRE
+from .frecare import MODEL_FRECARE_IMPLICIT, viscozitate_cinematica_apa, factor_frecare
+from .catalog import diametre_material
+from .profilare import cronometrat
+
+# ======================== FUNCȚII VECTORIZATE ========================
+
+def calcul_debit_cu_destinatie_vect(sume_vs, sume_E, destinatie: str, tip_apa: str = "ARM") -> np.ndarray:
+    """Debitul de calcul conform destinației, pentru vectori Σ Vs și Σ E"""
+    config = DESTINATII_CLADIRE[destinatie]
+    sume_vs = np.asarray(sume_vs, dtype=float)
+    sume_E = np.asarray(sume_E, dtype=float)
+
+    if config["metoda"] == "B":
+        return np.where(sume_vs >= config["v_min"], config["coef_a_arm"] * np.sqrt(sume_vs.clip(min=0)), sume_vs)
+    # Metoda C
+    coef = config["coef_b_acm"] if tip_apa == "ACM" else config["coef_a_arm"]
+    return np.where(sume_E >= config["E_min"], coef * np.sqrt(sume_E.clip(min=0)), 0.2 * sume_E)
+
+def calcul_factor_f_vect(N) -> np.ndarray:
+    """Factorul de simultaneitate f pentru un vector de numere de consumatori"""
+    N = np.asarray(N, dtype=float)
+    return np.where(N <= 0, 0.0, np.where(N == 1, 1.0, 1.0 / np.sqrt(N.clip(min=1))))
+
+@cronometrat
+def dimensioneaza_tronsoane(debite_ls, lungimi_m, sume_zeta, temperaturi,
+                            info_material: dict,
+                            model_frecare: str = MODEL_FRECARE_IMPLICIT,
+                            dn_impus=None) -> Dict[str, np.ndarray]:
+    """
+    Dimensionează simultan toate tronsoanele (echivalentul vectorial al dimensioneaza_tronson)
+
+    Args:
+        debite_ls: debitele de calcul în l/s
+        lungimi_m: lungimile tronsoanelor în m
+        sume_zeta: Σζ pe fiecare tronson
+        temperaturi: temperatura apei în °C (vector sau o singură valoare)
+        info_material: intrarea din MATERIALE_CONDUCTE
+        model_frecare: modelul pentru λ (vezi sanitare.frecare.MODELE_FRECARE)
+        dn_impus: DN fixat pe tronson (0 = se alege după v_max); opțional
+
+    Returns:
+        Dicționar cu aceleași chei ca dimensioneaza_tronson, fiecare fiind un
+        vector; "valid" marchează tronsoanele cu debit > 0 (pentru celelalte
+        DN este 0, iar vitezele și pierderile sunt 0).
+    """
+    debite = np.atleast_1d(np.asarray(debite_ls, dtype=float))
+    lungimi = np.broadcast_to(np.asarray(lungimi_m, dtype=float), debite.shape)
+    zeta = np.broadcast_to(np.asarray(sume_zeta, dtype=float), debite.shape)
+    temp = np.broadcast_to(np.asarray(temperaturi, dtype=float), debite.shape)
+    valid = debite > 0
+
+    diametre = diametre_material(info_material)
+    dn_catalog = diametre.dn_np
+    d_int_catalog = diametre.d_int_np
+
+    # Diametru minim teoretic
+    d_min = np.sqrt((4 * debite.clip(min=0) / 1000) / (np.pi * info_material["v_max"])) * 1000
+
+    # Primul DN (în ordine crescătoare) cu d_int >= d_min: maximul cumulat este
+    # monoton, deci căutarea binară găsește exact primul element suficient
+    idx = np.searchsorted(diametre.d_int_cumulat_np, d_min, side="left")
+    idx = np.where(idx >= len(dn_catalog), diametre.idx_dn_max, idx)
+    if dn_impus is not None:
+        dn_impus = np.broadcast_to(np.asarray(dn_impus), debite.shape)
+        idx_impus = np.searchsorted(dn_catalog, dn_impus)
+        impus = dn_impus > 0
+        if np.any(dn_catalog[np.minimum(idx_impus[impus], len(dn_catalog) - 1)] != dn_impus[impus]):
+            raise ValueError("DN impus inexistent în catalogul materialului")
+        idx = np.where(impus, idx_impus, idx)
+
+    dn = np.where(valid, dn_catalog[idx], 0)
+    d_int_mm = d_int_catalog[idx]
+    d_m = d_int_mm / 1000
+
+    # Calcule hidraulice
+    sectiune = np.pi * d_m**2 / 4
+    viteza = np.where(valid, (debite / 1000) / sectiune, 0.0)
+    reynolds = viteza * d_m / viscozitate_cinematica_apa(temp)
+    lambda_coef = np.where(valid, factor_frecare(reynolds, info_material["rugozitate_mm"] / d_int_mm, model_frecare), 0.0)
+
+    # Pierderi
+    termen_dinamic = viteza**2 / (2 * G)
+    h_lin_m = lambda_coef * (lungimi / d_m) * termen_dinamic
+    h_loc_m = zeta * termen_dinamic
+    with np.errstate(divide="ignore", invalid="ignore"):
+        i_specific = np.where(lungimi > 0, h_lin_m / lungimi * 1000 * G, 0.0)
+
+    return {
+        "valid": valid,
+        "dn": dn,
+        "d_int_mm": np.where(valid, d_int_mm, 0.0),
+        "viteza_ms": viteza,
+        "reynolds": reynolds,
+        "lambda": lambda_coef,
+        "h_lin_m": h_lin_m,
+        "h_loc_m": h_loc_m,
+        "i_specific_pa_m": i_specific,
+        "i_L": h_lin_m * 1000,  # în mmCA
+        "h_loc_mmca": h_loc_m * 1000
+    }